@@ -0,0 +1,14 @@
+"""
+Alumni App Configuration
+"""
+from django.apps import AppConfig
+
+
+class AlumniConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.alumni'
+    verbose_name = 'Alumni'
+
+    def ready(self):
+        """Register signals when app is ready"""
+        import apps.alumni.signals
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alumni',
+            index=models.Index(fields=['transitionDate'], name='alumni_transition_idx'),
+        ),
+    ]
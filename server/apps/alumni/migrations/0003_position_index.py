@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:03
+
+from django.db import migrations, models
+import django.db.models.fields.json
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0002_transition_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alumni',
+            index=models.Index(django.db.models.fields.json.KeyTextTransform('position', 'currentPosition'), name='alumni_position_idx'),
+        ),
+    ]
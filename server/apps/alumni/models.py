@@ -1,7 +1,8 @@
 """
 Alumni Models
 """
-from django.db import models
+from django.db import models, transaction
+from django.db.models.fields.json import KeyTextTransform
 from django.utils import timezone
 
 
@@ -64,11 +65,19 @@ class Alumni(models.Model):
             models.Index(fields=['alumniType']),
             models.Index(fields=['graduationYear']),
             models.Index(fields=['currentSupportCategory']),
+            models.Index(fields=['transitionDate'], name='alumni_transition_idx'),
+            # currentPosition->>'position', grouped by the stats endpoint
+            models.Index(KeyTextTransform('position', 'currentPosition'), name='alumni_position_idx'),
         ]
     
     def __str__(self):
         return f"Alumni: {self.student.fullNameEnglish} ({self.graduationYear})"
     
+    def save(self, *args, **kwargs):
+        """Save in a transaction so the dashboard counters (post_save) move with the row"""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
     def add_career_position(self, position_data):
         """
         Add a new career position to career history
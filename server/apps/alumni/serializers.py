@@ -2,6 +2,7 @@
 Alumni Serializers
 """
 from rest_framework import serializers
+from utils.fieldsets import SparseFieldsetMixin
 from .models import Alumni
 from apps.students.serializers import StudentDetailSerializer
 
@@ -29,9 +30,10 @@ class SupportHistorySerializer(serializers.Serializer):
     notes = serializers.CharField(required=False, allow_blank=True)
 
 
-class AlumniSerializer(serializers.ModelSerializer):
+class AlumniSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Complete alumni serializer with student details
+    Supports ?fields= / ?expand= (see utils.fieldsets)
     """
     student = StudentDetailSerializer(read_only=True)
     careerHistory = CareerPositionSerializer(many=True, read_only=True)
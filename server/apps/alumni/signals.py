@@ -0,0 +1,18 @@
+"""
+Signals invalidating the cached alumni statistics
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Alumni
+from .stats import invalidate_alumni_stats
+
+
+@receiver(post_save, sender=Alumni)
+@receiver(post_delete, sender=Alumni)
+def alumni_changed(sender, instance, **kwargs):
+    """
+    Signal handler dropping the cached statistics when an alumni record changes
+    """
+    invalidate_alumni_stats()
@@ -0,0 +1,107 @@
+"""
+Alumni Statistics
+Computed for GET /api/alumni/stats/ and kept in a stale-while-revalidate
+cache (utils/swr_cache.py), invalidated when an alumni record changes
+"""
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.fields.json import KeyTextTransform
+
+from utils.swr_cache import SWRCache
+from .models import Alumni
+
+
+ALUMNI_STATS_CACHE_KEY = 'stats'
+
+# currentPosition->>'position', matching the alumni_position_idx expression index
+POSITION = KeyTextTransform('position', 'currentPosition')
+
+alumni_stats_cache = SWRCache('alumni-stats', ttl=300, stale_ttl=3600)
+
+
+def compute_alumni_stats():
+    """
+    Count alumni by type, support category, graduation year and position
+    """
+    # Total alumni
+    total_alumni = Alumni.objects.count()
+    recent_alumni = Alumni.objects.filter(alumniType='recent').count()
+    established_alumni = Alumni.objects.filter(alumniType='established').count()
+    
+    # By support category
+    by_support_category = dict(
+        Alumni.objects.values('currentSupportCategory')
+        .annotate(count=Count('pk'))
+        .values_list('currentSupportCategory', 'count')
+    )
+    
+    # By graduation year
+    by_graduation_year = dict(
+        Alumni.objects.values('graduationYear')
+        .annotate(count=Count('pk'))
+        .values_list('graduationYear', 'count')
+    )
+    
+    # Convert year keys to strings
+    by_graduation_year = {str(k): v for k, v in by_graduation_year.items()}
+    
+    # By position type (from current position), grouped in the database
+    # on the indexed currentPosition->>'position' expression
+    by_position_type = dict(
+        Alumni.objects.filter(currentPosition__has_key='position')
+        .annotate(position=POSITION)
+        .values('position')
+        .annotate(count=Count('pk'))
+        .order_by('-count', 'position')
+        .values_list('position', 'count')
+    )
+    
+    return {
+        'total': total_alumni,
+        'recent': recent_alumni,
+        'established': established_alumni,
+        'bySupport': by_support_category,
+        'byPosition': by_position_type,
+        'byYear': by_graduation_year,
+    }
+
+
+def limit_positions(stats, top):
+    """
+    Keep the `top` most common positions in byPosition and sum the rest
+    into byPositionOther
+    
+    Args:
+        stats: statistics from compute_alumni_stats (not modified)
+        top: number of positions to keep
+    
+    Returns:
+        dict: copy of stats with byPosition limited
+    """
+    positions = list(stats['byPosition'].items())
+    tail = positions[top:]
+    return {
+        **stats,
+        'byPosition': dict(positions[:top]),
+        'byPositionOther': {
+            'positions': len(tail),
+            'count': sum(count for _, count in tail),
+        },
+    }
+
+
+def get_alumni_stats(top=None):
+    """
+    Return the cached alumni statistics, computing them on a miss
+    
+    Args:
+        top: optional limit on byPosition (see limit_positions)
+    """
+    stats = alumni_stats_cache.get_or_compute(ALUMNI_STATS_CACHE_KEY, compute_alumni_stats)
+    return stats if top is None else limit_positions(stats, top)
+
+
+def invalidate_alumni_stats():
+    """Mark the cached statistics stale now and again after commit"""
+    alumni_stats_cache.invalidate(ALUMNI_STATS_CACHE_KEY)
+    transaction.on_commit(lambda: alumni_stats_cache.invalidate(ALUMNI_STATS_CACHE_KEY))
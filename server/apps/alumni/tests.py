@@ -157,3 +157,65 @@ class CareerPositionChronologyPropertyTest(TestCase):
         # Current position should be the newer one
         self.assertEqual(self.alumni.currentPosition.get('company'), company_name)
         self.assertEqual(self.alumni.currentPosition.get('position'), position_title)
+
+
+class AlumniStatsTest(APITestCase):
+    """
+    Tests for GET /api/alumni/stats/
+    """
+    
+    def setUp(self):
+        from apps.students.tests import create_test_student
+        from .stats import alumni_stats_cache
+        self.cache = alumni_stats_cache
+        self.cache.clear()
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.students = [
+            create_test_student(self.department, suffix, status='graduated')
+            for suffix in range(3)
+        ]
+        Alumni.objects.create(
+            student=self.students[0],
+            graduationYear=2023,
+            currentPosition={'company': 'Acme', 'position': 'Engineer'}
+        )
+    
+    def tearDown(self):
+        self.cache.clear()
+    
+    def test_stats_cached_and_invalidated_on_change(self):
+        """Test that stats are served from cache until an alumni record changes"""
+        response = self.client.get('/api/alumni/stats/')
+        self.assertEqual(response.data['total'], 1)
+        self.assertEqual(response.data['byPosition'], {'Engineer': 1})
+        
+        with self.assertNumQueries(0):
+            self.client.get('/api/alumni/stats/')
+        
+        Alumni.objects.create(student=self.students[1], graduationYear=2024, alumniType='established')
+        response = self.client.get('/api/alumni/stats/')
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['established'], 1)
+        self.assertEqual(response.data['byYear'], {'2023': 1, '2024': 1})
+    
+    def test_positions_grouped_with_top_limit(self):
+        """Test byPosition counts and the top-N limit with a long-tail bucket"""
+        Alumni.objects.create(
+            student=self.students[1], graduationYear=2024,
+            currentPosition={'company': 'Beta', 'position': 'Engineer'}
+        )
+        Alumni.objects.create(
+            student=self.students[2], graduationYear=2024,
+            currentPosition={'company': 'Gamma', 'position': 'Analyst'}
+        )
+        
+        response = self.client.get('/api/alumni/stats/')
+        self.assertEqual(response.data['byPosition'], {'Engineer': 2, 'Analyst': 1})
+        self.assertNotIn('byPositionOther', response.data)
+        
+        response = self.client.get('/api/alumni/stats/', {'top': 1})
+        self.assertEqual(response.data['byPosition'], {'Engineer': 2})
+        self.assertEqual(response.data['byPositionOther'], {'positions': 1, 'count': 1})
+        
+        response = self.client.get('/api/alumni/stats/', {'top': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
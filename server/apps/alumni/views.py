@@ -5,8 +5,11 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count
+from apps.dashboard.counters import counter_stamp
+from utils.conditional import ConditionalGetMixin
+from utils.fieldsets import SparseFieldsetViewMixin
 from .models import Alumni
+from .stats import get_alumni_stats
 from .serializers import (
     AlumniSerializer,
     AlumniCreateSerializer,
@@ -17,7 +20,7 @@ from .serializers import (
 )
 
 
-class AlumniViewSet(viewsets.ModelViewSet):
+class AlumniViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Alumni CRUD operations
     
@@ -32,10 +35,33 @@ class AlumniViewSet(viewsets.ModelViewSet):
     - add_career_position: POST /api/alumni/{id}/add-career-position/
     - update_support_category: PUT /api/alumni/{id}/update-support-category/
     - stats: GET /api/alumni/stats/
+    
+    List and detail responses accept ?fields= / ?expand= (see utils.fieldsets),
+    e.g. ?fields=alumniType,student.fullNameEnglish, or ?expand= to return student as its id
+    
+    list and retrieve send ETag / Last-Modified and answer conditional
+    requests with 304 (see utils.conditional)
     """
-    queryset = Alumni.objects.all()
+    queryset = Alumni.objects.select_related('student__department')
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['alumniType', 'currentSupportCategory', 'graduationYear']
+    conditional_timestamp_fields = ('updatedAt', 'student__updatedAt', 'student__department__updatedAt')
+    
+    def get_queryset(self):
+        """
+        Restrict list/retrieve to the columns of the requested fieldset
+        """
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            queryset = self.apply_fieldset(queryset, AlumniSerializer)
+        return queryset
+    
+    def get_validator_dependencies(self):
+        """
+        The nested department's studentCount is counted from other students:
+        validate it through the maintained per-department counters
+        """
+        return [counter_stamp('students', 'department')]
     
     def get_serializer_class(self):
         """
@@ -72,7 +98,7 @@ class AlumniViewSet(viewsets.ModelViewSet):
         
         # Return complete alumni data
         alumni = Alumni.objects.get(pk=serializer.instance.pk)
-        response_serializer = AlumniSerializer(alumni)
+        response_serializer = AlumniSerializer(alumni, context=self.get_serializer_context())
         
         return Response(
             response_serializer.data,
@@ -99,7 +125,7 @@ class AlumniViewSet(viewsets.ModelViewSet):
         
         # Return complete alumni data
         alumni = Alumni.objects.get(pk=instance.pk)
-        response_serializer = AlumniSerializer(alumni)
+        response_serializer = AlumniSerializer(alumni, context=self.get_serializer_context())
         
         return Response(response_serializer.data)
     
@@ -131,7 +157,7 @@ class AlumniViewSet(viewsets.ModelViewSet):
         alumni.add_career_position(position_data)
         
         # Return updated alumni
-        response_serializer = AlumniSerializer(alumni)
+        response_serializer = AlumniSerializer(alumni, context=self.get_serializer_context())
         return Response(response_serializer.data)
     
     @action(detail=True, methods=['put'])
@@ -156,7 +182,7 @@ class AlumniViewSet(viewsets.ModelViewSet):
         )
         
         # Return updated alumni
-        response_serializer = AlumniSerializer(alumni)
+        response_serializer = AlumniSerializer(alumni, context=self.get_serializer_context())
         return Response(response_serializer.data)
     
     @action(detail=False, methods=['get'])
@@ -170,44 +196,25 @@ class AlumniViewSet(viewsets.ModelViewSet):
         - Support category
         - Graduation year
         - Position type
-        """
-        # Total alumni
-        total_alumni = Alumni.objects.count()
-        recent_alumni = Alumni.objects.filter(alumniType='recent').count()
-        established_alumni = Alumni.objects.filter(alumniType='established').count()
-        
-        # By support category
-        by_support_category = dict(
-            Alumni.objects.values('currentSupportCategory')
-            .annotate(count=Count('pk'))
-            .values_list('currentSupportCategory', 'count')
-        )
         
-        # By graduation year
-        by_graduation_year = dict(
-            Alumni.objects.values('graduationYear')
-            .annotate(count=Count('pk'))
-            .values_list('graduationYear', 'count')
-        )
-        
-        # Convert year keys to strings
-        by_graduation_year = {str(k): v for k, v in by_graduation_year.items()}
-        
-        # By position type (from current position)
-        by_position_type = {}
-        alumni_with_positions = Alumni.objects.exclude(currentPosition__isnull=True)
-        for alumni in alumni_with_positions:
-            if alumni.currentPosition and 'position' in alumni.currentPosition:
-                position = alumni.currentPosition['position']
-                by_position_type[position] = by_position_type.get(position, 0) + 1
-        
-        stats_data = {
-            'total': total_alumni,
-            'recent': recent_alumni,
-            'established': established_alumni,
-            'bySupport': by_support_category,
-            'byPosition': by_position_type,
-            'byYear': by_graduation_year,
-        }
+        Query parameters:
+            top: keep only the N most common positions in byPosition;
+                 the rest are summed into byPositionOther
+        
+        Served from a stale-while-revalidate cache (see stats.py)
+        """
+        top = request.query_params.get('top')
+        if top is not None:
+            try:
+                top = int(top)
+                if top < 1:
+                    raise ValueError
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid top', 'details': 'top must be a positive integer'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        stats_data = get_alumni_stats(top=top)
         
         return Response(stats_data)
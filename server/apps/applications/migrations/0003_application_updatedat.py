@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:34
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def seed_updated_at(apps, schema_editor):
+    """Existing applications were last changed when reviewed (or submitted)"""
+    Application = apps.get_model('applications', 'Application')
+    Application.objects.update(updatedAt=Coalesce('reviewedAt', 'submittedAt'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_selecteddocuments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='updatedAt',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(seed_updated_at, migrations.RunPython.noop),
+    ]
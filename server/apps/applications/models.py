@@ -1,7 +1,7 @@
 """
 Application Models
 """
-from django.db import models
+from django.db import models, transaction
 import uuid
 
 
@@ -62,6 +62,8 @@ class Application(models.Model):
     reviewedAt = models.DateTimeField(null=True, blank=True)
     reviewedBy = models.CharField(max_length=255, blank=True)
     reviewNotes = models.TextField(blank=True)
+    # Any change (used for conditional GET validators)
+    updatedAt = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'applications'
@@ -76,3 +78,8 @@ class Application(models.Model):
     
     def __str__(self):
         return f"{self.fullNameEnglish} - {self.applicationType} ({self.status})"
+    
+    def save(self, *args, **kwargs):
+        """Save in a transaction so the dashboard counters (post_save) move with the row"""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
@@ -2,6 +2,7 @@
 Application Serializers
 """
 from rest_framework import serializers
+from utils.fast_serializers import FastSerializer
 from .models import Application
 
 
@@ -66,6 +67,10 @@ class ApplicationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'submittedAt']
 
 
+# values()-based equivalent of ApplicationSerializer for the list endpoint
+application_fast_serializer = FastSerializer(ApplicationSerializer)
+
+
 class ApplicationReviewSerializer(serializers.Serializer):
     """
     Serializer for admin review of applications
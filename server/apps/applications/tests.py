@@ -233,3 +233,65 @@ class ApplicationAPITests(APITestCase):
         self.assertEqual(response.data['status'], 'approved')
         self.assertEqual(response.data['reviewedBy'], 'Admin User')
         self.assertIsNotNone(response.data['reviewedAt'])
+    
+    def test_review_invalidates_etag(self):
+        """Test that reviewing an application changes its ETag"""
+        application = Application.objects.create(
+            fullNameBangla='জন ডো',
+            fullNameEnglish='John Doe',
+            fatherName='Father',
+            motherName='Mother',
+            department='CS',
+            session='2023',
+            shift='Day',
+            rollNumber='123',
+            registrationNumber='456',
+            applicationType='Testimonial',
+            subject='Test',
+            message='Test message'
+        )
+        url = f'/api/applications/{application.id}/'
+        etag = self.client.get(url)['ETag']
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        self.client.put(
+            f'/api/applications/{application.id}/review/',
+            {'status': 'approved', 'reviewedBy': 'Admin User'},
+            format='json'
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'approved')
+    
+    def test_fast_list_matches_serializer(self):
+        """Test that the values()-based list renders the same JSON as ApplicationSerializer"""
+        from django.utils import timezone
+        from rest_framework.renderers import JSONRenderer
+        from .serializers import ApplicationSerializer, application_fast_serializer
+        for index, application_status in enumerate(['pending', 'approved']):
+            Application.objects.create(
+                fullNameBangla='জন ডো',
+                fullNameEnglish=f'John Doe {index}',
+                fatherName='Father',
+                motherName='Mother',
+                department='CS',
+                session='2023',
+                shift='Day',
+                rollNumber='123',
+                registrationNumber='456',
+                applicationType='Testimonial',
+                subject='Test',
+                message='Test message',
+                selectedDocuments=['Transcript'],
+                status=application_status,
+                reviewedAt=timezone.now() if index else None
+            )
+        queryset = Application.objects.order_by('-submittedAt')
+        
+        expected = JSONRenderer().render(ApplicationSerializer(queryset, many=True).data)
+        actual = JSONRenderer().render(
+            application_fast_serializer.represent(application_fast_serializer.values(queryset))
+        )
+        self.assertEqual(actual, expected)
@@ -8,26 +8,42 @@ from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 
+from utils.conditional import ConditionalGetMixin
+from utils.fast_serializers import FastListMixin
+from utils.pagination import KeysetPagination
+
 from .models import Application
 from .serializers import (
     ApplicationSerializer,
     ApplicationSubmitSerializer,
-    ApplicationReviewSerializer
+    ApplicationReviewSerializer,
+    application_fast_serializer
 )
 
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing applications
     
     Provides CRUD operations and custom actions for application submission and review
+    
+    List pagination: ?page=N (default) or keyset mode with ?pagination=cursor
+    (ordered by -submittedAt, -id; see utils.pagination.KeysetPagination)
+    
+    list and retrieve send ETag / Last-Modified and answer conditional
+    requests with 304 (see utils.conditional)
+    
+    list is serialized from values() rows (see utils.fast_serializers)
     """
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['status', 'applicationType', 'department']
     ordering_fields = ['submittedAt', 'reviewedAt']
     ordering = ['-submittedAt']
+    conditional_timestamp_fields = ('updatedAt', 'reviewedAt', 'submittedAt')
+    fast_list_serializer = application_fast_serializer
     
     @action(detail=False, methods=['post'], permission_classes=[])
     def submit(self, request):
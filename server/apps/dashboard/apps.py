@@ -8,3 +8,7 @@ class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.dashboard'
     verbose_name = 'Dashboard'
+
+    def ready(self):
+        """Register signals when app is ready"""
+        import apps.dashboard.signals
@@ -0,0 +1,89 @@
+"""
+Cohort Statistics
+Dropout and retention rates per session, department and shift
+
+CohortStat is the materialized view dashboard_cohort_stats (migration
+0003): one row per (session, department, shift, lastSemester) with the
+number of students in each status. It is filled from the students table
+only by `manage.py refresh_cohort_stats`:
+- by default with REFRESH MATERIALIZED VIEW CONCURRENTLY, which rebuilds
+  the result, then writes only the rows that changed while readers keep
+  seeing the previous rows
+- with --blocking as a plain REFRESH, faster but locking out readers
+The time of the last refresh is kept as the updatedAt of the
+'cohort_stats' RollupCursor.
+
+GET /api/dashboard/cohorts/ reads only the view, never the students table.
+"""
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import CohortStat, RollupCursor
+
+
+COHORT_CURSOR = 'cohort_stats'
+
+# groupBy name -> view columns returned for it
+COHORT_DIMENSIONS = {
+    'session': ['session'],
+    'department': ['department', 'departmentCode'],
+    'shift': ['shift'],
+    'lastSemester': ['lastSemester'],
+}
+
+STATUS_COLUMNS = ('active', 'inactive', 'graduated', 'discontinued')
+
+
+def refresh_cohort_stats(concurrently=True):
+    """
+    Recompute the cohort view from the students table
+
+    Returns:
+        number of cohort rows after the refresh
+    """
+    mode = 'CONCURRENTLY ' if concurrently else ''
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'REFRESH MATERIALIZED VIEW {mode}{CohortStat._meta.db_table}')
+        RollupCursor.objects.update_or_create(
+            metric=COHORT_CURSOR, defaults={'processedThrough': timezone.localdate()}
+        )
+    return CohortStat.objects.count()
+
+
+def last_refresh():
+    """Time of the last refresh_cohort_stats run, or None"""
+    return RollupCursor.objects.filter(metric=COHORT_CURSOR).values_list('updatedAt', flat=True).first()
+
+
+def cohort_rates(group_by, **filters):
+    """
+    Sum the cohort rows over the group_by dimensions
+
+    Args:
+        group_by: list of COHORT_DIMENSIONS keys
+        filters: session, department (id), shift or lastSemester values
+
+    Returns:
+        [{<dimension columns>, 'total', <status counts>, 'dropoutRate', 'retentionRate'}, ...]
+        with the rates in percent of total
+    """
+    columns = [column for dimension in group_by for column in COHORT_DIMENSIONS[dimension]]
+    rows = (
+        CohortStat.objects.filter(**filters)
+        .order_by(*columns)
+        .values(*columns)
+        .annotate(total_students=Sum('total'), **{f'{name}_students': Sum(name) for name in STATUS_COLUMNS})
+    )
+    result = []
+    for row in rows:
+        item = {column: row[column] for column in columns}
+        total = row['total_students']
+        item['total'] = total
+        for name in STATUS_COLUMNS:
+            item[name] = row[f'{name}_students']
+        item['dropoutRate'] = round(item['discontinued'] * 100 / total, 2) if total else 0.0
+        item['retentionRate'] = round((total - item['discontinued']) * 100 / total, 2) if total else 0.0
+        result.append(item)
+    return result
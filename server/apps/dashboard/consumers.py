@@ -0,0 +1,102 @@
+"""
+WebSocket consumers for live dashboard statistics
+"""
+
+import asyncio
+import json
+from collections import Counter
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+
+from apps.departments.models import Department
+from .live import DASHBOARD_GROUP, department_ids, format_deltas, merge_deltas
+from .stats import compute_dashboard_stats
+
+
+class DashboardConsumer(AsyncWebsocketConsumer):
+    """
+    WebSocket consumer pushing dashboard statistics to staff users
+
+    Sends the full statistics on connect (and on {"type": "get_stats"}),
+    read from the counters rather than the cache so the deltas that follow
+    apply to current numbers, then coalesced counter deltas; see live.py
+    for the message format.
+    """
+
+    async def connect(self):
+        """Handle WebSocket connection"""
+        self.user = self.scope["user"]
+
+        if not self.user.is_authenticated or not self.user.is_staff:
+            await self.close()
+            return
+
+        self.pending = Counter()
+        self.flush_task = None
+        self.department_codes = {}
+
+        await self.channel_layer.group_add(DASHBOARD_GROUP, self.channel_name)
+        await self.accept()
+        await self.send_stats()
+
+    async def disconnect(self, close_code):
+        """Handle WebSocket disconnection"""
+        if getattr(self, 'flush_task', None) is not None:
+            self.flush_task.cancel()
+        await self.channel_layer.group_discard(DASHBOARD_GROUP, self.channel_name)
+
+    async def receive(self, text_data):
+        """Handle incoming WebSocket messages"""
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            await self.send(text_data=json.dumps({
+                'type': 'error',
+                'message': 'Invalid JSON'
+            }))
+            return
+
+        if data.get('type') == 'get_stats':
+            await self.send_stats()
+
+    async def stats_delta(self, event):
+        """Handle published counter deltas: buffer them until the window closes"""
+        merge_deltas(self.pending, event['deltas'])
+        if self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self.flush_later())
+
+    async def stats_reset(self, event):
+        """Handle a counter rebuild: replace buffered deltas with a full snapshot"""
+        self.pending.clear()
+        await self.send_stats()
+
+    async def flush_later(self):
+        await asyncio.sleep(getattr(settings, 'DASHBOARD_LIVE_COALESCE_SECONDS', 1.0))
+        self.flush_task = None
+        pending, self.pending = self.pending, Counter()
+        missing = department_ids(pending) - self.department_codes.keys()
+        if missing:
+            self.department_codes.update(await self.get_department_codes(missing))
+        deltas = format_deltas(pending, self.department_codes)
+        if deltas:
+            await self.send(text_data=json.dumps({
+                'type': 'stats_delta',
+                'deltas': deltas
+            }))
+
+    async def send_stats(self):
+        stats = await database_sync_to_async(compute_dashboard_stats)()
+        await self.send(text_data=json.dumps({
+            'type': 'stats',
+            'stats': stats
+        }))
+
+    @database_sync_to_async
+    def get_department_codes(self, ids):
+        """Map department ids to codes"""
+        return {
+            str(pk): code
+            for pk, code in Department.objects.filter(id__in=list(ids)).values_list('id', 'code')
+        }
@@ -0,0 +1,266 @@
+"""
+Dashboard Counters
+Row counts of students, alumni and applications kept in StatCounter
+
+COUNTED_FIELDS lists, per scope, the model and the columns counted by
+value; every scope also has a 'total' counter. Counters change in the same
+transaction as the row:
+- before a save or delete (pre_save / pre_delete, inside the model's
+  transaction) the row's stored counted values are read with SELECT ...
+  FOR UPDATE, so a save only moves the counters of the values that
+  changed and concurrent saves of a row count one after the other
+- post_save / post_delete turn that into +1/-1 deltas, applied with one
+  INSERT ... ON CONFLICT DO UPDATE (see signals.py)
+- writes that skip model signals (bulk_create, queryset.update) must call
+  count_created() or rebuild the counters themselves
+- committed deltas are published to live dashboards (see live.py)
+
+rebuild_counters() recomputes everything from the source tables, one
+GROUP BY GROUPING SETS query per table, and is what
+`manage.py rebuild_counters` runs to repair drift.
+"""
+from collections import Counter
+
+from django.apps import apps as django_apps
+from django.db import connection, transaction
+
+
+TOTAL = 'total'
+
+# scope: (model label, counted fields)
+COUNTED_FIELDS = {
+    'students': ('students.Student', ('status', 'department', 'semester')),
+    'alumni': ('alumni.Alumni', ('alumniType', 'currentSupportCategory', 'graduationYear')),
+    'applications': ('applications.Application', ('status', 'applicationType')),
+}
+
+
+def counted_models():
+    """Return {model class: (scope, fields)} for the installed models"""
+    return {
+        django_apps.get_model(label): (scope, fields)
+        for scope, (label, fields) in COUNTED_FIELDS.items()
+    }
+
+
+def _counter_value(field, value):
+    """Counter value of a column value; str() of the normalized Python value"""
+    if value is None:
+        return ''
+    return str(field.to_python(value))
+
+
+def counter_values(instance, fields):
+    """
+    Return {field: counter value} for the fields loaded on the instance
+    (deferred fields are left out rather than fetched)
+    """
+    values = {}
+    for name in fields:
+        field = instance._meta.get_field(name)
+        if field.attname in instance.__dict__:
+            values[name] = _counter_value(field, instance.__dict__[field.attname])
+    return values
+
+
+def lock_stored_values(instance, fields):
+    """
+    Read the instance's stored values of fields into instance._stored_values,
+    locking its row until the transaction ends (call inside the save or
+    delete transaction); a new row has none
+    """
+    values = {}
+    if not instance._state.adding:
+        attnames = [instance._meta.get_field(name).attname for name in fields]
+        row = (
+            type(instance)._base_manager.select_for_update()
+            .filter(pk=instance.pk).values(*attnames).first()
+        )
+        if row is not None:
+            values = {name: row[attname] for name, attname in zip(fields, attnames)}
+    instance._stored_values = values
+
+
+def stored_counter_values(instance, fields):
+    """Return {field: counter value} of the values read by lock_stored_values()"""
+    stored = getattr(instance, '_stored_values', {})
+    return {
+        name: _counter_value(instance._meta.get_field(name), stored[name])
+        for name in fields if name in stored
+    }
+
+
+def saved_deltas(instance, scope, fields, created, update_fields=None):
+    """Return the counter deltas of saving the instance"""
+    deltas = Counter()
+    current = counter_values(instance, fields)
+    if created:
+        deltas[(scope, TOTAL, '')] += 1
+        for name, value in current.items():
+            deltas[(scope, name, value)] += 1
+        return deltas
+
+    stored = stored_counter_values(instance, fields)
+    for name, value in current.items():
+        field = instance._meta.get_field(name)
+        if update_fields is not None and name not in update_fields and field.attname not in update_fields:
+            continue
+        if name in stored and stored[name] != value:
+            deltas[(scope, name, stored[name])] -= 1
+            deltas[(scope, name, value)] += 1
+    return deltas
+
+
+def deleted_deltas(instance, scope, fields):
+    """Return the counter deltas of deleting the instance"""
+    deltas = Counter({(scope, TOTAL, ''): -1})
+    stored = stored_counter_values(instance, fields)
+    for name in fields:
+        if name in stored:
+            deltas[(scope, name, stored[name])] -= 1
+    return deltas
+
+
+def count_created(instances):
+    """Count rows inserted without model signals (e.g. bulk_create)"""
+    models = counted_models()
+    deltas = Counter()
+    for instance in instances:
+        scope, fields = models[type(instance)]
+        deltas.update(saved_deltas(instance, scope, fields, created=True))
+    apply_counter_deltas(deltas)
+
+
+def apply_counter_deltas(deltas):
+    """
+    Add {(scope, dimension, value): delta} to the counters in one statement
+
+    Rows are upserted in key order so concurrent writers lock counters in
+    the same order and cannot deadlock on each other.
+    """
+    from .live import publish_stat_deltas
+    from .models import StatCounter
+
+    items = sorted((key, delta) for key, delta in deltas.items() if delta)
+    if not items:
+        return
+    table = connection.ops.quote_name(StatCounter._meta.db_table)
+    placeholders = ', '.join(['(%s, %s, %s, %s)'] * len(items))
+    params = [part for (scope, dimension, value), delta in items for part in (scope, dimension, value, delta)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (scope, dimension, value, count) VALUES {placeholders} '
+            f'ON CONFLICT (scope, dimension, value) DO UPDATE SET count = {table}.count + EXCLUDED.count',
+            params
+        )
+    # Live dashboards only hear about committed changes
+    transaction.on_commit(lambda: publish_stat_deltas(items))
+
+
+def grouped_counts(model, fields):
+    """
+    Count a table overall and per value of each field with one
+    GROUP BY GROUPING SETS query
+
+    Returns:
+        {(dimension, value): count}, including (TOTAL, '')
+    """
+    quote = connection.ops.quote_name
+    model_fields = [model._meta.get_field(name) for name in fields]
+    columns = ', '.join(quote(field.column) for field in model_fields)
+    sets = ', '.join(f'({quote(field.column)})' for field in model_fields)
+    sql = (
+        f'SELECT GROUPING({columns}) AS grp, {columns}, COUNT(*) '
+        f'FROM {quote(model._meta.db_table)} GROUP BY GROUPING SETS ({sets}, ())'
+    )
+    # GROUPING() sets a bit for every column aggregated away in the row's
+    # set, the first column being the most significant
+    everything = (1 << len(fields)) - 1
+    grouped_by = {everything ^ (1 << (len(fields) - 1 - index)): index for index in range(len(fields))}
+
+    counts = {}
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        for grp, *values, count in cursor.fetchall():
+            if grp == everything:
+                counts[(TOTAL, '')] = count
+            else:
+                index = grouped_by[grp]
+                counts[(fields[index], _counter_value(model_fields[index], values[index]))] = count
+    counts.setdefault((TOTAL, ''), 0)
+    return counts
+
+
+def rebuild_counters(get_model=django_apps.get_model):
+    """
+    Replace the counters with counts read from the source tables
+
+    The counter table is locked first, so in-flight writers finish before
+    the counts are read and new writers wait until the rebuild commits.
+
+    Args:
+        get_model: model lookup, e.g. the historical apps.get_model in migrations
+
+    Returns:
+        number of counters whose value changed
+    """
+    StatCounter = get_model('dashboard.StatCounter')
+    table = connection.ops.quote_name(StatCounter._meta.db_table)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE')
+
+        expected = {}
+        for scope, (label, fields) in COUNTED_FIELDS.items():
+            for (dimension, value), count in grouped_counts(get_model(label), fields).items():
+                expected[(scope, dimension, value)] = count
+
+        stored = {
+            (scope, dimension, value): count
+            for scope, dimension, value, count in StatCounter.objects.values_list(
+                'scope', 'dimension', 'value', 'count'
+            )
+        }
+        changed = sum(
+            1 for key in expected.keys() | stored.keys()
+            if expected.get(key, 0) != stored.get(key, 0)
+        )
+
+        StatCounter.objects.all().delete()
+        StatCounter.objects.bulk_create([
+            StatCounter(scope=scope, dimension=dimension, value=value, count=count)
+            for (scope, dimension, value), count in expected.items()
+        ])
+    return changed
+
+
+def counter_stamp(scope, dimension):
+    """
+    Return one dimension's counters as a string, a cheap validator for
+    responses that show those counts (e.g. ETags, see utils.conditional)
+    """
+    from .models import StatCounter
+
+    rows = (
+        StatCounter.objects.filter(scope=scope, dimension=dimension)
+        .order_by('value').values_list('value', 'count')
+    )
+    return ';'.join(f'{value}={count}' for value, count in rows)
+
+
+def read_counters():
+    """
+    Return the non-zero counters as {scope: {dimension: [(value, count), ...]}}
+    with values in database text order
+    """
+    from .models import StatCounter
+
+    counters = {scope: {TOTAL: [('', 0)]} for scope in COUNTED_FIELDS}
+    rows = StatCounter.objects.filter(count__gt=0).order_by('scope', 'dimension', 'value')
+    for scope, dimension, value, count in rows.values_list('scope', 'dimension', 'value', 'count'):
+        counters.setdefault(scope, {})
+        if dimension == TOTAL:
+            counters[scope][TOTAL] = [('', count)]
+        else:
+            counters[scope].setdefault(dimension, []).append((value, count))
+    return counters
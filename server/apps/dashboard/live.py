@@ -0,0 +1,111 @@
+"""
+Live Dashboard Statistics
+Counter deltas pushed to admin dashboards over the Channels layer
+
+Every committed change to the dashboard counters (see counters.py) is
+published to DASHBOARD_GROUP as raw (scope, dimension, value, delta) rows
+from transaction.on_commit, so rolled-back writes are never announced.
+DashboardConsumer coalesces the rows it receives over
+DASHBOARD_LIVE_COALESCE_SECONDS and sends one compact frame in the shape
+of GET /api/dashboard/stats/, e.g.
+
+    {"type": "stats_delta",
+     "deltas": {"students": {"total": 3, "active": 3, "byStatus": {"active": 3},
+                             "byDepartment": {"CSE": 3}, "bySemester": {"1": 3}}}}
+
+Only keys of the stats response are sent: a counter feeds its breakdown
+(STAT_KEYS) and, for the values the response counts on their own (e.g.
+"active"), that count (STAT_VALUES). A bulk import therefore reaches each
+dashboard as a single message.
+"""
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from .counters import TOTAL
+
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_GROUP = 'dashboard_stats'
+
+# Counter dimension -> key of the stats response breaking it down
+STAT_KEYS = {
+    'students': {'status': 'byStatus', 'department': 'byDepartment', 'semester': 'bySemester'},
+    'alumni': {'currentSupportCategory': 'bySupport', 'graduationYear': 'byYear'},
+    'applications': {'status': 'byStatus', 'applicationType': 'byType'},
+}
+
+# Counter dimension -> values the stats response counts under their own key
+STAT_VALUES = {
+    'students': {'status': ('active', 'graduated', 'discontinued')},
+    'alumni': {'alumniType': ('recent', 'established')},
+    'applications': {'status': ('pending', 'approved', 'rejected')},
+}
+
+
+def _group_send(message):
+    """Send to the dashboard group; a broken layer must not fail the write"""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(DASHBOARD_GROUP, message)
+    except Exception:
+        logger.exception('Could not publish dashboard statistics to the channel layer')
+
+
+def publish_stat_deltas(deltas):
+    """
+    Publish committed counter deltas
+
+    Args:
+        deltas: [((scope, dimension, value), delta), ...]
+    """
+    rows = [[scope, dimension, value, delta] for (scope, dimension, value), delta in deltas if delta]
+    if rows:
+        _group_send({'type': 'stats.delta', 'deltas': rows})
+
+
+def publish_stats_reset():
+    """Tell dashboards to reload the full statistics (e.g. after rebuild_counters)"""
+    _group_send({'type': 'stats.reset'})
+
+
+def merge_deltas(pending, rows):
+    """Add published rows to a pending Counter keyed by (scope, dimension, value)"""
+    for scope, dimension, value, delta in rows:
+        pending[(scope, dimension, value)] += delta
+
+
+def format_deltas(pending, department_codes):
+    """
+    Shape coalesced deltas like the stats response, dropping those that
+    cancelled out or have no key in it
+
+    Args:
+        pending: Counter {(scope, dimension, value): delta}
+        department_codes: {department id: code}
+    """
+    result = {}
+    for (scope, dimension, value), delta in sorted(pending.items()):
+        if not delta:
+            continue
+        if dimension == TOTAL:
+            result.setdefault(scope, {})['total'] = delta
+            continue
+        if value in STAT_VALUES.get(scope, {}).get(dimension, ()):
+            result.setdefault(scope, {})[value] = delta
+        key = STAT_KEYS.get(scope, {}).get(dimension)
+        if key is None:
+            continue
+        if dimension == 'department':
+            value = department_codes.get(value, value)
+        result.setdefault(scope, {}).setdefault(key, {})[value] = delta
+    return result
+
+
+def department_ids(pending):
+    """Department ids whose counters appear in the pending deltas"""
+    return {value for scope, dimension, value in pending if scope == 'students' and dimension == 'department'}
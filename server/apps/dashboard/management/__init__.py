@@ -0,0 +1,3 @@
+"""
+Management commands for dashboard app
+"""
@@ -0,0 +1,21 @@
+"""
+Management command to rebuild the dashboard counters from the source tables
+"""
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.counters import rebuild_counters
+from apps.dashboard.live import publish_stats_reset
+from apps.dashboard.stats import invalidate_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount students, alumni and applications into the dashboard counters, repairing any drift'
+
+    def handle(self, *args, **options):
+        """Rebuild every counter in one transaction and report how many were wrong"""
+        changed = rebuild_counters()
+        invalidate_dashboard_stats()
+        publish_stats_reset()
+        if changed:
+            self.stdout.write(self.style.WARNING(f'Corrected {changed} drifted counter(s)'))
+        self.stdout.write(self.style.SUCCESS('Dashboard counters rebuilt'))
@@ -0,0 +1,22 @@
+"""
+Management command to refresh the cohort dropout statistics
+"""
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.cohorts import refresh_cohort_stats
+
+
+class Command(BaseCommand):
+    help = 'Refresh the per-cohort (session, department, shift, last semester) student counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--blocking',
+            action='store_true',
+            help='Plain refresh: faster, but blocks reads of the cohort statistics until it finishes'
+        )
+
+    def handle(self, *args, **options):
+        """Refresh the materialized view, concurrently unless --blocking"""
+        rows = refresh_cohort_stats(concurrently=not options['blocking'])
+        self.stdout.write(self.style.SUCCESS(f'Cohort statistics refreshed: {rows} cohort row(s)'))
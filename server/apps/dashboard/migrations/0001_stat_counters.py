@@ -0,0 +1,89 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:52
+
+from django.db import migrations, models
+
+
+# Frozen copy of apps.dashboard.counters as of this migration, so later
+# changes to it do not change what a fresh migrate seeds
+COUNTED_FIELDS = {
+    'students': ('students.Student', ('status', 'department', 'semester')),
+    'alumni': ('alumni.Alumni', ('alumniType', 'currentSupportCategory', 'graduationYear')),
+    'applications': ('applications.Application', ('status', 'applicationType')),
+}
+
+
+def _counter_value(field, value):
+    if value is None:
+        return ''
+    return str(field.to_python(value))
+
+
+def grouped_counts(connection, model, fields):
+    """Count a table overall ('total') and per value of each field"""
+    quote = connection.ops.quote_name
+    model_fields = [model._meta.get_field(name) for name in fields]
+    columns = ', '.join(quote(field.column) for field in model_fields)
+    sets = ', '.join(f'({quote(field.column)})' for field in model_fields)
+    everything = (1 << len(fields)) - 1
+    grouped_by = {everything ^ (1 << (len(fields) - 1 - index)): index for index in range(len(fields))}
+
+    counts = {('total', ''): 0}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT GROUPING({columns}) AS grp, {columns}, COUNT(*) '
+            f'FROM {quote(model._meta.db_table)} GROUP BY GROUPING SETS ({sets}, ())'
+        )
+        for grp, *values, count in cursor.fetchall():
+            if grp == everything:
+                counts[('total', '')] = count
+            else:
+                index = grouped_by[grp]
+                counts[(fields[index], _counter_value(model_fields[index], values[index]))] = count
+    return counts
+
+
+def seed_counters(apps, schema_editor):
+    """Count the existing students, alumni and applications"""
+    StatCounter = apps.get_model('dashboard', 'StatCounter')
+    counters = []
+    for scope, (label, fields) in COUNTED_FIELDS.items():
+        for (dimension, value), count in grouped_counts(
+            schema_editor.connection, apps.get_model(label), fields
+        ).items():
+            counters.append(StatCounter(scope=scope, dimension=dimension, value=value, count=count))
+    StatCounter.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('students', '0006_student_updated_index'),
+        ('alumni', '0001_initial'),
+        ('applications', '0003_application_updatedat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=30)),
+                ('dimension', models.CharField(max_length=50)),
+                ('value', models.CharField(blank=True, max_length=255)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Statistics Counter',
+                'verbose_name_plural': 'Statistics Counters',
+                'db_table': 'dashboard_counters',
+                'ordering': ['scope', 'dimension', 'value'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='statcounter',
+            constraint=models.UniqueConstraint(fields=('scope', 'dimension', 'value'), name='dashboard_counter_unique'),
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
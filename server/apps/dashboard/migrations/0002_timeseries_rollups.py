@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_stat_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=30)),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Daily Rollup',
+                'verbose_name_plural': 'Daily Rollups',
+                'db_table': 'dashboard_daily_rollups',
+                'ordering': ['metric', 'day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=30)),
+                ('month', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Monthly Rollup',
+                'verbose_name_plural': 'Monthly Rollups',
+                'db_table': 'dashboard_monthly_rollups',
+                'ordering': ['metric', 'month'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=30, unique=True)),
+                ('processedThrough', models.DateField()),
+                ('updatedAt', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Rollup Cursor',
+                'verbose_name_plural': 'Rollup Cursors',
+                'db_table': 'dashboard_rollup_cursors',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyrollup',
+            constraint=models.UniqueConstraint(fields=('metric', 'month'), name='dashboard_monthly_rollup_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrollup',
+            constraint=models.UniqueConstraint(fields=('metric', 'day'), name='dashboard_daily_rollup_unique'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+CREATE_VIEW = """
+CREATE MATERIALIZED VIEW dashboard_cohort_stats AS
+SELECT
+    hashtextextended(
+        concat_ws('|', s.session, s.department_id::text, s.shift, COALESCE(s."lastSemester", 0)::text), 0
+    ) AS id,
+    s.session,
+    s.department_id,
+    d.code AS "departmentCode",
+    d.name AS "departmentName",
+    s.shift,
+    COALESCE(s."lastSemester", 0) AS "lastSemester",
+    COUNT(*)::integer AS total,
+    (COUNT(*) FILTER (WHERE s.status = 'active'))::integer AS active,
+    (COUNT(*) FILTER (WHERE s.status = 'inactive'))::integer AS inactive,
+    (COUNT(*) FILTER (WHERE s.status = 'graduated'))::integer AS graduated,
+    (COUNT(*) FILTER (WHERE s.status = 'discontinued'))::integer AS discontinued
+FROM students s
+JOIN departments d ON d.id = s.department_id
+GROUP BY s.session, s.department_id, d.code, d.name, s.shift, COALESCE(s."lastSemester", 0)
+WITH DATA;
+
+-- REFRESH ... CONCURRENTLY needs a unique index over all rows
+CREATE UNIQUE INDEX dashboard_cohort_stats_key
+    ON dashboard_cohort_stats (session, department_id, shift, "lastSemester");
+CREATE UNIQUE INDEX dashboard_cohort_stats_id ON dashboard_cohort_stats (id);
+CREATE INDEX dashboard_cohort_stats_department ON dashboard_cohort_stats (department_id);
+"""
+
+DROP_VIEW = "DROP MATERIALIZED VIEW IF EXISTS dashboard_cohort_stats;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0001_initial'),
+        ('students', '0007_enrollment_index'),
+        ('dashboard', '0002_timeseries_rollups'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_VIEW, DROP_VIEW),
+        migrations.CreateModel(
+            name='CohortStat',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('session', models.CharField(max_length=20)),
+                ('department', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='departments.department')),
+                ('departmentCode', models.CharField(max_length=10)),
+                ('departmentName', models.CharField(max_length=255)),
+                ('shift', models.CharField(max_length=20)),
+                ('lastSemester', models.IntegerField()),
+                ('total', models.IntegerField()),
+                ('active', models.IntegerField()),
+                ('inactive', models.IntegerField()),
+                ('graduated', models.IntegerField()),
+                ('discontinued', models.IntegerField()),
+            ],
+            options={
+                'verbose_name': 'Cohort Statistic',
+                'verbose_name_plural': 'Cohort Statistics',
+                'db_table': 'dashboard_cohort_stats',
+                'ordering': ['session', 'departmentCode', 'shift', 'lastSemester'],
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,3 @@
+"""
+Dashboard App Migrations
+"""
@@ -0,0 +1,130 @@
+"""
+Dashboard Models
+"""
+from django.db import models
+
+
+class StatCounter(models.Model):
+    """
+    Running row count of a table, overall or per value of one column
+
+    Maintained by the signal handlers in signals.py (see counters.py) and
+    rebuilt from the source tables by `manage.py rebuild_counters`.
+    The total of a table is stored as dimension 'total' with an empty value.
+    """
+    scope = models.CharField(max_length=30)  # students, alumni, applications
+    dimension = models.CharField(max_length=50)  # counted field, or 'total'
+    value = models.CharField(max_length=255, blank=True)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'dashboard_counters'
+        ordering = ['scope', 'dimension', 'value']
+        verbose_name = 'Statistics Counter'
+        verbose_name_plural = 'Statistics Counters'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'dimension', 'value'],
+                name='dashboard_counter_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}.{self.dimension}[{self.value}] = {self.count}"
+
+
+class DailyRollup(models.Model):
+    """
+    Number of events of one metric (enrollments, applications, graduations)
+    on one day; written by `manage.py rollup_timeseries` (see rollups.py)
+    """
+    metric = models.CharField(max_length=30)
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'dashboard_daily_rollups'
+        ordering = ['metric', 'day']
+        verbose_name = 'Daily Rollup'
+        verbose_name_plural = 'Daily Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'day'], name='dashboard_daily_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric} {self.day}: {self.count}"
+
+
+class MonthlyRollup(models.Model):
+    """
+    Number of events of one metric in one month (month = its first day),
+    summed from DailyRollup
+    """
+    metric = models.CharField(max_length=30)
+    month = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'dashboard_monthly_rollups'
+        ordering = ['metric', 'month']
+        verbose_name = 'Monthly Rollup'
+        verbose_name_plural = 'Monthly Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'month'], name='dashboard_monthly_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric} {self.month:%Y-%m}: {self.count}"
+
+
+class RollupCursor(models.Model):
+    """
+    Last day of a metric whose rollup is final; the next run starts the day after
+    """
+    metric = models.CharField(max_length=30, unique=True)
+    processedThrough = models.DateField()
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'dashboard_rollup_cursors'
+        verbose_name = 'Rollup Cursor'
+        verbose_name_plural = 'Rollup Cursors'
+
+    def __str__(self):
+        return f"{self.metric} through {self.processedThrough}"
+
+
+class CohortStat(models.Model):
+    """
+    Student counts of one cohort (session, department, shift) by the
+    semester they left in, per status
+
+    Read-only: a materialized view created by migration 0003 and refreshed
+    by `manage.py refresh_cohort_stats` (see cohorts.py). lastSemester is 0
+    for students without one (typically everyone still enrolled); id is a
+    hash of the cohort key, stable across refreshes.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    session = models.CharField(max_length=20)
+    department = models.ForeignKey(
+        'departments.Department', on_delete=models.DO_NOTHING, db_constraint=False, related_name='+'
+    )
+    departmentCode = models.CharField(max_length=10)
+    departmentName = models.CharField(max_length=255)
+    shift = models.CharField(max_length=20)
+    lastSemester = models.IntegerField()
+    total = models.IntegerField()
+    active = models.IntegerField()
+    inactive = models.IntegerField()
+    graduated = models.IntegerField()
+    discontinued = models.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'dashboard_cohort_stats'
+        ordering = ['session', 'departmentCode', 'shift', 'lastSemester']
+        verbose_name = 'Cohort Statistic'
+        verbose_name_plural = 'Cohort Statistics'
+
+    def __str__(self):
+        return f"{self.session} {self.departmentCode} {self.shift} [{self.lastSemester}]: {self.total}"
@@ -0,0 +1,225 @@
+"""
+Dashboard Rollups
+Daily and monthly event counts for the trend charts
+
+ROLLUP_METRICS maps each metric to the date (or datetime) column that
+places a row in time. `manage.py rollup_timeseries` fills DailyRollup
+incrementally:
+- each metric has a RollupCursor, the last day whose counts are final
+- a run only reads source rows from the day after the cursor through
+  today, with one GROUP BY over an indexed range; today is rewritten on
+  every run and only becomes final once it is over
+- the MonthlyRollup rows of the touched months are re-summed from
+  DailyRollup, never from the source tables
+A row added to, moved from or deleted from an already final day (e.g. a
+backdated enrollmentDate) moves the cursor back before that day, so the
+next run re-aggregates from there: saves and deletes through signals.py,
+writes that skip model signals (bulk_create) through mark_rows_dirty().
+--since reprocesses any range explicitly.
+
+GET /api/dashboard/timeseries/ reads only the rollup tables.
+"""
+import datetime
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Count, DateTimeField, F, Min, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import DailyRollup, MonthlyRollup, RollupCursor
+
+
+# metric: (model label, date or datetime field)
+ROLLUP_METRICS = {
+    'enrollments': ('students.Student', 'enrollmentDate'),
+    'applications': ('applications.Application', 'submittedAt'),
+    'graduations': ('alumni.Alumni', 'transitionDate'),
+}
+
+GRANULARITIES = ('day', 'month')
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(day):
+    return (day.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def period_count(granularity, start, end):
+    """Number of days or months from start to end, inclusive"""
+    if granularity == 'day':
+        return (end - start).days + 1
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def periods(granularity, start, end):
+    """Return every day or month start from start to end, inclusive"""
+    result = []
+    current = start if granularity == 'day' else month_start(start)
+    while current <= end:
+        result.append(current)
+        current = current + datetime.timedelta(days=1) if granularity == 'day' else next_month(current)
+    return result
+
+
+def _source(metric):
+    label, field_name = ROLLUP_METRICS[metric]
+    model = django_apps.get_model(label)
+    return model, field_name, isinstance(model._meta.get_field(field_name), DateTimeField)
+
+
+def rollup_sources():
+    """Return {model class: (metric, date field)} for the installed models"""
+    return {
+        django_apps.get_model(label): (metric, field_name)
+        for metric, (label, field_name) in ROLLUP_METRICS.items()
+    }
+
+
+def event_day(metric, value):
+    """(Local) day a date or datetime value of the metric's column falls on"""
+    model, field_name, is_datetime = _source(metric)
+    value = model._meta.get_field(field_name).to_python(value)
+    if value is None or not is_datetime:
+        return value
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return timezone.localdate(value)
+
+
+def mark_dirty(metric, days):
+    """
+    Move the metric's cursor back before the earliest of the days, if it
+    is already final, so the next run re-aggregates from it
+
+    Returns:
+        whether the cursor moved
+    """
+    # The cursor never reaches today: later days need no update
+    days = [day for day in days if day is not None and day < timezone.localdate()]
+    if not days:
+        return False
+    first = min(days)
+    return bool(RollupCursor.objects.filter(metric=metric, processedThrough__gte=first).update(
+        processedThrough=first - datetime.timedelta(days=1), updatedAt=timezone.now()
+    ))
+
+
+def mark_rows_dirty(instances):
+    """Mark the days of rows inserted without model signals (e.g. bulk_create)"""
+    sources = rollup_sources()
+    days = {}
+    for instance in instances:
+        metric, field_name = sources[type(instance)]
+        days.setdefault(metric, []).append(event_day(metric, getattr(instance, field_name)))
+    for metric, metric_days in days.items():
+        mark_dirty(metric, metric_days)
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def first_event_day(metric):
+    """Day of the metric's earliest source row, or None if there is none"""
+    model, field_name, is_datetime = _source(metric)
+    first = model.objects.aggregate(first=Min(field_name))['first']
+    if first is None or not is_datetime:
+        return first
+    return timezone.localdate(first)
+
+
+def daily_source_counts(metric, start, end):
+    """
+    Count the metric's source rows per (local) day from start to end with
+    one GROUP BY over the date column range
+
+    Returns:
+        {day: count}
+    """
+    model, field_name, is_datetime = _source(metric)
+    if is_datetime:
+        rows = model.objects.filter(**{
+            f'{field_name}__gte': _local_midnight(start),
+            f'{field_name}__lt': _local_midnight(end + datetime.timedelta(days=1)),
+        }).annotate(day=TruncDate(field_name))
+    else:
+        rows = model.objects.filter(**{f'{field_name}__range': (start, end)}).annotate(day=F(field_name))
+    return dict(rows.order_by().values('day').annotate(count=Count('pk')).values_list('day', 'count'))
+
+
+def rollup_metric(metric, today=None, since=None):
+    """
+    Roll up the metric from the day after its cursor (or `since`) through today
+
+    Args:
+        metric: key of ROLLUP_METRICS
+        today: last day to roll up (default: the current local date)
+        since: reprocess from this day instead of the cursor
+
+    Returns:
+        number of days processed
+    """
+    today = today or timezone.localdate()
+    with transaction.atomic():
+        cursor = RollupCursor.objects.select_for_update().filter(metric=metric).first()
+        if since is not None:
+            start = since
+        elif cursor is not None:
+            start = cursor.processedThrough + datetime.timedelta(days=1)
+        else:
+            start = first_event_day(metric) or today
+        start = min(start, today)
+
+        counts = daily_source_counts(metric, start, today)
+        DailyRollup.objects.filter(metric=metric, day__range=(start, today)).delete()
+        DailyRollup.objects.bulk_create([
+            DailyRollup(metric=metric, day=day, count=count)
+            for day, count in sorted(counts.items()) if count
+        ])
+
+        # Re-sum the touched months from the daily rows
+        first_month = month_start(start)
+        monthly = (
+            DailyRollup.objects.filter(metric=metric, day__gte=first_month, day__lt=next_month(today))
+            .annotate(month=TruncMonth('day')).order_by()
+            .values('month').annotate(total=Sum('count')).values_list('month', 'total')
+        )
+        MonthlyRollup.objects.filter(metric=metric, month__range=(first_month, today)).delete()
+        MonthlyRollup.objects.bulk_create([
+            MonthlyRollup(metric=metric, month=month, count=total) for month, total in sorted(monthly)
+        ])
+
+        yesterday = today - datetime.timedelta(days=1)
+        if cursor is None:
+            RollupCursor.objects.create(metric=metric, processedThrough=yesterday)
+        elif cursor.processedThrough != yesterday:
+            cursor.processedThrough = max(cursor.processedThrough, yesterday)
+            cursor.save(update_fields=['processedThrough', 'updatedAt'])
+    return (today - start).days + 1
+
+
+def timeseries(metrics, granularity, start, end):
+    """
+    Read zero-filled series from the rollup tables
+
+    Returns:
+        {metric: [{'period': 'YYYY-MM-DD', 'count': n}, ...]}
+    """
+    if granularity == 'day':
+        rows = DailyRollup.objects.filter(metric__in=metrics, day__range=(start, end)).values_list(
+            'metric', 'day', 'count'
+        )
+    else:
+        rows = MonthlyRollup.objects.filter(
+            metric__in=metrics, month__range=(month_start(start), end)
+        ).values_list('metric', 'month', 'count')
+    counts = {(metric, period): count for metric, period, count in rows}
+    buckets = periods(granularity, start, end)
+    return {
+        metric: [{'period': period.isoformat(), 'count': counts.get((metric, period), 0)} for period in buckets]
+        for metric in metrics
+    }
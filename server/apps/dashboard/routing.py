@@ -0,0 +1,10 @@
+"""
+WebSocket routing for the dashboard
+"""
+
+from django.urls import re_path
+from . import consumers
+
+websocket_urlpatterns = [
+    re_path(r'ws/dashboard/$', consumers.DashboardConsumer.as_asgi()),
+]
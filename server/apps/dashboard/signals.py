@@ -0,0 +1,107 @@
+"""
+Signals maintaining the dashboard counters and rollup cursors and
+invalidating the cached dashboard statistics
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.alumni.models import Alumni
+from apps.applications.models import Application
+from apps.departments.models import Department
+from apps.students.models import Student
+from .counters import (
+    apply_counter_deltas, counted_models, deleted_deltas, lock_stored_values, saved_deltas,
+)
+from .rollups import event_day, mark_dirty, rollup_sources
+from .stats import invalidate_dashboard_stats
+
+
+# {model: (scope, counted fields)}
+COUNTED_SENDERS = counted_models()
+
+# {model: (rollup metric, date field)}
+ROLLUP_SENDERS = rollup_sources()
+
+
+@receiver(pre_save, sender=Student)
+@receiver(pre_save, sender=Alumni)
+@receiver(pre_save, sender=Application)
+@receiver(pre_delete, sender=Student)
+@receiver(pre_delete, sender=Alumni)
+@receiver(pre_delete, sender=Application)
+def lock_stored_row(sender, instance, **kwargs):
+    """
+    Signal handler reading the row's stored counted values and rollup date
+    under a row lock
+    Runs inside the model's save (or the deletion) transaction
+    """
+    lock_stored_values(instance, (*COUNTED_SENDERS[sender][1], ROLLUP_SENDERS[sender][1]))
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Alumni)
+@receiver(post_save, sender=Application)
+def count_saved(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Signal handler moving the counters of a created or updated row
+    Runs inside the model's save transaction
+    """
+    scope, fields = COUNTED_SENDERS[sender]
+    apply_counter_deltas(saved_deltas(instance, scope, fields, created, update_fields))
+
+
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Alumni)
+@receiver(post_delete, sender=Application)
+def count_deleted(sender, instance, **kwargs):
+    """
+    Signal handler decrementing the counters of a deleted row
+    Runs inside the deletion transaction
+    """
+    scope, fields = COUNTED_SENDERS[sender]
+    apply_counter_deltas(deleted_deltas(instance, scope, fields))
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Alumni)
+@receiver(post_save, sender=Application)
+def rollup_saved(sender, instance, created, **kwargs):
+    """
+    Signal handler marking the rollup days a row was added to or moved
+    between as dirty
+    """
+    metric, field_name = ROLLUP_SENDERS[sender]
+    attname = instance._meta.get_field(field_name).attname
+    if attname not in instance.__dict__:
+        return
+    day = event_day(metric, instance.__dict__[attname])
+    stored = None if created else event_day(metric, getattr(instance, '_stored_values', {}).get(field_name))
+    if created or stored != day:
+        mark_dirty(metric, [stored, day])
+
+
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Alumni)
+@receiver(post_delete, sender=Application)
+def rollup_deleted(sender, instance, **kwargs):
+    """
+    Signal handler marking the rollup day a row was deleted from as dirty
+    """
+    metric, field_name = ROLLUP_SENDERS[sender]
+    mark_dirty(metric, [event_day(metric, getattr(instance, '_stored_values', {}).get(field_name))])
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=Alumni)
+@receiver(post_delete, sender=Alumni)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def dashboard_source_changed(sender, instance, **kwargs):
+    """
+    Signal handler dropping the cached statistics when a counted row changes
+    """
+    invalidate_dashboard_stats()
@@ -0,0 +1,125 @@
+"""
+Dashboard Statistics
+Built from the maintained counters, read in a single transaction and cached
+
+The statistics never scan students, alumni or applications: they are read
+from StatCounter (see counters.py), plus the names of the counted
+departments, in one read-only REPEATABLE READ transaction so the numbers
+describe the same snapshot.
+
+The compiled response is kept in a stale-while-revalidate cache
+(utils/swr_cache.py) and invalidated whenever a student, alumni record,
+application or department is saved or deleted (see signals.py); writes
+that bypass model signals (bulk_create, queryset.update) must call
+invalidate_dashboard_stats() themselves.
+"""
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.departments.models import Department
+from utils.swr_cache import SWRCache
+from .counters import TOTAL, read_counters
+
+
+DASHBOARD_STATS_CACHE_KEY = 'stats'
+
+dashboard_stats_cache = SWRCache(
+    'dashboard-stats',
+    ttl=getattr(settings, 'DASHBOARD_STATS_CACHE_TIMEOUT', 300),
+    stale_ttl=3600,
+)
+
+
+def _count_of(rows, value):
+    """Count for `value` in [(value, count), ...] rows, 0 when absent"""
+    return next((count for key, count in rows if key == value), 0)
+
+
+def _total(counters):
+    return counters[TOTAL][0][1]
+
+
+def student_stats(counters):
+    """Student totals and breakdowns by status, department and semester"""
+    by_status = counters.get('status', [])
+    by_department = dict(counters.get('department', []))
+    departments = Department.objects.filter(id__in=list(by_department)).order_by('name')
+
+    return {
+        'total': _total(counters),
+        'active': _count_of(by_status, 'active'),
+        'graduated': _count_of(by_status, 'graduated'),
+        'discontinued': _count_of(by_status, 'discontinued'),
+        'byStatus': [{'status': value, 'count': count} for value, count in by_status],
+        'byDepartment': [
+            {'department__name': name, 'department__code': code, 'count': by_department[str(pk)]}
+            for pk, name, code in departments.values_list('id', 'name', 'code')
+        ],
+        'bySemester': [
+            {'semester': int(value), 'count': count}
+            for value, count in sorted(counters.get('semester', []), key=lambda item: int(item[0]))
+        ],
+    }
+
+
+def alumni_stats(counters):
+    """Alumni totals and breakdowns by type, support category and graduation year"""
+    by_type = counters.get('alumniType', [])
+    by_year = sorted(counters.get('graduationYear', []), key=lambda item: int(item[0]), reverse=True)
+
+    return {
+        'total': _total(counters),
+        'recent': _count_of(by_type, 'recent'),
+        'established': _count_of(by_type, 'established'),
+        'bySupport': dict(counters.get('currentSupportCategory', [])),
+        'byYear': dict(by_year),
+    }
+
+
+def application_stats(counters):
+    """Application totals and breakdowns by status and type"""
+    by_status = counters.get('status', [])
+
+    return {
+        'total': _total(counters),
+        'pending': _count_of(by_status, 'pending'),
+        'approved': _count_of(by_status, 'approved'),
+        'rejected': _count_of(by_status, 'rejected'),
+        'byStatus': [{'status': value, 'count': count} for value, count in by_status],
+        'byType': [
+            {'applicationType': value, 'count': count}
+            for value, count in counters.get('applicationType', [])
+        ],
+    }
+
+
+def compute_dashboard_stats():
+    """Read all dashboard statistics from one consistent snapshot"""
+    # SET TRANSACTION must come first in the transaction, so only when
+    # atomic() opens a new one rather than a savepoint
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost:
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+        counters = read_counters()
+        return {
+            'students': student_stats(counters['students']),
+            'alumni': alumni_stats(counters['alumni']),
+            'applications': application_stats(counters['applications']),
+        }
+
+
+def get_dashboard_stats():
+    """Return the cached dashboard statistics, computing them on a miss"""
+    return dashboard_stats_cache.get_or_compute(DASHBOARD_STATS_CACHE_KEY, compute_dashboard_stats)
+
+
+def invalidate_dashboard_stats():
+    """
+    Mark the cached statistics stale now and again once the current
+    transaction commits, so a request reading before the commit cannot
+    leave old data cached as fresh
+    """
+    dashboard_stats_cache.invalidate(DASHBOARD_STATS_CACHE_KEY)
+    transaction.on_commit(lambda: dashboard_stats_cache.invalidate(DASHBOARD_STATS_CACHE_KEY))
@@ -0,0 +1,609 @@
+"""
+Dashboard API Tests
+"""
+import datetime
+import threading
+import time
+from collections import Counter
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.alumni.models import Alumni
+from apps.applications.models import Application
+from apps.departments.models import Department
+from apps.students.models import Student
+from apps.students.tests import create_test_student
+from utils.swr_cache import DjangoCacheBackend, LocalMemoryBackend, SWRCache, get_backend
+from .consumers import DashboardConsumer
+from .counters import rebuild_counters
+from .live import format_deltas
+from .models import DailyRollup, MonthlyRollup, StatCounter
+from .rollups import rollup_metric
+from .stats import DASHBOARD_STATS_CACHE_KEY, compute_dashboard_stats, dashboard_stats_cache
+
+
+def create_test_application(suffix, **overrides):
+    data = {
+        'fullNameBangla': 'জন ডো',
+        'fullNameEnglish': 'John Doe',
+        'fatherName': 'Father',
+        'motherName': 'Mother',
+        'department': 'CS',
+        'session': '2023',
+        'shift': 'Day',
+        'rollNumber': f'R{suffix}',
+        'registrationNumber': f'REG{suffix}',
+        'applicationType': 'Testimonial',
+        'subject': 'Test',
+        'message': 'Test message',
+    }
+    data.update(overrides)
+    return Application.objects.create(**data)
+
+
+class DashboardStatsTest(APITestCase):
+    """Test GET /api/dashboard/stats/"""
+
+    url = '/api/dashboard/stats/'
+
+    def setUp(self):
+        dashboard_stats_cache.clear()
+        self.cse = Department.objects.create(name='Computer Science', code='CSE')
+        self.eee = Department.objects.create(name='Electrical', code='EEE')
+        create_test_student(self.cse, 1, semester=1)
+        create_test_student(self.cse, 2, semester=3, status='discontinued')
+        create_test_student(self.eee, 3, semester=3)
+        graduate = create_test_student(self.eee, 4, semester=8, status='graduated')
+        Alumni.objects.create(
+            student=graduate,
+            alumniType='recent',
+            graduationYear=2024,
+            currentSupportCategory='no_support_needed'
+        )
+        create_test_application(1)
+        create_test_application(2, status='approved', applicationType='Transcript')
+        create_test_application(3, applicationType='Transcript')
+
+    def tearDown(self):
+        dashboard_stats_cache.clear()
+
+    def test_stats_response(self):
+        """Totals and breakdowns match the rows"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'students': {
+                'total': 4,
+                'active': 2,
+                'graduated': 1,
+                'discontinued': 1,
+                'byStatus': [
+                    {'status': 'active', 'count': 2},
+                    {'status': 'discontinued', 'count': 1},
+                    {'status': 'graduated', 'count': 1},
+                ],
+                'byDepartment': [
+                    {'department__name': 'Computer Science', 'department__code': 'CSE', 'count': 2},
+                    {'department__name': 'Electrical', 'department__code': 'EEE', 'count': 2},
+                ],
+                'bySemester': [
+                    {'semester': 1, 'count': 1},
+                    {'semester': 3, 'count': 2},
+                    {'semester': 8, 'count': 1},
+                ],
+            },
+            'alumni': {
+                'total': 1,
+                'recent': 1,
+                'established': 0,
+                'bySupport': {'no_support_needed': 1},
+                'byYear': {'2024': 1},
+            },
+            'applications': {
+                'total': 3,
+                'pending': 2,
+                'approved': 1,
+                'rejected': 0,
+                'byStatus': [
+                    {'status': 'approved', 'count': 1},
+                    {'status': 'pending', 'count': 2},
+                ],
+                'byType': [
+                    {'applicationType': 'Testimonial', 'count': 1},
+                    {'applicationType': 'Transcript', 'count': 2},
+                ],
+            },
+        })
+
+    def test_empty_tables(self):
+        """Empty tables report zero totals and empty breakdowns"""
+        Alumni.objects.all().delete()
+        Application.objects.all().delete()
+        stats = compute_dashboard_stats()
+
+        self.assertEqual(stats['alumni'], {
+            'total': 0, 'recent': 0, 'established': 0, 'bySupport': {}, 'byYear': {},
+        })
+        self.assertEqual(stats['applications']['total'], 0)
+        self.assertEqual(stats['applications']['byStatus'], [])
+
+    def test_reads_counters_only(self):
+        """Statistics come from the counters, not the counted tables"""
+        with CaptureQueriesContext(connection) as queries:
+            compute_dashboard_stats()
+
+        selects = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 2)
+        for table in ('"students"', '"alumni"', '"applications"'):
+            self.assertFalse(any(f'FROM {table}' in sql for sql in selects))
+
+    def test_cached_until_invalidated(self):
+        """Repeat requests hit the cache; saving or deleting a row invalidates it"""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['students']['total'], 4)
+
+        create_test_student(self.cse, 5)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['students']['total'], 5)
+
+        Application.objects.filter(status='approved').get().delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['applications']['approved'], 0)
+
+        student = Student.objects.get(currentRollNumber='CR5')
+        student.status = 'discontinued'
+        student.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['students']['discontinued'], 2)
+
+
+class StatCounterTest(APITestCase):
+    """Test the signal-maintained dashboard counters"""
+
+    def setUp(self):
+        dashboard_stats_cache.clear()
+        self.cse = Department.objects.create(name='Computer Science', code='CSE')
+        self.eee = Department.objects.create(name='Electrical', code='EEE')
+
+    def tearDown(self):
+        dashboard_stats_cache.clear()
+
+    def counters(self):
+        return {
+            (scope, dimension, value): count
+            for scope, dimension, value, count in StatCounter.objects.filter(count__gt=0).values_list(
+                'scope', 'dimension', 'value', 'count'
+            )
+        }
+
+    def assertCountersConsistent(self):
+        """The maintained counters equal a recount of the tables"""
+        maintained = self.counters()
+        self.assertEqual(rebuild_counters(), 0)
+        self.assertEqual(self.counters(), maintained)
+
+    def test_create_update_delete(self):
+        """Counters follow creates, changed values and deletes"""
+        student = create_test_student(self.cse, 1, semester=2)
+        other = create_test_student(self.cse, 2)
+        self.assertEqual(self.counters()[('students', 'total', '')], 2)
+        self.assertEqual(self.counters()[('students', 'department', str(self.cse.pk))], 2)
+
+        student.status = 'discontinued'
+        student.department = self.eee
+        student.save()
+        counters = self.counters()
+        self.assertEqual(counters[('students', 'status', 'active')], 1)
+        self.assertEqual(counters[('students', 'status', 'discontinued')], 1)
+        self.assertEqual(counters[('students', 'department', str(self.eee.pk))], 1)
+        self.assertCountersConsistent()
+
+        Student.objects.filter(pk=other.pk).delete()
+        self.assertNotIn(('students', 'semester', '1'), self.counters())
+        self.assertCountersConsistent()
+
+    def test_deferred_and_update_fields(self):
+        """Rows loaded with only() or saved with update_fields are counted correctly"""
+        create_test_student(self.cse, 1)
+        student = Student.objects.only('id', 'fullNameEnglish').get()
+        student.status = 'graduated'
+        student.save(update_fields=['status'])
+        self.assertEqual(self.counters()[('students', 'status', 'graduated')], 1)
+
+        student = Student.objects.get()
+        student.semester = 5
+        student.status = 'active'
+        student.save(update_fields=['semester'])
+        student.save(update_fields=['status'])
+        self.assertCountersConsistent()
+
+        Student.objects.only('id').get().delete()
+        self.assertEqual(self.counters(), {})
+
+    def test_stale_copies_count_once(self):
+        """Saves of copies loaded before another save move the counters from the stored row"""
+        student = create_test_student(self.cse, 1)
+        first = Student.objects.get(pk=student.pk)
+        second = Student.objects.get(pk=student.pk)
+        first.status = 'graduated'
+        first.save()
+        second.status = 'graduated'
+        second.save()
+        self.assertEqual(self.counters()[('students', 'status', 'graduated')], 1)
+        self.assertCountersConsistent()
+
+        first.status = 'inactive'
+        first.save()
+        second.delete()
+        self.assertEqual(self.counters(), {})
+
+    def test_alumni_and_applications(self):
+        """Alumni and application counters, including the graduation year"""
+        graduate = create_test_student(self.cse, 1, status='graduated')
+        alumni = Alumni.objects.create(student=graduate, graduationYear=2023)
+        create_test_application(1, applicationType='Transcript')
+        application = create_test_application(2)
+        application.status = 'rejected'
+        application.save()
+        alumni.currentSupportCategory = 'receiving_support'
+        alumni.save()
+
+        counters = self.counters()
+        self.assertEqual(counters[('alumni', 'graduationYear', '2023')], 1)
+        self.assertEqual(counters[('alumni', 'currentSupportCategory', 'receiving_support')], 1)
+        self.assertEqual(counters[('applications', 'status', 'rejected')], 1)
+        self.assertCountersConsistent()
+
+    def test_rebuild_counters_command(self):
+        """rebuild_counters repairs writes that bypassed the signals"""
+        create_test_student(self.cse, 1)
+        create_test_student(self.cse, 2)
+        Student.objects.update(status='inactive')
+        self.assertEqual(self.counters()[('students', 'status', 'active')], 2)
+
+        output = StringIO()
+        call_command('rebuild_counters', stdout=output)
+
+        self.assertIn('Corrected 2', output.getvalue())
+        self.assertEqual(self.counters()[('students', 'status', 'inactive')], 2)
+        self.assertNotIn(('students', 'status', 'active'), self.counters())
+
+
+class DashboardTimeseriesTest(APITestCase):
+    """Test the time series rollups and GET /api/dashboard/timeseries/"""
+
+    url = '/api/dashboard/timeseries/'
+
+    def setUp(self):
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.today = datetime.date(2024, 3, 10)
+        create_test_student(self.department, 1, enrollmentDate='2024-01-15')
+        create_test_student(self.department, 2, enrollmentDate='2024-01-15')
+        create_test_student(self.department, 3, enrollmentDate='2024-03-09')
+        application = create_test_application(1)
+        Application.objects.filter(pk=application.pk).update(
+            submittedAt=timezone.make_aware(datetime.datetime(2024, 2, 29, 23, 30))
+        )
+
+    def test_incremental_rollup(self):
+        """Runs only reprocess days after the cursor, moved back by backdated rows"""
+        self.assertEqual(rollup_metric('enrollments', today=self.today), 56)
+        self.assertEqual(
+            list(DailyRollup.objects.filter(metric='enrollments').values_list('day', 'count')),
+            [(datetime.date(2024, 1, 15), 2), (datetime.date(2024, 3, 9), 1)]
+        )
+
+        create_test_student(self.department, 4, enrollmentDate='2024-03-10')
+        self.assertEqual(rollup_metric('enrollments', today=self.today), 1)
+
+        backdated = create_test_student(self.department, 5, enrollmentDate='2024-01-20')
+        self.assertEqual(rollup_metric('enrollments', today=self.today), 51)
+        self.assertEqual(
+            list(MonthlyRollup.objects.filter(metric='enrollments').values_list('month', 'count')),
+            [(datetime.date(2024, 1, 1), 3), (datetime.date(2024, 3, 1), 2)]
+        )
+
+        # Moving a row between final days and deleting one are picked up too
+        backdated.enrollmentDate = datetime.date(2024, 2, 1)
+        backdated.save()
+        self.assertEqual(rollup_metric('enrollments', today=self.today), 51)
+        Student.objects.get(currentRollNumber='CR1').delete()
+        self.assertEqual(rollup_metric('enrollments', today=self.today), 56)
+        self.assertEqual(
+            list(DailyRollup.objects.filter(metric='enrollments').values_list('day', 'count')),
+            [(datetime.date(2024, 1, 15), 1), (datetime.date(2024, 2, 1), 1),
+             (datetime.date(2024, 3, 9), 1), (datetime.date(2024, 3, 10), 1)]
+        )
+        self.assertEqual(rollup_metric('enrollments', today=self.today), 1)
+
+        rollup_metric('enrollments', today=self.today, since=datetime.date(2024, 1, 1))
+        self.assertEqual(
+            MonthlyRollup.objects.get(metric='enrollments', month=datetime.date(2024, 1, 1)).count, 1
+        )
+
+    def test_timeseries_from_rollups(self):
+        """Series are zero-filled and read without touching the source tables"""
+        for metric in ('enrollments', 'applications', 'graduations'):
+            rollup_metric(metric, today=self.today)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'granularity': 'month', 'start': '2024-01-01', 'end': '2024-03-31'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['series']['enrollments'], [
+            {'period': '2024-01-01', 'count': 2},
+            {'period': '2024-02-01', 'count': 0},
+            {'period': '2024-03-01', 'count': 1},
+        ])
+        self.assertEqual([point['count'] for point in response.data['series']['applications']], [0, 1, 0])
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertIn('dashboard_monthly_rollups', queries.captured_queries[0]['sql'])
+
+        response = self.client.get(self.url, {
+            'granularity': 'day', 'start': '2024-02-28', 'end': '2024-03-01', 'metrics': 'applications'
+        })
+        self.assertEqual(list(response.data['series']), ['applications'])
+        self.assertEqual([point['count'] for point in response.data['series']['applications']], [0, 1, 0])
+
+    def test_invalid_parameters(self):
+        """Bad granularity, metrics, dates and oversized ranges are rejected"""
+        for params in (
+            {'granularity': 'week'},
+            {'metrics': 'enrollments,visits'},
+            {'start': '2024-13-01'},
+            {'start': '2024-03-01', 'end': '2024-02-01'},
+            {'granularity': 'day', 'start': '2020-01-01', 'end': '2024-01-01'},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+
+class DashboardCohortsTest(APITestCase):
+    """Test the cohort view, refresh_cohort_stats and GET /api/dashboard/cohorts/"""
+
+    url = '/api/dashboard/cohorts/'
+
+    def setUp(self):
+        self.cse = Department.objects.create(name='Computer Science', code='CSE')
+        self.eee = Department.objects.create(name='Electrical', code='EEE')
+        create_test_student(self.cse, 1)
+        create_test_student(self.cse, 2, status='discontinued', lastSemester=2)
+        create_test_student(self.cse, 3, status='discontinued', lastSemester=3)
+        create_test_student(self.cse, 4, shift='Day', status='discontinued', lastSemester=2)
+        create_test_student(self.eee, 5, session='2021-2022', status='graduated', lastSemester=8)
+
+    def test_refresh_and_rates(self):
+        """Rates are read from the view and only change after a refresh"""
+        out = StringIO()
+        call_command('refresh_cohort_stats', stdout=out)
+        self.assertIn('5 cohort row(s)', out.getvalue())
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'department': str(self.cse.id)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data['refreshedAt'])
+        self.assertNotIn('"students"', ' '.join(query['sql'] for query in queries.captured_queries))
+        day, morning = response.data['cohorts']
+        self.assertEqual(
+            (morning['shift'], morning['departmentCode'], morning['total'], morning['discontinued']),
+            ('Morning', 'CSE', 3, 2)
+        )
+        self.assertEqual((morning['dropoutRate'], morning['retentionRate']), (66.67, 33.33))
+        self.assertEqual((day['shift'], day['dropoutRate']), ('Day', 100.0))
+
+        create_test_student(self.cse, 6, shift='Day')
+        response = self.client.get(self.url, {'groupBy': 'lastSemester', 'department': str(self.cse.id)})
+        self.assertEqual(
+            [(row['lastSemester'], row['discontinued']) for row in response.data['cohorts']],
+            [(0, 0), (2, 2), (3, 1)]
+        )
+
+        call_command('refresh_cohort_stats', '--blocking', stdout=StringIO())
+        response = self.client.get(self.url, {'groupBy': 'shift', 'shift': 'Day'})
+        self.assertEqual(response.data['cohorts'], [{
+            'shift': 'Day', 'total': 2, 'active': 1, 'inactive': 0, 'graduated': 0,
+            'discontinued': 1, 'dropoutRate': 50.0, 'retentionRate': 50.0,
+        }])
+
+    def test_invalid_parameters(self):
+        """Unknown dimensions and malformed department ids are rejected"""
+        for params in ({'groupBy': 'session,gender'}, {'department': 'CSE'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+
+class SWRCacheTest(APITestCase):
+    """Test the stale-while-revalidate cache used by the statistics endpoints"""
+
+    def make_cache(self, **options):
+        return SWRCache('test-cache', backend=LocalMemoryBackend(), **options)
+
+    def test_fresh_stale_and_expired(self):
+        """Fresh values are served, stale ones recomputed, expired ones computed again"""
+        cache = self.make_cache(ttl=0.05, stale_ttl=0.1)
+        values = iter(range(10))
+        compute = lambda: next(values)
+
+        self.assertEqual(cache.get_or_compute('key', compute), 0)
+        self.assertEqual(cache.get_or_compute('key', compute), 0)
+        time.sleep(0.06)
+        self.assertEqual(cache.get_or_compute('key', compute), 1)
+        time.sleep(0.2)
+        self.assertEqual(cache.get_or_compute('key', compute), 2)
+
+        metrics = cache.metrics()
+        self.assertEqual((metrics['hits'], metrics['misses'], metrics['recomputes']), (1, 3, 3))
+        self.assertIsNotNone(metrics['recomputeSecondsAvg'])
+
+    def test_single_flight_serves_stale(self):
+        """While one caller recomputes, the others get the stale value"""
+        cache = self.make_cache(ttl=60)
+        cache.get_or_compute('key', lambda: 'old')
+        cache.invalidate('key')
+
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'new'
+
+        worker = threading.Thread(target=cache.get_or_compute, args=('key', slow_compute))
+        worker.start()
+        started.wait(5)
+        self.assertEqual(cache.get_or_compute('key', slow_compute), 'old')
+        release.set()
+        worker.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get_or_compute('key', slow_compute), 'new')
+        self.assertEqual(cache.metrics()['staleHits'], 1)
+
+    def test_invalidation_during_recompute(self):
+        """A value computed before an invalidation is not stored as fresh"""
+        cache = self.make_cache(ttl=60)
+        values = iter(['before', 'after'])
+
+        def compute():
+            value = next(values)
+            if value == 'before':
+                cache.invalidate('key')
+            return value
+
+        self.assertEqual(cache.get_or_compute('key', compute), 'before')
+        self.assertEqual(cache.get_or_compute('key', compute), 'after')
+
+    def test_shared_backend_invalidation(self):
+        """Caches over the shared CACHES alias (one per worker) see each other's invalidations"""
+        first, second = (SWRCache('test-shared', ttl=60, backend=DjangoCacheBackend()) for _ in range(2))
+        first.clear()
+        self.assertEqual(first.get_or_compute('key', lambda: 'old'), 'old')
+        self.assertEqual(second.get_or_compute('key', lambda: 'unused'), 'old')
+        second.invalidate('key')
+        self.assertEqual(first.get_or_compute('key', lambda: 'new'), 'new')
+        first.clear()
+        self.assertEqual(second.get_or_compute('key', lambda: 'recomputed'), 'recomputed')
+        self.assertIsInstance(get_backend(), DjangoCacheBackend)
+
+    def test_failed_recompute_serves_stale(self):
+        """A recompute error falls back to the stale value"""
+        cache = self.make_cache(ttl=60)
+        cache.get_or_compute('key', lambda: 'old')
+        cache.invalidate('key')
+
+        def broken():
+            raise RuntimeError('database unavailable')
+
+        with self.assertLogs('utils.swr_cache', level='ERROR'):
+            self.assertEqual(cache.get_or_compute('key', broken), 'old')
+        self.assertEqual(cache.metrics()['recomputeErrors'], 1)
+
+
+@override_settings(
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    DASHBOARD_LIVE_COALESCE_SECONDS=0.2,
+)
+class DashboardConsumerTest(TransactionTestCase):
+    """Test the live dashboard WebSocket (ws/dashboard/)"""
+
+    def setUp(self):
+        dashboard_stats_cache.clear()
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.admin = User.objects.create_user('admin', password='pass', is_staff=True)
+
+    def tearDown(self):
+        dashboard_stats_cache.clear()
+
+    def communicator(self, user):
+        communicator = WebsocketCommunicator(DashboardConsumer.as_asgi(), '/ws/dashboard/')
+        communicator.scope['user'] = user
+        return communicator
+
+    def test_snapshot_then_one_coalesced_delta(self):
+        """Connecting sends the stats; several commits arrive as one delta frame"""
+        async def scenario():
+            communicator = self.communicator(self.admin)
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            snapshot = await communicator.receive_json_from(timeout=5)
+            self.assertEqual(snapshot['type'], 'stats')
+            self.assertEqual(snapshot['stats']['students']['total'], 0)
+
+            def write():
+                for suffix in range(3):
+                    create_test_student(self.department, suffix)
+                Student.objects.get(currentRollNumber='CR0').delete()
+            await database_sync_to_async(write)()
+
+            message = await communicator.receive_json_from(timeout=5)
+            self.assertEqual(message, {
+                'type': 'stats_delta',
+                'deltas': {'students': {
+                    'total': 2,
+                    'active': 2,
+                    'byDepartment': {'CSE': 2},
+                    'bySemester': {'1': 2},
+                    'byStatus': {'active': 2},
+                }},
+            })
+            self.assertTrue(await communicator.receive_nothing(timeout=0.3))
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_snapshot_skips_cached_stats(self):
+        """The connect snapshot is read from the counters, not a cached value"""
+        create_test_student(self.department, 'X')
+        dashboard_stats_cache.get_or_compute(DASHBOARD_STATS_CACHE_KEY, lambda: {'students': {'total': 0}})
+
+        async def scenario():
+            communicator = self.communicator(self.admin)
+            await communicator.connect()
+            snapshot = await communicator.receive_json_from(timeout=5)
+            self.assertEqual(snapshot['stats']['students']['total'], 1)
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_deltas_use_stats_keys(self):
+        """Alumni type deltas update the recent/established counts, not an absent byType"""
+        deltas = format_deltas(Counter({
+            ('alumni', 'total', ''): 1,
+            ('alumni', 'alumniType', 'recent'): 1,
+            ('alumni', 'currentSupportCategory', 'no_support_needed'): 1,
+            ('alumni', 'graduationYear', '2024'): 1,
+            ('applications', 'status', 'approved'): 1,
+            ('applications', 'status', 'pending'): -1,
+        }), {})
+        self.assertEqual(deltas, {
+            'alumni': {'total': 1, 'recent': 1, 'bySupport': {'no_support_needed': 1}, 'byYear': {'2024': 1}},
+            'applications': {
+                'approved': 1, 'pending': -1, 'byStatus': {'approved': 1, 'pending': -1},
+            },
+        })
+
+    def test_non_staff_rejected(self):
+        """Only staff users may subscribe"""
+        async def scenario():
+            user = await database_sync_to_async(User.objects.create_user)('student', password='pass')
+            connected, _ = await self.communicator(user).connect()
+            self.assertFalse(connected)
+
+        async_to_sync(scenario)()
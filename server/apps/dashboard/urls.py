@@ -2,8 +2,13 @@
 Dashboard URLs
 """
 from django.urls import path
-from .views import DashboardStatsView
+from .views import (
+    DashboardCacheMetricsView, DashboardCohortsView, DashboardStatsView, DashboardTimeseriesView
+)
 
 urlpatterns = [
     path('stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('timeseries/', DashboardTimeseriesView.as_view(), name='dashboard-timeseries'),
+    path('cohorts/', DashboardCohortsView.as_view(), name='dashboard-cohorts'),
+    path('cache-metrics/', DashboardCacheMetricsView.as_view(), name='dashboard-cache-metrics'),
 ]
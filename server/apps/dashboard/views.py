@@ -1,13 +1,17 @@
 """
 Dashboard Views
 """
+import datetime
+import uuid
+
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
-from django.db.models import Count, Q
-from apps.students.models import Student
-from apps.alumni.models import Alumni
-from apps.applications.models import Application
+from rest_framework import permissions, status
+from utils.swr_cache import cache_metrics
+from .cohorts import COHORT_DIMENSIONS, cohort_rates, last_refresh
+from .rollups import GRANULARITIES, ROLLUP_METRICS, month_start, period_count, timeseries
+from .stats import get_dashboard_stats
 
 
 class DashboardStatsView(APIView):
@@ -20,94 +24,12 @@ class DashboardStatsView(APIView):
     def get(self, request):
         """
         Get comprehensive dashboard statistics
+
+        Served from cache; see stats.py for how they are computed and
+        when the cache is invalidated
         """
         try:
-            # Total students count
-            total_students = Student.objects.count()
-            active_students = Student.objects.filter(status='active').count()
-            graduated_students = Student.objects.filter(status='graduated').count()
-            discontinued_students = Student.objects.filter(status='discontinued').count()
-            
-            # Student statistics by status
-            student_stats_by_status = list(Student.objects.values('status').annotate(
-                count=Count('id')
-            ).order_by('status'))
-            
-            # Student statistics by department
-            student_stats_by_department = list(Student.objects.values(
-                'department__name', 'department__code'
-            ).annotate(
-                count=Count('id')
-            ).order_by('department__name'))
-            
-            # Student statistics by semester
-            student_stats_by_semester = list(Student.objects.values('semester').annotate(
-                count=Count('id')
-            ).order_by('semester'))
-            
-            # Alumni statistics
-            total_alumni = Alumni.objects.count()
-            recent_alumni = Alumni.objects.filter(alumniType='recent').count()
-            established_alumni = Alumni.objects.filter(alumniType='established').count()
-            
-            # Convert support categories to dict format
-            support_dict = {}
-            alumni_by_support = Alumni.objects.values('currentSupportCategory').annotate(
-                count=Count('student_id')
-            )
-            for item in alumni_by_support:
-                support_dict[item['currentSupportCategory']] = item['count']
-            
-            # Convert years to dict format
-            year_dict = {}
-            alumni_by_year = Alumni.objects.values('graduationYear').annotate(
-                count=Count('student_id')
-            ).order_by('-graduationYear')
-            for item in alumni_by_year:
-                year_dict[str(item['graduationYear'])] = item['count']
-            
-            # Application statistics
-            total_applications = Application.objects.count()
-            pending_applications = Application.objects.filter(status='pending').count()
-            approved_applications = Application.objects.filter(status='approved').count()
-            rejected_applications = Application.objects.filter(status='rejected').count()
-            
-            applications_by_status = list(Application.objects.values('status').annotate(
-                count=Count('id')
-            ).order_by('status'))
-            
-            applications_by_type = list(Application.objects.values('applicationType').annotate(
-                count=Count('id')
-            ).order_by('applicationType'))
-            
-            # Compile all statistics
-            stats = {
-                'students': {
-                    'total': total_students,
-                    'active': active_students,
-                    'graduated': graduated_students,
-                    'discontinued': discontinued_students,
-                    'byStatus': student_stats_by_status,
-                    'byDepartment': student_stats_by_department,
-                    'bySemester': student_stats_by_semester,
-                },
-                'alumni': {
-                    'total': total_alumni,
-                    'recent': recent_alumni,
-                    'established': established_alumni,
-                    'bySupport': support_dict,
-                    'byYear': year_dict,
-                },
-                'applications': {
-                    'total': total_applications,
-                    'pending': pending_applications,
-                    'approved': approved_applications,
-                    'rejected': rejected_applications,
-                    'byStatus': applications_by_status,
-                    'byType': applications_by_type,
-                }
-            }
-            
+            stats = get_dashboard_stats()
             return Response(stats, status=status.HTTP_200_OK)
         except Exception as e:
             import traceback
@@ -116,3 +38,149 @@ class DashboardStatsView(APIView):
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class DashboardTimeseriesView(APIView):
+    """
+    API view for enrollment, application and graduation trends
+    
+    GET /api/dashboard/timeseries/?granularity=month&start=2024-01-01&end=2024-12-31&metrics=enrollments,applications
+    """
+    
+    # Longest series served in one response
+    MAX_PERIODS = 400
+    
+    def get(self, request):
+        """
+        Get zero-filled per-day or per-month counts, read only from the
+        rollup tables (see rollups.py)
+        
+        Query parameters:
+            granularity: day or month (default: month)
+            start, end: ISO dates (default: the last 30 days / 12 months)
+            metrics: comma-separated subset of enrollments, applications, graduations
+        """
+        granularity = request.query_params.get('granularity', 'month')
+        if granularity not in GRANULARITIES:
+            return Response(
+                {'error': 'Invalid granularity', 'details': f'Use one of: {", ".join(GRANULARITIES)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        metrics = [name for name in request.query_params.get('metrics', '').split(',') if name]
+        metrics = metrics or list(ROLLUP_METRICS)
+        unknown = [name for name in metrics if name not in ROLLUP_METRICS]
+        if unknown:
+            return Response(
+                {'error': 'Invalid metrics', 'details': f'Unknown metrics: {", ".join(unknown)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            end = self.parse_date('end') or timezone.localdate()
+            start = self.parse_date('start') or self.default_start(granularity, end)
+        except ValueError as e:
+            return Response(
+                {'error': 'Invalid date', 'details': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start > end:
+            return Response(
+                {'error': 'Invalid range', 'details': 'start must not be after end'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if period_count(granularity, start, end) > self.MAX_PERIODS:
+            return Response(
+                {'error': 'Range too large', 'details': f'At most {self.MAX_PERIODS} periods per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({
+            'granularity': granularity,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'series': timeseries(metrics, granularity, start, end),
+        }, status=status.HTTP_200_OK)
+    
+    def parse_date(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f'{name} must be a date in YYYY-MM-DD format')
+    
+    @staticmethod
+    def default_start(granularity, end):
+        if granularity == 'day':
+            return end - datetime.timedelta(days=29)
+        start = month_start(end)
+        for _ in range(11):
+            start = month_start(start - datetime.timedelta(days=1))
+        return start
+
+
+class DashboardCohortsView(APIView):
+    """
+    API view for dropout and retention rates per cohort
+    
+    GET /api/dashboard/cohorts/?groupBy=session,department&shift=Morning
+    """
+    
+    DEFAULT_GROUP_BY = ['session', 'department', 'shift']
+    
+    def get(self, request):
+        """
+        Get student counts per status with dropout/retention rates, read
+        only from the cohort view (see cohorts.py)
+        
+        Query parameters:
+            groupBy: comma-separated subset of session, department, shift,
+                lastSemester (default: session,department,shift)
+            session, department, shift: restrict to one cohort value
+        """
+        group_by = [name for name in request.query_params.get('groupBy', '').split(',') if name]
+        group_by = group_by or self.DEFAULT_GROUP_BY
+        unknown = [name for name in group_by if name not in COHORT_DIMENSIONS]
+        if unknown:
+            return Response(
+                {'error': 'Invalid groupBy', 'details': f'Use any of: {", ".join(COHORT_DIMENSIONS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        filters = {
+            name: request.query_params[name]
+            for name in ('session', 'shift')
+            if request.query_params.get(name)
+        }
+        if request.query_params.get('department'):
+            try:
+                filters['department'] = uuid.UUID(request.query_params['department'])
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid department', 'details': 'department must be a department id'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        refreshed = last_refresh()
+        return Response({
+            'groupBy': group_by,
+            'refreshedAt': refreshed.isoformat() if refreshed else None,
+            'cohorts': cohort_rates(list(dict.fromkeys(group_by)), **filters),
+        }, status=status.HTTP_200_OK)
+
+
+class DashboardCacheMetricsView(APIView):
+    """
+    API view for the statistics cache metrics of this server process
+    
+    GET /api/dashboard/cache-metrics/
+    """
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request):
+        """
+        Get hit/miss counts and recompute times per stale-while-revalidate cache
+        """
+        return Response(cache_metrics(), status=status.HTTP_200_OK)
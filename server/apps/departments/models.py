@@ -27,3 +27,20 @@ class Department(models.Model):
     def student_count(self):
         """Return the number of students in this department"""
         return self.student_set.count()
+
+    @staticmethod
+    def student_counts():
+        """
+        Return student counts for every department in a single GROUP BY query
+
+        Returns:
+            dict: {department_id: count}; departments without students are absent
+        """
+        from django.db.models import Count
+        from apps.students.models import Student
+        return dict(
+            Student.objects.order_by()
+            .values('department')
+            .annotate(count=Count('pk'))
+            .values_list('department', 'count')
+        )
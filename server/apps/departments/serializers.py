@@ -2,20 +2,58 @@
 Department Serializers
 """
 from rest_framework import serializers
+from utils.fieldsets import SparseFieldsetMixin
 from .models import Department
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class StudentCountMap:
+    """
+    Per-serialization cache of student counts by department
+
+    Loaded with one grouped query on first use, so serializing any number of
+    students (each nesting its department) costs one COUNT query in total
+    instead of one per row.
+    """
+
+    def __init__(self):
+        self._counts = None
+
+    def get(self, department):
+        """Return the student count for a department"""
+        return self.get_for_id(department.pk)
+
+    def get_for_id(self, department_id):
+        """Return the student count for a department id"""
+        if self._counts is None:
+            self._counts = Department.student_counts()
+        return self._counts.get(department_id, 0)
+
+
+class DepartmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Department model
     """
-    studentCount = serializers.IntegerField(source='student_count', read_only=True)
+    studentCount = serializers.SerializerMethodField()
 
     class Meta:
         model = Department
         fields = ['id', 'name', 'code', 'createdAt', 'updatedAt', 'studentCount']
         read_only_fields = ['id', 'createdAt', 'updatedAt']
 
+    def get_studentCount(self, obj):
+        """
+        Return the department's student count from the shared count map
+        The map lives in the root serializer context, so every nested
+        department in one response reuses the same grouped query
+        """
+        counts = self.context.get('department_student_counts')
+        if counts is None:
+            if self.root is self:
+                # Standalone department: a single COUNT is cheapest
+                return obj.student_count()
+            counts = self.context.setdefault('department_student_counts', StudentCountMap())
+        return counts.get(obj)
+
     def validate_name(self, value):
         """Validate department name is not empty"""
         if not value or not value.strip():
@@ -29,6 +67,16 @@ class DepartmentSerializer(serializers.ModelSerializer):
         return value.strip().upper()
 
 
+def department_student_count(row, context):
+    """
+    studentCount of a department nested in a fast-serialized row
+    (see utils.fast_serializers); shares the context's count map like
+    DepartmentSerializer.get_studentCount
+    """
+    counts = context.setdefault('department_student_counts', StudentCountMap())
+    return counts.get_for_id(row['department__id'])
+
+
 class DepartmentListSerializer(serializers.ModelSerializer):
     """
     Lightweight serializer for listing departments
@@ -6,7 +6,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import ProtectedError
 from .models import Department
-from .serializers import DepartmentSerializer, DepartmentListSerializer
+from .serializers import DepartmentSerializer, DepartmentListSerializer, StudentCountMap
 
 
 class DepartmentViewSet(viewsets.ModelViewSet):
@@ -69,7 +69,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         Example: GET /api/departments/{id}/students/?semester=3
         """
         department = self.get_object()
-        students = department.student_set.all()
+        students = department.student_set.select_related('department')
         
         # Filter by semester if provided
         semester = request.query_params.get('semester')
@@ -85,10 +85,12 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         
         # Import here to avoid circular dependency
         from apps.students.serializers import StudentListSerializer
-        serializer = StudentListSerializer(students, many=True)
+        # One count map shared by the department and every nested student row
+        context = {'department_student_counts': StudentCountMap()}
+        serializer = StudentListSerializer(students, many=True, context=context)
         
         return Response({
-            'department': DepartmentSerializer(department).data,
+            'department': DepartmentSerializer(department, context=context).data,
             'students': serializer.data,
-            'count': students.count()
+            'count': students.count()  # served from the evaluated queryset
         })
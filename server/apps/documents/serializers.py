@@ -2,6 +2,7 @@
 Document Serializers
 """
 from rest_framework import serializers
+from utils.fast_serializers import FastSerializer
 from .models import Document
 
 
@@ -27,6 +28,11 @@ class DocumentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'uploadDate', 'filePath', 'fileSize']
 
 
+# values()-based equivalent of DocumentSerializer for the list endpoint
+# (studentName is read through a join instead of one query per row)
+document_fast_serializer = FastSerializer(DocumentSerializer)
+
+
 class DocumentUploadSerializer(serializers.Serializer):
     """
     Serializer for document uploads
@@ -295,3 +295,22 @@ class DocumentAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['category'], 'NID')
+    
+    def test_fast_list_matches_serializer(self):
+        """Test that the values()-based list renders the same JSON as DocumentSerializer"""
+        from rest_framework.renderers import JSONRenderer
+        from .serializers import DocumentSerializer, document_fast_serializer
+        for index, category in enumerate(['NID', 'Other']):
+            Document.objects.create(
+                student=self.student,
+                fileName=f'file{index}.pdf',
+                fileType='pdf',
+                category=category,
+                filePath=f'documents/file{index}.pdf',
+                fileSize=1024 * (index + 1)
+            )
+        queryset = Document.objects.order_by('-uploadDate')
+        
+        expected = JSONRenderer().render(DocumentSerializer(queryset, many=True).data)
+        actual = JSONRenderer().render(document_fast_serializer.represent(document_fast_serializer.values(queryset)))
+        self.assertEqual(actual, expected)
@@ -8,15 +8,18 @@ from rest_framework.filters import OrderingFilter
 import os
 
 from .models import Document
-from .serializers import DocumentSerializer, DocumentUploadSerializer
+from .serializers import DocumentSerializer, DocumentUploadSerializer, document_fast_serializer
+from utils.fast_serializers import FastListMixin
 from utils.file_handler import save_uploaded_file
 
 
-class DocumentViewSet(viewsets.ModelViewSet):
+class DocumentViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing documents
     
     Provides CRUD operations for student documents with file upload handling
+    
+    list is serialized from values() rows (see utils.fast_serializers)
     """
     queryset = Document.objects.all()
     serializer_class = DocumentSerializer
@@ -24,6 +27,7 @@ class DocumentViewSet(viewsets.ModelViewSet):
     filterset_fields = ['student', 'category']
     ordering_fields = ['uploadDate', 'fileName']
     ordering = ['-uploadDate']
+    fast_list_serializer = document_fast_serializer
     
     def create(self, request, *args, **kwargs):
         """
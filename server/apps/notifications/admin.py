@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Notification, NotificationPreference, NotificationPreferenceType, DeliveryLog
+from .models import (
+    Notification, NotificationArchive, NotificationPreference, NotificationPreferenceType, DeliveryLog, FanoutJob
+)
 
 
 @admin.register(Notification)
@@ -22,6 +24,17 @@ class NotificationAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ('title', 'recipient', 'notification_type', 'status', 'created_at', 'moved_at')
+    list_filter = ('notification_type', 'status')
+    search_fields = ('recipient__username',)
+    readonly_fields = [field.name for field in NotificationArchive._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+
 @admin.register(NotificationPreference)
 class NotificationPreferenceAdmin(admin.ModelAdmin):
     list_display = ('user', 'created_at', 'updated_at')
@@ -54,3 +67,14 @@ class DeliveryLogAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(FanoutJob)
+class FanoutJobAdmin(admin.ModelAdmin):
+    list_display = ('title', 'notification_type', 'status', 'processed_recipients', 'total_recipients', 'created_at')
+    list_filter = ('notification_type', 'status', 'created_at')
+    search_fields = ('title', 'message')
+    readonly_fields = (
+        'total_recipients', 'processed_recipients', 'created_count', 'skipped_count',
+        'total_chunks', 'finished_chunks', 'failed_chunks', 'created_at', 'started_at', 'finished_at'
+    )
@@ -2,18 +2,28 @@
 Admin views for notification monitoring
 """
 
+import json
+
 from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.models import User
 from django.http import JsonResponse
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
-from .models import Notification, DeliveryLog
+from utils.swr_cache import SWRCache
+from .jobs import enqueue_fanout, job_progress
+from .models import Notification, DeliveryLog, FanoutJob, NOTIFICATION_TYPES
+from .services import valid_ids
 
 
-@staff_member_required
-def notification_dashboard(request):
+# Notifications change constantly and the page shows "last 24 hours"
+# windows, so entries expire instead of being invalidated
+dashboard_cache = SWRCache('notification-dashboard', ttl=30, stale_ttl=300)
+
+
+def compute_dashboard_data():
     """
-    Admin dashboard for notification monitoring
+    Build the notification monitoring statistics
     """
     # Get statistics
     total_notifications = Notification.objects.count()
@@ -85,6 +95,16 @@ def notification_dashboard(request):
         'notifications_by_status': list(notifications_by_status),
     }
 
+    return data
+
+
+@staff_member_required
+def notification_dashboard(request):
+    """
+    Admin dashboard for notification monitoring
+    Served from a short-lived stale-while-revalidate cache
+    """
+    data = dashboard_cache.get_or_compute('dashboard', compute_dashboard_data)
     return JsonResponse(data)
 
 
@@ -163,3 +183,71 @@ def retry_failed_delivery(request):
             }, status=400)
     except DeliveryLog.DoesNotExist:
         return JsonResponse({'error': 'Delivery log not found'}, status=404)
+
+
+@staff_member_required
+def fanout_jobs(request):
+    """
+    List background fan-out jobs (GET) or queue an announcement (POST)
+    
+    POST fields (form or JSON): title, message, notification_type
+    (default: system_announcement), user_ids (default: all active users)
+    """
+    if request.method == 'POST':
+        if request.content_type == 'application/json':
+            try:
+                payload = json.loads(request.body or '{}')
+            except ValueError:
+                return JsonResponse({'error': 'Invalid JSON'}, status=400)
+            if not isinstance(payload, dict):
+                return JsonResponse({'error': 'The JSON body must be an object'}, status=400)
+            user_ids = payload.get('user_ids')
+            if user_ids is not None and not valid_ids(user_ids):
+                return JsonResponse({'error': 'user_ids must be a list of user ids'}, status=400)
+        else:
+            payload = request.POST
+            user_ids = payload.getlist('user_ids') or None
+
+        title = payload.get('title')
+        message = payload.get('message')
+        notification_type = payload.get('notification_type') or 'system_announcement'
+        if not title or not message:
+            return JsonResponse({'error': 'title and message are required'}, status=400)
+        if not all(isinstance(value, str) for value in (title, message, notification_type)):
+            return JsonResponse({'error': 'title, message and notification_type must be strings'}, status=400)
+        if notification_type not in dict(NOTIFICATION_TYPES):
+            return JsonResponse({'error': 'Invalid notification type'}, status=400)
+
+        user_group = None
+        if user_ids is not None:
+            try:
+                user_group = User.objects.filter(pk__in=[int(user_id) for user_id in user_ids])
+            except (TypeError, ValueError):
+                return JsonResponse({'error': 'user_ids must be a list of user ids'}, status=400)
+
+        job = enqueue_fanout(
+            title=title,
+            message=message,
+            user_group=user_group,
+            notification_type=notification_type,
+            created_by=request.user
+        )
+        return JsonResponse({'job': job_progress(job)}, status=202)
+
+    jobs = FanoutJob.objects.order_by('-created_at')
+    if request.GET.get('status'):
+        jobs = jobs.filter(status=request.GET['status'])
+    limit = int(request.GET.get('limit', 50))
+    return JsonResponse({'jobs': [job_progress(job) for job in jobs[:limit]]})
+
+
+@staff_member_required
+def fanout_job_detail(request, job_id):
+    """
+    Progress of one background fan-out job
+    """
+    try:
+        job = FanoutJob.objects.get(pk=job_id)
+    except FanoutJob.DoesNotExist:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse({'job': job_progress(job)})
@@ -5,3 +5,7 @@ class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.notifications'
     verbose_name = 'Notifications'
+
+    def ready(self):
+        """Register signals when app is ready"""
+        import apps.notifications.signals
@@ -0,0 +1,117 @@
+"""
+Notification archive
+Retention policy that moves old notifications out of the notification table
+
+The notification table is the hot store: the bell, the list, the unread
+counter and every status change only ever touch it. Read, archived and
+deleted notifications older than NOTIFICATION_RETENTION_DAYS (per status,
+counted from created_at) are moved to NotificationArchive, the cold store,
+by `manage.py archive_notifications`:
+- rows are moved in batches, each batch in its own transaction: the ids
+  are claimed with SELECT ... FOR UPDATE SKIP LOCKED over the (status,
+  created_at) index, their delivery logs are deleted and the rows are
+  moved with one DELETE ... RETURNING feeding an INSERT
+- a notification that is being changed is skipped and moved by a later
+  run; a run can be stopped between batches without losing anything
+- unread notifications are never moved, so the unread counters stay exact
+Archived rows keep their id and are only read through
+GET /api/notifications/history/.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DeliveryLog, Notification, NotificationArchive
+
+
+ARCHIVE_COLUMNS = [
+    'id', 'recipient_id', 'notification_type', 'title', 'message', 'data',
+    'status', 'created_at', 'read_at', 'archived_at', 'deleted_at',
+]
+
+
+def retention_filter(now=None):
+    """
+    Q matching the notifications that are past retention
+
+    Returns:
+        Q object, or None if no status has a retention period
+    """
+    now = now or timezone.now()
+    condition = None
+    for status, days in sorted(settings.NOTIFICATION_RETENTION_DAYS.items()):
+        if status == 'unread' or days is None:
+            continue
+        expired = Q(status=status, created_at__lt=now - timedelta(days=days))
+        condition = expired if condition is None else condition | expired
+    return condition
+
+
+def count_expired(now=None):
+    """Count the notifications a run would move"""
+    condition = retention_filter(now)
+    if condition is None:
+        return 0
+    return Notification.objects.filter(condition).count()
+
+
+def archive_batch(batch_size=1000, now=None):
+    """
+    Move one batch of expired notifications to the archive
+
+    Returns:
+        Number of notifications moved
+    """
+    condition = retention_filter(now)
+    if condition is None:
+        return 0
+    source = Notification._meta.db_table
+    target = NotificationArchive._meta.db_table
+    columns = ', '.join(ARCHIVE_COLUMNS)
+
+    with transaction.atomic():
+        ids = list(
+            Notification.objects.select_for_update(skip_locked=True)
+            .filter(condition)
+            .order_by('created_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+        DeliveryLog.objects.filter(notification_id__in=ids).delete()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {source} WHERE id = ANY(%s) RETURNING {columns}) '
+                f'INSERT INTO {target} ({columns}, moved_at) SELECT {columns}, %s FROM moved',
+                [ids, timezone.now()]
+            )
+    return len(ids)
+
+
+def archive_notifications(batch_size=1000, max_batches=None, now=None):
+    """
+    Move expired notifications to the archive, batch by batch
+
+    Args:
+        batch_size: Notifications per transaction
+        max_batches: Stop after this many batches (default: until none are left)
+        now: Reference time of the retention periods (default: now)
+
+    Returns:
+        Dict with the number of notifications moved and batches run
+    """
+    now = now or timezone.now()
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        count = archive_batch(batch_size, now)
+        if not count:
+            break
+        moved += count
+        batches += 1
+        if count < batch_size:
+            break
+    return {'moved': moved, 'batches': batches}
@@ -2,15 +2,39 @@
 WebSocket consumers for real-time notification delivery
 """
 
+import asyncio
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import User
+from .counters import get_unread_count
+from .live import user_group
 from .models import Notification, DeliveryLog
+from .services import NotificationService, valid_ids
+
+
+# WebSocket command -> (status, whether notification_ids are required)
+BULK_COMMANDS = {
+    'mark_all_as_read': ('read', False),
+    'bulk_mark_as_read': ('read', True),
+    'bulk_archive': ('archived', True),
+    'bulk_delete': ('deleted', True),
+}
 
 
 class NotificationConsumer(AsyncWebsocketConsumer):
-    """WebSocket consumer for real-time notifications"""
+    """
+    WebSocket consumer for real-time notifications
+
+    Created notifications are buffered for NOTIFICATION_PUSH_COALESCE_SECONDS
+    and sent as one notifications_created frame; see live.py.
+
+    Commands besides mark_as_read / archive / delete / get_unread_count:
+    mark_all_as_read, and bulk_mark_as_read / bulk_archive / bulk_delete
+    with notification_ids; answered with {"type": "bulk_result"} while the
+    change itself arrives as one notifications_updated frame.
+    """
 
     async def connect(self):
         """Handle WebSocket connection"""
@@ -21,7 +45,9 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             return
 
         # Create a unique group name for this user
-        self.user_group_name = f"notifications_{self.user.id}"
+        self.user_group_name = user_group(self.user.id)
+        self.pending = []
+        self.flush_task = None
 
         # Join the user's notification group
         await self.channel_layer.group_add(
@@ -33,6 +59,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection"""
+        if getattr(self, 'flush_task', None) is not None:
+            self.flush_task.cancel()
         if hasattr(self, 'user_group_name'):
             await self.channel_layer.group_discard(
                 self.user_group_name,
@@ -57,6 +85,22 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 notification_id = data.get('notification_id')
                 await self.delete_notification(notification_id)
 
+            elif message_type in BULK_COMMANDS:
+                status, by_ids = BULK_COMMANDS[message_type]
+                notification_ids = data.get('notification_ids') if by_ids else None
+                if by_ids and not valid_ids(notification_ids):
+                    await self.send(text_data=json.dumps({
+                        'type': 'error',
+                        'message': 'notification_ids must be a list of notification ids'
+                    }))
+                    return
+                updated = await self.bulk_update_status(status, notification_ids)
+                await self.send(text_data=json.dumps({
+                    'type': 'bulk_result',
+                    'action': message_type,
+                    'updated': updated
+                }))
+
             elif message_type == 'get_unread_count':
                 count = await self.get_unread_count()
                 await self.send(text_data=json.dumps({
@@ -71,12 +115,30 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             }))
 
     async def notification_created(self, event):
-        """Handle notification created event"""
-        notification = event['notification']
-        
+        """Handle notification created event: buffer it until the window closes"""
+        self.buffer(event['notification'])
+
+    def buffer(self, notification):
+        self.pending.append(notification)
+        if self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(getattr(settings, 'NOTIFICATION_PUSH_COALESCE_SECONDS', 0.5))
+        self.flush_task = None
+        pending, self.pending = self.pending, []
         await self.send(text_data=json.dumps({
-            'type': 'notification_created',
-            'notification': notification
+            'type': 'notifications_created',
+            'count': len(pending),
+            'notifications': pending,
+            'unread_count': await self.get_unread_count()
+        }))
+
+    async def unread_count(self, event):
+        """Handle a changed unread counter"""
+        await self.send(text_data=json.dumps({
+            'type': 'unread_count',
+            'count': event['count']
         }))
 
     async def notification_updated(self, event):
@@ -88,6 +150,21 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             'notification': notification
         }))
 
+    async def notifications_updated(self, event):
+        """Handle a bulk status change"""
+        await self.send(text_data=json.dumps({
+            'type': 'notifications_updated',
+            'status': event['status'],
+            'notification_ids': event['notification_ids'],
+            'updated': event['updated'],
+            'unread_count': event['unread_count']
+        }))
+
+    @database_sync_to_async
+    def bulk_update_status(self, status, notification_ids):
+        """Change the status of many notifications with set-based UPDATEs"""
+        return NotificationService.bulk_update_status(self.user, status, notification_ids)
+
     @database_sync_to_async
     def mark_notification_as_read(self, notification_id):
         """Mark a notification as read"""
@@ -129,8 +206,5 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_unread_count(self):
-        """Get count of unread notifications"""
-        return Notification.objects.filter(
-            recipient=self.user,
-            status='unread'
-        ).count()
+        """Get count of unread notifications (maintained counter)"""
+        return get_unread_count(self.user.id)
@@ -0,0 +1,104 @@
+"""
+Unread notification counters
+Per-user count of unread notifications, kept next to the Notification rows
+
+UnreadCounter holds one row per user, so the bell's unread_count (HTTP and
+WebSocket) is a primary key lookup instead of a COUNT(*). Every write that
+makes notifications unread or not unread adjusts the counters in the same
+transaction, after the notification rows:
+- Notification.save (create_notification, the API, the admin) and the
+  status methods (mark_as_read, archive, delete_notification)
+- the announcement fan-out, once per chunk
+- deleting notification rows (signals.py)
+Adjustments are relative (INSERT ... ON CONFLICT DO UPDATE SET unread =
+unread + delta; decrements only UPDATE existing counters), so concurrent
+writers never overwrite each other. Status changes push the new count to
+the user's sockets after commit; creations are pushed with the
+notifications themselves (see consumers.py).
+
+Writes that bypass these paths (raw QuerySet.update()) make the counters
+drift; `manage.py reconcile_unread_counts` recounts and repairs them.
+"""
+from django.db import connection, transaction
+from django.db.models import Count
+
+from .live import publish_unread_counts
+from .models import Notification, UnreadCounter
+
+
+def adjust_unread(deltas, publish=True):
+    """
+    Add deltas to the users' unread counters
+
+    Args:
+        deltas: {user id: change}
+        publish: push the new counts to the users' sockets after commit
+
+    Returns:
+        {user id: new count}
+    """
+    items = sorted((user_id, delta) for user_id, delta in deltas.items() if delta)
+    if not items:
+        return {}
+    table = UnreadCounter._meta.db_table
+    counts = {}
+    # Sorted rows: concurrent adjustments lock counters in the same order
+    with connection.cursor() as cursor:
+        decrements = [item for item in items if item[1] < 0]
+        if decrements:
+            # Plain UPDATE: a counter deleted with its user (cascade) is not recreated
+            cursor.execute(
+                f'UPDATE {table} SET unread = {table}.unread + adjustment.delta '
+                f'FROM (VALUES {", ".join(["(%s, %s)"] * len(decrements))}) AS adjustment (user_id, delta) '
+                f'WHERE {table}.user_id = adjustment.user_id '
+                f'RETURNING {table}.user_id, {table}.unread',
+                [value for item in decrements for value in item]
+            )
+            counts.update(cursor.fetchall())
+        increments = [item for item in items if item[1] > 0]
+        if increments:
+            cursor.execute(
+                f'INSERT INTO {table} (user_id, unread) VALUES {", ".join(["(%s, %s)"] * len(increments))} '
+                f'ON CONFLICT (user_id) DO UPDATE SET unread = {table}.unread + EXCLUDED.unread '
+                f'RETURNING user_id, unread',
+                [value for item in increments for value in item]
+            )
+            counts.update(cursor.fetchall())
+    if publish:
+        transaction.on_commit(lambda: publish_unread_counts(counts))
+    return counts
+
+
+def get_unread_count(user_id):
+    """Return a user's unread count from the counter"""
+    count = UnreadCounter.objects.filter(user_id=user_id).values_list('unread', flat=True).first()
+    return max(count or 0, 0)
+
+
+def reconcile_unread_counts(dry_run=False):
+    """
+    Recount unread notifications and repair drifted counters
+
+    The counter table is locked against adjustments while recounting, so a
+    concurrent status change is counted either before or after, never twice.
+
+    Returns:
+        {user id: (counter value, actual count)} for every drifted user
+    """
+    table = UnreadCounter._meta.db_table
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE')
+        actual = dict(
+            Notification.objects.filter(status='unread').order_by()
+            .values('recipient_id').annotate(count=Count('id')).values_list('recipient_id', 'count')
+        )
+        stored = dict(UnreadCounter.objects.values_list('user_id', 'unread'))
+        drift = {
+            user_id: (stored.get(user_id, 0), actual.get(user_id, 0))
+            for user_id in stored.keys() | actual.keys()
+            if stored.get(user_id, 0) != actual.get(user_id, 0)
+        }
+        if drift and not dry_run:
+            adjust_unread({user_id: count - value for user_id, (value, count) in drift.items()})
+    return drift
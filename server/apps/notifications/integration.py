@@ -2,7 +2,7 @@
 Integration helpers for creating notifications from other apps
 """
 
-from django.contrib.auth.models import User
+from .jobs import enqueue_fanout
 from .services import NotificationService
 
 
@@ -97,29 +97,63 @@ def notify_student_admission(student, admitted):
         print(f"Error creating admission notification: {e}")
 
 
-def notify_system_announcement(title, message, user_group=None):
+def notify_system_announcement(title, message, user_group=None, created_by=None):
     """
-    Create system announcement notification
+    Queue a system announcement notification
+    
+    The notifications are sent in the background by
+    `manage.py run_notification_worker` (see jobs.py)
     
     Args:
         title: Announcement title
         message: Announcement message
-        user_group: QuerySet of users to notify (default: all users)
+        user_group: QuerySet of users to notify (default: all active users)
+        created_by: User who made the announcement (optional)
+    
+    Returns:
+        FanoutJob object, or None on error
     """
     try:
-        if user_group is None:
-            user_group = User.objects.filter(is_active=True)
-        
-        NotificationService.create_announcement(
+        return enqueue_fanout(
             title=title,
             message=message,
             user_group=user_group,
-            notification_type='system_announcement'
+            notification_type='system_announcement',
+            created_by=created_by
         )
     except Exception as e:
         print(f"Error creating system announcement: {e}")
 
 
+def notify_deadline_reminders(user_group, deadline_title, deadline_date, created_by=None):
+    """
+    Queue a deadline reminder for a group of users
+    
+    Args:
+        user_group: QuerySet of users to remind
+        deadline_title: Title of the deadline
+        deadline_date: Date of the deadline
+        created_by: User who scheduled the reminder (optional)
+    
+    Returns:
+        FanoutJob object, or None on error
+    """
+    try:
+        return enqueue_fanout(
+            title=f"Deadline Reminder: {deadline_title}",
+            message=f"Reminder: {deadline_title} is due on {deadline_date}",
+            user_group=user_group,
+            notification_type='deadline_reminder',
+            data={
+                'deadline_title': deadline_title,
+                'deadline_date': str(deadline_date)
+            },
+            created_by=created_by
+        )
+    except Exception as e:
+        print(f"Error creating deadline reminders: {e}")
+
+
 def notify_deadline_reminder(user, deadline_title, deadline_date):
     """
     Create deadline reminder notification
@@ -0,0 +1,199 @@
+"""
+Background notification fan-out
+Database-backed job queue for announcements and reminders to many users
+
+enqueue_fanout() stores a FanoutJob and splits its recipients into
+FanoutChunk rows of NOTIFICATION_FANOUT_CHUNK_SIZE user ids, so the
+caller's request only writes the queue. Workers (`manage.py
+run_notification_worker`) then loop over process_next_chunk():
+- a chunk is claimed with SELECT ... FOR UPDATE SKIP LOCKED, so any
+  number of workers take different chunks without blocking each other,
+  also chunks of the same job
+- the chunk is sent with NotificationService.create_announcement and
+  marked done in the claiming transaction; a worker that dies leaves
+  the chunk queued for the next one
+- a chunk that raises stays queued but is not claimed again before its
+  next_attempt_at, RETRY_BACKOFF_SECONDS doubled for every attempt, so
+  retries ride out transient failures; after MAX_CHUNK_ATTEMPTS attempts
+  it is marked failed
+The job's counters are advanced by each chunk; the last chunk marks the
+job completed (or failed if any chunk failed). Only Postgres is needed,
+no broker.
+"""
+import logging
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import FanoutChunk, FanoutJob
+from .services import NotificationService
+
+
+logger = logging.getLogger(__name__)
+
+MAX_CHUNK_ATTEMPTS = 3
+
+# Seconds before the first retry of a failed chunk, doubled for every further attempt
+RETRY_BACKOFF_SECONDS = 30
+
+
+def retry_delay(attempts):
+    """Time to wait before retrying a chunk that failed `attempts` times"""
+    return timedelta(seconds=RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1))
+
+
+def enqueue_fanout(title, message, user_group=None, notification_type='system_announcement', data=None,
+                   created_by=None, chunk_size=None):
+    """
+    Queue a notification for a group of users
+
+    Args:
+        title: Notification title
+        message: Notification message
+        user_group: QuerySet of users (default: all active users); the
+            recipients are fixed when the job is queued
+        notification_type: Type of notification (default: system_announcement)
+        data: Additional data (optional)
+        created_by: User who queued the job (optional)
+        chunk_size: Recipients per chunk (default: settings.NOTIFICATION_FANOUT_CHUNK_SIZE)
+
+    Returns:
+        FanoutJob object
+    """
+    if user_group is None:
+        user_group = User.objects.filter(is_active=True)
+    chunk_size = chunk_size or settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+
+    with transaction.atomic():
+        job = FanoutJob.objects.create(
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            data=data or {},
+            created_by=created_by
+        )
+        user_ids = iter(user_group.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=chunk_size))
+        chunks = []
+        while True:
+            batch = list(islice(user_ids, chunk_size))
+            if not batch:
+                break
+            chunks.append(FanoutChunk(job=job, user_ids=batch))
+            job.total_recipients += len(batch)
+        FanoutChunk.objects.bulk_create(chunks)
+        job.total_chunks = len(chunks)
+        if not chunks:
+            job.status = 'completed'
+            job.finished_at = timezone.now()
+        job.save(update_fields=['total_recipients', 'total_chunks', 'status', 'finished_at'])
+    return job
+
+
+def process_next_chunk():
+    """
+    Claim and send one queued chunk
+
+    Returns:
+        the processed FanoutChunk, or None if no chunk was free and due
+    """
+    with transaction.atomic():
+        chunk = (
+            FanoutChunk.objects.select_for_update(skip_locked=True)
+            .filter(status='queued')
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=timezone.now()))
+            .order_by('id')
+            .first()
+        )
+        if chunk is None:
+            return None
+        job = FanoutJob.objects.get(pk=chunk.job_id)
+        started = timezone.now()
+
+        chunk.attempts += 1
+        try:
+            with transaction.atomic():
+                counts = NotificationService.create_announcement(
+                    title=job.title,
+                    message=job.message,
+                    user_group=User.objects.filter(pk__in=chunk.user_ids),
+                    notification_type=job.notification_type,
+                    data=job.data,
+                    chunk_size=len(chunk.user_ids)
+                )
+        except Exception as e:
+            logger.exception('Fan-out chunk %s of job %s failed', chunk.pk, job.pk)
+            chunk.error_message = str(e)
+            if chunk.attempts < MAX_CHUNK_ATTEMPTS:
+                chunk.next_attempt_at = timezone.now() + retry_delay(chunk.attempts)
+                chunk.save(update_fields=['attempts', 'next_attempt_at', 'error_message'])
+                return chunk
+            chunk.status = 'failed'
+            counts = None
+        else:
+            chunk.status = 'done'
+            chunk.error_message = None
+        chunk.processed_at = timezone.now()
+        chunk.save(update_fields=['status', 'attempts', 'error_message', 'processed_at'])
+        _record_chunk(job.pk, started, len(chunk.user_ids), counts)
+    return chunk
+
+
+def _record_chunk(job_id, started, size, counts):
+    """
+    Add a finished chunk to its job and close the job after its last chunk
+    The job row is only written here, at the end of the chunk, so workers
+    on the same job never wait for each other while sending
+    """
+    running = {'status': 'running', 'started_at': Coalesce('started_at', Value(started))}
+    if counts is None:
+        FanoutJob.objects.filter(pk=job_id).update(failed_chunks=F('failed_chunks') + 1, **running)
+    else:
+        FanoutJob.objects.filter(pk=job_id).update(
+            **running,
+            finished_chunks=F('finished_chunks') + 1,
+            processed_recipients=F('processed_recipients') + size,
+            created_count=F('created_count') + counts['created'],
+            skipped_count=F('skipped_count') + counts['skipped'],
+        )
+    # The UPDATE above holds the job row until commit, so the last chunk
+    # to finish sees every other chunk counted
+    job = FanoutJob.objects.get(pk=job_id)
+    if job.finished_chunks + job.failed_chunks >= job.total_chunks:
+        job.status = 'failed' if job.failed_chunks else 'completed'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'finished_at'])
+
+
+def job_progress(job):
+    """
+    Describe a job's progress for the admin API
+
+    Returns:
+        Dict with the job's counters, status and progress in percent
+    """
+    return {
+        'id': job.id,
+        'notification_type': job.notification_type,
+        'title': job.title,
+        'status': job.status,
+        'total_recipients': job.total_recipients,
+        'processed_recipients': job.processed_recipients,
+        'created': job.created_count,
+        'skipped': job.skipped_count,
+        'total_chunks': job.total_chunks,
+        'finished_chunks': job.finished_chunks,
+        'failed_chunks': job.failed_chunks,
+        'progress': (
+            round((job.finished_chunks + job.failed_chunks) * 100 / job.total_chunks, 1)
+            if job.total_chunks else 100.0
+        ),
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
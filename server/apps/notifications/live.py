@@ -0,0 +1,124 @@
+"""
+Live notification push
+Created notifications published to the Channels layer after commit
+
+Every NotificationConsumer joins its user's group, notifications_<user id>.
+Created notifications are published there from transaction.on_commit, so
+rolled-back rows are never pushed: one message for create_notification,
+and for each create_announcement chunk one message per recipient, all
+sent concurrently from a single async_to_sync call. Only the recipients'
+sockets receive an announcement.
+The consumer collects what it receives for NOTIFICATION_PUSH_COALESCE_SECONDS
+and sends a burst as one frame:
+
+    {"type": "notifications_created", "count": 2, "notifications": [{...}, {...}], "unread_count": 7}
+
+Changes of the unread counter by reads, archiving and deletion are pushed
+to the user's group as {"type": "unread_count", "count": n}. A bulk status
+change (mark all as read, bulk archive/delete) is pushed as one frame:
+
+    {"type": "notifications_updated", "status": "read", "notification_ids": null,
+     "updated": 5000, "unread_count": 0}
+
+where notification_ids null means all of the user's notifications.
+"""
+import asyncio
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+
+logger = logging.getLogger(__name__)
+
+# Notification fields pushed to clients
+PUSHED_FIELDS = ('notification_type', 'title', 'message', 'data', 'status')
+
+
+def user_group(user_id):
+    """Group of one user's notification sockets"""
+    return f'notifications_{user_id}'
+
+
+def _group_send(group, message):
+    """Send to a group; a broken layer must not fail the write"""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(group, message)
+    except Exception:
+        logger.exception('Could not publish notifications to the channel layer')
+
+
+def _group_send_many(messages):
+    """Send {group: message} concurrently in one event loop round trip"""
+    channel_layer = get_channel_layer()
+    if channel_layer is None or not messages:
+        return
+
+    async def send_all():
+        await asyncio.gather(*(
+            channel_layer.group_send(group, message) for group, message in messages.items()
+        ))
+
+    try:
+        async_to_sync(send_all)()
+    except Exception:
+        logger.exception('Could not publish notifications to the channel layer')
+
+
+def serialize_notification(notification):
+    """Shape a notification as pushed to the client"""
+    data = {field: getattr(notification, field) for field in PUSHED_FIELDS}
+    data.update({
+        'id': notification.id,
+        'recipient': notification.recipient_id,
+        'created_at': notification.created_at.isoformat(),
+    })
+    return data
+
+
+def publish_created(notification):
+    """Push a created notification to its recipient once the transaction commits"""
+    message = {'type': 'notification.created', 'notification': serialize_notification(notification)}
+    transaction.on_commit(lambda: _group_send(user_group(notification.recipient_id), message))
+
+
+def publish_announcement(notifications):
+    """
+    Push notifications with the same content (one announcement chunk) to
+    their recipients' groups once the transaction commits
+    """
+    if not notifications:
+        return
+    shared = {field: getattr(notifications[0], field) for field in PUSHED_FIELDS}
+    shared['created_at'] = notifications[0].created_at.isoformat()
+    messages = {
+        user_group(notification.recipient_id): {
+            'type': 'notification.created',
+            'notification': dict(shared, id=notification.id, recipient=notification.recipient_id),
+        }
+        for notification in notifications
+    }
+    transaction.on_commit(lambda: _group_send_many(messages))
+
+
+def publish_unread_counts(counts):
+    """
+    Push new unread counts to their users' sockets
+
+    Args:
+        counts: {user id: unread count}
+    """
+    _group_send_many({
+        user_group(user_id): {'type': 'unread.count', 'count': max(count, 0)}
+        for user_id, count in counts.items()
+    })
+
+
+def publish_bulk_update(user_id, update):
+    """Push one consolidated bulk status change to the user's sockets after commit"""
+    message = dict(update, type='notifications.updated')
+    transaction.on_commit(lambda: _group_send(user_group(user_id), message))
@@ -0,0 +1,44 @@
+"""
+Management command to move expired notifications to the archive
+"""
+from django.core.management.base import BaseCommand
+
+from apps.notifications.archive import archive_notifications, count_expired
+
+
+class Command(BaseCommand):
+    help = 'Move read, archived and deleted notifications past NOTIFICATION_RETENTION_DAYS to the archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Notifications moved per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this many batches (default: until none are left)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the notifications that would be moved'
+        )
+
+    def handle(self, *args, **options):
+        """Move the expired notifications batch by batch"""
+        if options['dry_run']:
+            count = count_expired()
+            self.stdout.write(self.style.SUCCESS(f'{count} notification(s) past retention'))
+            return
+
+        result = archive_notifications(
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Moved {result['moved']} notification(s) to the archive in {result['batches']} batch(es)"
+        ))
@@ -0,0 +1,25 @@
+"""
+Management command to repair drifted unread notification counters
+"""
+from django.core.management.base import BaseCommand
+
+from apps.notifications.counters import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = 'Recount unread notifications per user and fix the counters that drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the drifted counters'
+        )
+
+    def handle(self, *args, **options):
+        """Recount under a lock of the counter table"""
+        drift = reconcile_unread_counts(dry_run=options['dry_run'])
+        for user_id, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f'user {user_id}: counter {stored}, actual {actual}')
+        action = 'found' if options['dry_run'] else 'repaired'
+        self.stdout.write(self.style.SUCCESS(f'{len(drift)} drifted counter(s) {action}'))
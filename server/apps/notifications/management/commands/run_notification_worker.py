@@ -0,0 +1,68 @@
+"""
+Management command to process queued notification fan-out jobs
+"""
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.notifications.jobs import process_next_chunk
+
+
+class Command(BaseCommand):
+    help = 'Send queued announcement and reminder chunks with a pool of worker threads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Worker threads, each with its own database connection (default: 2)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds an idle worker waits before looking for new chunks (default: 2)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no queued chunk is due instead of polling (chunks waiting to be retried stay queued)'
+        )
+
+    def handle(self, *args, **options):
+        """Run the workers until interrupted (or until the queue is empty with --once)"""
+        self.stop = threading.Event()
+        self.processed = 0
+        self.lock = threading.Lock()
+        threads = [
+            threading.Thread(target=self.work, args=(options['poll_interval'], options['once']), daemon=True)
+            for _ in range(max(options['workers'], 1))
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+        self.stdout.write(self.style.SUCCESS(f'Notification workers stopped: {self.processed} chunk(s) processed'))
+
+    def work(self, poll_interval, once):
+        """Claim chunks one at a time; chunks are locked with SKIP LOCKED, so workers never collide"""
+        try:
+            while not self.stop.is_set():
+                if process_next_chunk() is not None:
+                    with self.lock:
+                        self.processed += 1
+                    continue
+                if once:
+                    break
+                self.stop.wait(poll_interval)
+        finally:
+            connection.close()
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+SEED_COUNTERS = """
+INSERT INTO notification_unread_counters (user_id, unread)
+SELECT recipient_id, COUNT(*) FROM notifications_notification
+WHERE status = 'unread'
+GROUP BY recipient_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('notifications', '0003_fanout_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Unread Counters',
+                'db_table': 'notification_unread_counters',
+            },
+        ),
+        migrations.RunSQL(SEED_COUNTERS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0005_notification_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fanoutchunk',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
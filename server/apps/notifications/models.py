@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -53,29 +53,116 @@ class Notification(models.Model):
             models.Index(fields=['recipient', '-created_at']),
             models.Index(fields=['recipient', 'status']),
             models.Index(fields=['notification_type']),
+            # Retention scan of archive_notifications (see archive.py)
+            models.Index(fields=['status', 'created_at'], name='notification_retention_idx'),
         ]
 
     def __str__(self):
         return f"{self.title} - {self.recipient.username}"
 
+    def save(self, *args, **kwargs):
+        """Save the notification and adjust the unread counters (see counters.py)"""
+        from .counters import adjust_unread
+
+        update_fields = kwargs.get('update_fields')
+        adding = self._state.adding
+        tracked = update_fields is None or {'status', 'recipient', 'recipient_id'} & set(update_fields)
+        with transaction.atomic():
+            deltas = {}
+            if tracked:
+                # The stored row is read under a lock, so concurrent saves of
+                # the same notification adjust the counter one after the other
+                previous = None if self.pk is None else (
+                    Notification.objects.select_for_update()
+                    .filter(pk=self.pk).values_list('recipient_id', 'status').first()
+                )
+                if previous is not None and previous[1] == 'unread':
+                    deltas[previous[0]] = deltas.get(previous[0], 0) - 1
+                if self.status == 'unread':
+                    deltas[self.recipient_id] = deltas.get(self.recipient_id, 0) + 1
+            super().save(*args, **kwargs)
+            # New notifications are pushed with their unread count by the consumer
+            adjust_unread(deltas, publish=not adding)
+
+    def _change_status(self, status, timestamp_field, only_unread=False):
+        """
+        Set the status with a conditional UPDATE, so that concurrent calls
+        decrement the unread counter at most once
+        """
+        from .counters import adjust_unread
+
+        now = timezone.now()
+        changes = {'status': status, timestamp_field: now}
+        with transaction.atomic():
+            was_unread = Notification.objects.filter(pk=self.pk, status='unread').update(**changes)
+            if was_unread:
+                adjust_unread({self.recipient_id: -1})
+            elif not only_unread:
+                Notification.objects.filter(pk=self.pk).update(**changes)
+            else:
+                self.refresh_from_db(fields=['status', timestamp_field])
+                return
+        self.status = status
+        setattr(self, timestamp_field, now)
+
     def mark_as_read(self):
         """Mark notification as read"""
         if self.status == 'unread':
-            self.status = 'read'
-            self.read_at = timezone.now()
-            self.save()
+            self._change_status('read', 'read_at', only_unread=True)
 
     def archive(self):
         """Archive notification"""
-        self.status = 'archived'
-        self.archived_at = timezone.now()
-        self.save()
+        self._change_status('archived', 'archived_at')
 
     def delete_notification(self):
         """Soft delete notification"""
-        self.status = 'deleted'
-        self.deleted_at = timezone.now()
-        self.save()
+        self._change_status('deleted', 'deleted_at')
+
+
+class UnreadCounter(models.Model):
+    """
+    Model for the number of unread notifications of a user
+    Adjusted with every change of a notification's status (see counters.py)
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    unread = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'notification_unread_counters'
+        verbose_name_plural = "Unread Counters"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
+
+
+class NotificationArchive(models.Model):
+    """
+    Model for notifications moved out of Notification by the retention
+    policy (see archive.py); keeps the original id, without delivery logs
+    """
+    id = models.BigIntegerField(primary_key=True)
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', db_index=False)
+    notification_type = models.CharField(max_length=50, choices=NOTIFICATION_TYPES)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    data = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=NOTIFICATION_STATUS)
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(null=True, blank=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    moved_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'notification_archive'
+        ordering = ['-created_at']
+        verbose_name_plural = "Notification Archive"
+        indexes = [
+            models.Index(fields=['recipient', '-created_at'], name='notification_archive_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.status} (archived)"
 
 
 class NotificationPreference(models.Model):
@@ -127,3 +214,69 @@ class DeliveryLog(models.Model):
 
     def __str__(self):
         return f"{self.notification.title} - {self.channel} - {self.status}"
+
+
+# Fan-out job status choices
+JOB_STATUS = [
+    ('queued', 'Queued'),
+    ('running', 'Running'),
+    ('completed', 'Completed'),
+    ('failed', 'Failed'),
+]
+
+# Fan-out chunk status choices
+CHUNK_STATUS = [
+    ('queued', 'Queued'),
+    ('done', 'Done'),
+    ('failed', 'Failed'),
+]
+
+
+class FanoutJob(models.Model):
+    """Model for a notification sent to many users in the background (see jobs.py)"""
+    notification_type = models.CharField(max_length=50, choices=NOTIFICATION_TYPES)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    data = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=JOB_STATUS, default='queued')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    total_recipients = models.IntegerField(default=0)
+    processed_recipients = models.IntegerField(default=0)
+    created_count = models.IntegerField(default=0)
+    skipped_count = models.IntegerField(default=0)
+    total_chunks = models.IntegerField(default=0)
+    finished_chunks = models.IntegerField(default=0)
+    failed_chunks = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.status} ({self.processed_recipients}/{self.total_recipients})"
+
+
+class FanoutChunk(models.Model):
+    """Model for one batch of recipients of a FanoutJob, claimed by one worker at a time"""
+    job = models.ForeignKey(FanoutJob, on_delete=models.CASCADE, related_name='chunks')
+    user_ids = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=CHUNK_STATUS, default='queued')
+    attempts = models.IntegerField(default=0)
+    # Earliest time a failed chunk is claimed again (see jobs.retry_delay)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    error_message = models.TextField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+
+    def __str__(self):
+        return f"Chunk {self.pk} of job {self.job_id} - {self.status}"
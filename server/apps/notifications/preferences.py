@@ -0,0 +1,124 @@
+"""
+Notification preference cache
+Per-user map of notification type -> (enabled, email_enabled), kept in process
+
+should_deliver() and the announcement fan-out read preferences through
+preference_cache instead of querying NotificationPreference and
+NotificationPreferenceType for every notification:
+- a user's whole map is loaded with one query on a miss; get_many()
+  loads the misses of a batch of users with one query
+- at most NOTIFICATION_PREFERENCE_CACHE_SIZE users are kept, the least
+  recently used one is evicted first
+- entries expire after NOTIFICATION_PREFERENCE_CACHE_TTL seconds, which
+  bounds how long another process can serve a changed preference
+- saving or deleting a preference (the preferences API, the admin)
+  invalidates the user's entry through signals.py, immediately and again
+  after commit; QuerySet.update() bypasses this
+A type without a row is enabled (email disabled), as before.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .models import NotificationPreferenceType
+
+
+DEFAULT_PREFERENCE = (True, False)
+
+
+class PreferenceCache:
+    """
+    Bounded LRU cache of notification preferences keyed by user id
+
+    Usage:
+        preference_cache.get(user.id).get('system_announcement', DEFAULT_PREFERENCE)
+        preference_cache.get_many(user_ids)   # {user id: map}, one query for the misses
+        preference_cache.invalidate(user.id)  # after the user's preferences changed
+    """
+
+    def __init__(self, max_size=None, ttl=None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that overlapped one is not stored
+        self._version = 0
+        self._metrics = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @property
+    def max_size(self):
+        return self._max_size or settings.NOTIFICATION_PREFERENCE_CACHE_SIZE
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else settings.NOTIFICATION_PREFERENCE_CACHE_TTL
+
+    def get(self, user_id):
+        """Return the preference map of one user"""
+        return self.get_many([user_id])[user_id]
+
+    def get_many(self, user_ids):
+        """
+        Return {user id: {notification type: (enabled, email_enabled)}}
+        loading every user that is not cached with one query
+        """
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(user_id)
+                    found[user_id] = entry[0]
+            self._metrics['hits'] += len(found)
+            missing = [user_id for user_id in dict.fromkeys(user_ids) if user_id not in found]
+            self._metrics['misses'] += len(missing)
+            version = self._version
+        if not missing:
+            return found
+
+        loaded = {user_id: {} for user_id in missing}
+        rows = NotificationPreferenceType.objects.filter(preference__user_id__in=missing).values_list(
+            'preference__user_id', 'notification_type', 'enabled', 'email_enabled'
+        )
+        for user_id, notification_type, enabled, email_enabled in rows:
+            loaded[user_id][notification_type] = (enabled, email_enabled)
+
+        with self._lock:
+            if version == self._version:
+                expires = time.monotonic() + self.ttl
+                for user_id, preferences in loaded.items():
+                    self._entries[user_id] = (preferences, expires)
+                    self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self._metrics['evictions'] += 1
+        found.update(loaded)
+        return found
+
+    def invalidate(self, user_id):
+        """Drop the cached preferences of a user"""
+        with self._lock:
+            self._version += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        """Drop every entry (used by tests)"""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def metrics(self):
+        """Return this process's hit/miss/eviction counts and size"""
+        with self._lock:
+            return dict(self._metrics, size=len(self._entries))
+
+
+preference_cache = PreferenceCache()
+
+
+def is_enabled(preferences, notification_type):
+    """Whether in-app delivery of the type is enabled in a preference map"""
+    return preferences.get(notification_type, DEFAULT_PREFERENCE)[0]
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Notification, NotificationPreference, NotificationPreferenceType, DeliveryLog
+from utils.fast_serializers import FastSerializer
+from .models import (
+    Notification, NotificationArchive, NotificationPreference, NotificationPreferenceType, DeliveryLog
+)
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -33,6 +36,23 @@ class NotificationSerializer(serializers.ModelSerializer):
         return value
 
 
+# values()-based equivalent of NotificationSerializer for the list endpoint
+# (recipient_username is read through a join instead of one query per row)
+notification_fast_serializer = FastSerializer(NotificationSerializer)
+
+
+class NotificationArchiveSerializer(serializers.ModelSerializer):
+    """Read-only serializer for notifications moved to the archive"""
+
+    class Meta:
+        model = NotificationArchive
+        fields = [
+            'id', 'recipient', 'notification_type', 'title', 'message', 'data',
+            'status', 'created_at', 'read_at', 'archived_at', 'deleted_at', 'moved_at'
+        ]
+        read_only_fields = fields
+
+
 class NotificationPreferenceTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = NotificationPreferenceType
@@ -3,12 +3,36 @@ Notification Service Layer
 Handles business logic for creating and managing notifications
 """
 
+from itertools import islice
+
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import QuerySet
 from django.utils import timezone
 from .models import (
     Notification, NotificationPreference, NotificationPreferenceType,
     DeliveryLog, NOTIFICATION_TYPES
 )
+from .counters import adjust_unread, get_unread_count
+from .live import publish_announcement, publish_bulk_update, publish_created
+from .preferences import is_enabled, preference_cache
+
+
+# Bulk status -> (timestamp field set with it, statuses left unchanged)
+BULK_STATUS_TIMESTAMPS = {
+    'read': ('read_at', ('read', 'archived', 'deleted')),
+    'archived': ('archived_at', ('archived', 'deleted')),
+    'deleted': ('deleted_at', ('deleted',)),
+}
+
+
+def valid_ids(notification_ids):
+    """Whether a client sent a list of integer ids (notification or user ids)"""
+    return isinstance(notification_ids, list) and all(
+        isinstance(notification_id, int) and not isinstance(notification_id, bool)
+        for notification_id in notification_ids
+    )
 
 
 class NotificationService:
@@ -18,6 +42,7 @@ class NotificationService:
     def create_notification(recipient, notification_type, title, message, data=None):
         """
         Create a notification for a user
+        Pushed to the recipient's open sockets after commit (see live.py)
         
         Args:
             recipient: User object
@@ -52,12 +77,14 @@ class NotificationService:
             status='pending'
         )
 
+        publish_created(notification)
         return notification
 
     @staticmethod
     def should_deliver(user, notification_type):
         """
         Check if a notification should be delivered to a user
+        Preferences are read through the per-user cache (see preferences.py)
         
         Args:
             user: User object
@@ -66,48 +93,71 @@ class NotificationService:
         Returns:
             Boolean indicating if notification should be delivered
         """
-        try:
-            preference = NotificationPreference.objects.get(user=user)
-            pref_type = NotificationPreferenceType.objects.get(
-                preference=preference,
-                notification_type=notification_type
-            )
-            return pref_type.enabled
-        except (NotificationPreference.DoesNotExist, NotificationPreferenceType.DoesNotExist):
-            # If no preference exists, default to enabled
-            return True
+        preferences = preference_cache.get(user.pk)
+        # If no preference exists, default to enabled
+        return is_enabled(preferences, notification_type)
 
     @staticmethod
-    def create_announcement(title, message, user_group, notification_type='system_announcement', data=None):
+    def create_announcement(title, message, user_group, notification_type='system_announcement', data=None,
+                            chunk_size=None):
         """
         Create an announcement for a group of users
         
+        Recipients are handled in chunks of `chunk_size`: the chunk's
+        preferences come from the preference cache (one query for the users
+        not cached), then its notifications and delivery logs are inserted
+        with bulk_create, all in one transaction. Each chunk is pushed to
+        connected clients as one broadcast message after commit (see live.py).
+        
         Args:
             title: Announcement title
             message: Announcement message
-            user_group: QuerySet of User objects
+            user_group: QuerySet of User objects (or an iterable of users)
             notification_type: Type of notification (default: system_announcement)
             data: Additional data (optional)
+            chunk_size: Recipients per insert (default: settings.NOTIFICATION_FANOUT_CHUNK_SIZE)
             
         Returns:
-            List of created Notification objects
+            Dict with the number of recipients, created notifications and
+            recipients skipped by their preferences
         """
         if data is None:
             data = {}
-
-        notifications = []
-        for user in user_group:
-            notification = NotificationService.create_notification(
-                recipient=user,
-                notification_type=notification_type,
-                title=title,
-                message=message,
-                data=data
-            )
-            if notification:
-                notifications.append(notification)
-
-        return notifications
+        chunk_size = chunk_size or settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+
+        if isinstance(user_group, QuerySet):
+            recipient_ids = user_group.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=chunk_size)
+        else:
+            recipient_ids = [user.pk for user in user_group]
+
+        counts = {'recipients': 0, 'created': 0, 'skipped': 0}
+        recipient_ids = iter(recipient_ids)
+        with transaction.atomic():
+            while True:
+                chunk = list(islice(recipient_ids, chunk_size))
+                if not chunk:
+                    break
+                counts['recipients'] += len(chunk)
+                preferences = preference_cache.get_many(chunk)
+                notifications = Notification.objects.bulk_create([
+                    Notification(
+                        recipient_id=user_id,
+                        notification_type=notification_type,
+                        title=title,
+                        message=message,
+                        data=data
+                    )
+                    for user_id in chunk if is_enabled(preferences[user_id], notification_type)
+                ])
+                DeliveryLog.objects.bulk_create([
+                    DeliveryLog(notification=notification, channel='in_app', status='pending')
+                    for notification in notifications
+                ])
+                adjust_unread({notification.recipient_id: 1 for notification in notifications}, publish=False)
+                publish_announcement(notifications)
+                counts['created'] += len(notifications)
+        counts['skipped'] = counts['recipients'] - counts['created']
+        return counts
 
     @staticmethod
     def mark_as_read(notification):
@@ -127,6 +177,48 @@ class NotificationService:
         notification.delete_notification()
         return notification
 
+    @staticmethod
+    def bulk_update_status(user, status, notification_ids=None):
+        """
+        Set the status of many notifications of a user with set-based UPDATEs
+        
+        The rows that were unread are updated first, so the unread counter is
+        decremented by exactly their number; one notifications_updated
+        message with the new unread count is pushed after commit.
+        
+        Args:
+            user: User object
+            status: 'read', 'archived' or 'deleted' (see BULK_STATUS_TIMESTAMPS)
+            notification_ids: Notification ids to change (default: all of the user's)
+            
+        Returns:
+            Number of notifications changed
+        """
+        timestamp_field, skipped = BULK_STATUS_TIMESTAMPS[status]
+        queryset = Notification.objects.filter(recipient=user).exclude(status__in=skipped)
+        if notification_ids is not None:
+            queryset = queryset.filter(pk__in=notification_ids)
+        changes = {'status': status, timestamp_field: timezone.now()}
+
+        with transaction.atomic():
+            was_unread = queryset.filter(status='unread').update(**changes)
+            updated = was_unread
+            # 'read' only ever changes unread rows
+            if status != 'read':
+                updated += queryset.exclude(status='unread').update(**changes)
+            if was_unread:
+                unread_count = adjust_unread({user.pk: -was_unread}, publish=False)[user.pk]
+            elif updated:
+                unread_count = get_unread_count(user.pk)
+            if updated:
+                publish_bulk_update(user.pk, {
+                    'status': status,
+                    'notification_ids': notification_ids,
+                    'updated': updated,
+                    'unread_count': max(unread_count, 0),
+                })
+        return updated
+
     @staticmethod
     def get_user_notifications(user, status=None, notification_type=None, include_deleted=False):
         """
@@ -156,11 +248,8 @@ class NotificationService:
 
     @staticmethod
     def get_unread_count(user):
-        """Get count of unread notifications for a user"""
-        return Notification.objects.filter(
-            recipient=user,
-            status='unread'
-        ).count()
+        """Get count of unread notifications for a user (from the maintained counter)"""
+        return get_unread_count(user.pk)
 
     @staticmethod
     def initialize_user_preferences(user):
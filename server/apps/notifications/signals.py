@@ -0,0 +1,47 @@
+"""
+Signals invalidating the cached notification preferences and keeping the
+unread counters in step with deleted notifications
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .counters import adjust_unread
+from .models import Notification, NotificationPreference, NotificationPreferenceType
+from .preferences import preference_cache
+
+
+def invalidate_preferences(user_id):
+    """Drop the user's cached preferences now and again after commit"""
+    preference_cache.invalidate(user_id)
+    transaction.on_commit(lambda: preference_cache.invalidate(user_id))
+
+
+@receiver(post_save, sender=NotificationPreference)
+@receiver(pre_delete, sender=NotificationPreference)
+def preference_changed(sender, instance, **kwargs):
+    """
+    Signal handler dropping the cached preferences of the preference's user
+    """
+    invalidate_preferences(instance.user_id)
+
+
+@receiver(post_save, sender=NotificationPreferenceType)
+@receiver(pre_delete, sender=NotificationPreferenceType)
+def preference_type_changed(sender, instance, **kwargs):
+    """
+    Signal handler dropping the cached preferences when one type changes
+    Deletion is handled before the rows are gone, so the user can still be loaded
+    """
+    invalidate_preferences(instance.preference.user_id)
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    """
+    Signal handler decrementing the unread counter when an unread
+    notification row is removed
+    """
+    if instance.status == 'unread':
+        adjust_unread({instance.recipient_id: -1})
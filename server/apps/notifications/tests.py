@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.contrib.auth.models import User
 from .models import Notification, NotificationPreference, NotificationPreferenceType, DeliveryLog
 
@@ -216,6 +216,74 @@ class NotificationServiceTest(TestCase):
         count = NotificationService.get_unread_count(self.user)
         self.assertEqual(count, 1)
 
+    def test_preferences_cached_until_changed(self):
+        """Test that should_deliver reuses cached preferences until the API changes them"""
+        from rest_framework.test import APIClient
+        from .services import NotificationService
+        
+        NotificationService.initialize_user_preferences(self.user)
+        self.assertTrue(NotificationService.should_deliver(self.user, 'deadline_reminder'))
+        with self.assertNumQueries(0):
+            self.assertTrue(NotificationService.should_deliver(self.user, 'deadline_reminder'))
+        
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.put(
+            '/api/notification-preferences/1/',
+            {'notification_type': 'deadline_reminder', 'enabled': False},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(NotificationService.should_deliver(self.user, 'deadline_reminder'))
+
+    def test_preference_cache_evicts_least_recently_used(self):
+        """Test that the cache keeps at most max_size users and loads batches with one query"""
+        from .preferences import PreferenceCache
+        
+        users = [User.objects.create_user(username=f'lru{index}', password='testpass123') for index in range(3)]
+        cache = PreferenceCache(max_size=2, ttl=60)
+        with self.assertNumQueries(1):
+            cache.get_many([user.pk for user in users])
+        cache.get(users[2].pk)
+        self.assertEqual(cache.metrics()['evictions'], 1)
+        with self.assertNumQueries(0):
+            cache.get(users[2].pk)
+        with self.assertNumQueries(1):
+            cache.get(users[0].pk)
+
+    def test_create_announcement_in_bulk(self):
+        """Test that announcements skip disabled recipients and insert in chunks"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .services import NotificationService
+        
+        users = [
+            User.objects.create_user(username=f'user{index}', password='testpass123')
+            for index in range(5)
+        ]
+        preference = NotificationPreference.objects.create(user=users[0])
+        NotificationPreferenceType.objects.create(
+            preference=preference,
+            notification_type='system_announcement',
+            enabled=False
+        )
+        
+        with CaptureQueriesContext(connection) as queries:
+            counts = NotificationService.create_announcement(
+                title='Holiday',
+                message='Campus closed',
+                user_group=User.objects.all(),
+                chunk_size=2
+            )
+        
+        self.assertEqual(counts, {'recipients': 6, 'created': 5, 'skipped': 1})
+        self.assertFalse(Notification.objects.filter(recipient=users[0]).exists())
+        self.assertEqual(
+            DeliveryLog.objects.filter(notification__notification_type='system_announcement').count(), 5
+        )
+        # 3 chunks of (recipient ids, preferences, notifications, delivery logs, counters), not per user
+        self.assertLessEqual(len(queries.captured_queries), 18)
+
     def test_initialize_user_preferences(self):
         """Test initializing user preferences"""
         from .services import NotificationService
@@ -319,3 +387,469 @@ class DeliveryServiceTest(TestCase):
         
         self.assertEqual(failed.count(), 1)
         self.assertEqual(failed.first().status, 'failed')
+
+
+class NotificationFastSerializerTest(TestCase):
+    """Test the values()-based serializer used by the notification list"""
+
+    def test_matches_notification_serializer(self):
+        """Test that both serializers render byte-identical JSON"""
+        from django.utils import timezone
+        from rest_framework.renderers import JSONRenderer
+        from .serializers import NotificationSerializer, notification_fast_serializer
+
+        user = User.objects.create_user(username='fastuser', password='testpass123')
+        Notification.objects.create(
+            recipient=user,
+            notification_type='application_status',
+            title='Approved',
+            message='Your application was approved',
+            data={'applicationId': 'abc', 'nested': [1, 2.5, None]},
+        )
+        Notification.objects.create(
+            recipient=user,
+            notification_type='system_announcement',
+            title='নোটিশ',
+            message='Read message',
+            status='read',
+            read_at=timezone.now(),
+        )
+        queryset = Notification.objects.order_by('-created_at')
+
+        expected = JSONRenderer().render(NotificationSerializer(queryset, many=True).data)
+        actual = JSONRenderer().render(
+            notification_fast_serializer.represent(notification_fast_serializer.values(queryset))
+        )
+        self.assertEqual(actual, expected)
+
+
+class UnreadCounterTest(TestCase):
+    """Test cases for the maintained unread counters (counters.py)"""
+
+    def setUp(self):
+        """Set up a user with three unread notifications"""
+        self.user = User.objects.create_user(username='counted', password='testpass123')
+        self.notifications = [
+            Notification.objects.create(
+                recipient=self.user,
+                notification_type='account_activity',
+                title=f'Notice {index}',
+                message='Message'
+            )
+            for index in range(3)
+        ]
+
+    def unread(self):
+        from .counters import get_unread_count
+        return get_unread_count(self.user.pk)
+
+    def test_counter_follows_status_changes(self):
+        """Test that create, read, archive, delete and announcements adjust the counter"""
+        from .services import NotificationService
+        
+        self.assertEqual(self.unread(), 3)
+        first, second, third = self.notifications
+        first.mark_as_read()
+        Notification.objects.get(pk=first.pk).mark_as_read()
+        self.assertEqual(self.unread(), 2)
+        second.archive()
+        second.archive()
+        self.assertEqual(self.unread(), 1)
+        
+        third.status = 'read'
+        third.save()
+        third.status = 'unread'
+        third.save(update_fields=['status'])
+        self.assertEqual(self.unread(), 1)
+        third.delete()
+        self.assertEqual(self.unread(), 0)
+        
+        NotificationService.create_announcement('Holiday', 'Closed', User.objects.filter(pk=self.user.pk))
+        self.assertEqual(self.unread(), 1)
+
+    def test_stale_saves_decrement_once(self):
+        """Test that two saves of copies loaded while unread decrement the counter once"""
+        first = Notification.objects.get(pk=self.notifications[0].pk)
+        second = Notification.objects.get(pk=self.notifications[0].pk)
+        for copy in (first, second):
+            copy.status = 'read'
+            copy.save()
+        self.assertEqual(self.unread(), 2)
+        second.status = 'unread'
+        second.save()
+        self.assertEqual(self.unread(), 3)
+
+    def test_deleting_user_with_unread_notifications(self):
+        """Test that the cascade does not recreate the deleted user's counter"""
+        from .models import UnreadCounter
+        
+        self.user.delete()
+        self.assertFalse(UnreadCounter.objects.filter(user_id=self.user.pk).exists())
+        self.assertFalse(Notification.objects.filter(recipient_id=self.user.pk).exists())
+
+    def test_unread_count_endpoint_reads_counter(self):
+        """Test that unread_count answers from the counter without counting rows"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.test import APIClient
+        
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/notifications/unread_count/')
+        self.assertEqual(response.data, {'unread_count': 3})
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+
+    def test_reconcile_command_repairs_drift(self):
+        """Test that the reconciliation command fixes counters changed behind its back"""
+        from io import StringIO
+        from django.core.management import call_command
+        
+        Notification.objects.filter(pk=self.notifications[0].pk).update(status='read')
+        out = StringIO()
+        call_command('reconcile_unread_counts', '--dry-run', stdout=out)
+        self.assertIn('counter 3, actual 2', out.getvalue())
+        self.assertEqual(self.unread(), 3)
+        
+        call_command('reconcile_unread_counts', stdout=StringIO())
+        self.assertEqual(self.unread(), 2)
+
+
+class BulkStatusTest(TestCase):
+    """Test cases for the set-based bulk status actions"""
+
+    def setUp(self):
+        """Set up a user with notifications in several states"""
+        from rest_framework.test import APIClient
+        self.user = User.objects.create_user(username='bulk', password='testpass123')
+        self.other = User.objects.create_user(username='bystander', password='testpass123')
+        self.notifications = [
+            Notification.objects.create(
+                recipient=self.user, notification_type='account_activity', title=f'N{index}', message='M'
+            )
+            for index in range(4)
+        ]
+        self.notifications[3].mark_as_read()
+        self.foreign = Notification.objects.create(
+            recipient=self.other, notification_type='account_activity', title='Other', message='M'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_mark_all_as_read_is_set_based(self):
+        """Test that mark-all runs a constant number of queries and sets read_at"""
+        from .counters import get_unread_count
+        for index in range(20):
+            Notification.objects.create(
+                recipient=self.user, notification_type='account_activity', title=f'More {index}', message='M'
+            )
+        # Savepoint, one UPDATE, the counter, release
+        with self.assertNumQueries(4):
+            response = self.client.patch('/api/notifications/mark_all_as_read/')
+        self.assertEqual(response.data, {'marked_as_read': 23})
+        self.assertFalse(Notification.objects.filter(recipient=self.user, read_at__isnull=True).exists())
+        self.assertEqual(get_unread_count(self.user.pk), 0)
+        self.assertEqual(Notification.objects.get(pk=self.foreign.pk).status, 'unread')
+
+    def test_bulk_archive_and_delete_by_ids(self):
+        """Test that bulk actions only touch the user's listed notifications"""
+        from .counters import get_unread_count
+        ids = [self.notifications[0].pk, self.notifications[3].pk, self.foreign.pk]
+        response = self.client.patch('/api/notifications/bulk_archive/', {'notification_ids': ids}, format='json')
+        self.assertEqual(response.data, {'archived': 2})
+        self.assertEqual(get_unread_count(self.user.pk), 2)
+        archived = Notification.objects.get(pk=self.notifications[3].pk)
+        self.assertEqual(archived.status, 'archived')
+        self.assertIsNotNone(archived.archived_at)
+        
+        response = self.client.post(
+            '/api/notifications/bulk_delete/', {'notification_ids': [self.notifications[1].pk]}, format='json'
+        )
+        self.assertEqual(response.data, {'deleted': 1})
+        response = self.client.patch(
+            '/api/notifications/bulk_mark_as_read/', {'notification_ids': [self.notifications[2].pk]}, format='json'
+        )
+        self.assertEqual(response.data, {'marked_as_read': 1})
+        self.assertEqual(get_unread_count(self.user.pk), 0)
+        self.assertEqual(Notification.objects.get(pk=self.foreign.pk).status, 'unread')
+        
+        response = self.client.patch('/api/notifications/bulk_archive/', {'notification_ids': 'all'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class NotificationArchiveTest(TestCase):
+    """Test cases for the retention policy and the archive (archive.py)"""
+
+    def setUp(self):
+        """Set up a user with old and recent notifications in every state"""
+        from datetime import timedelta
+        from django.utils import timezone
+        self.user = User.objects.create_user(username='archivist', password='testpass123')
+        old = timezone.now() - timedelta(days=400)
+        self.old = {}
+        for status in ('unread', 'read', 'archived', 'deleted'):
+            notification = Notification.objects.create(
+                recipient=self.user, notification_type='account_activity', title=f'Old {status}', message='M'
+            )
+            if status == 'read':
+                notification.mark_as_read()
+            elif status == 'archived':
+                notification.archive()
+            elif status == 'deleted':
+                notification.delete_notification()
+            self.old[status] = notification
+        Notification.objects.filter(pk__in=[n.pk for n in self.old.values()]).update(created_at=old)
+        self.recent = Notification.objects.create(
+            recipient=self.user, notification_type='account_activity', title='Recent', message='M'
+        )
+        self.recent.mark_as_read()
+        DeliveryLog.objects.create(notification=self.old['read'], channel='in_app', status='delivered')
+
+    def test_command_moves_expired_rows_in_batches(self):
+        """Test that only expired read, archived and deleted rows move, keeping their ids"""
+        from io import StringIO
+        from django.core.management import call_command
+        from .counters import get_unread_count
+        from .models import NotificationArchive
+        
+        out = StringIO()
+        call_command('archive_notifications', '--dry-run', stdout=out)
+        self.assertIn('3 notification(s)', out.getvalue())
+        self.assertFalse(NotificationArchive.objects.exists())
+        
+        out = StringIO()
+        call_command('archive_notifications', '--batch-size', '2', stdout=out)
+        self.assertIn('Moved 3 notification(s) to the archive in 2 batch(es)', out.getvalue())
+        
+        moved = [self.old[status].pk for status in ('read', 'archived', 'deleted')]
+        self.assertEqual(sorted(NotificationArchive.objects.values_list('id', flat=True)), sorted(moved))
+        self.assertFalse(Notification.objects.filter(pk__in=moved).exists())
+        self.assertFalse(DeliveryLog.objects.filter(notification_id__in=moved).exists())
+        self.assertTrue(Notification.objects.filter(pk=self.old['unread'].pk).exists())
+        self.assertTrue(Notification.objects.filter(pk=self.recent.pk).exists())
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+        archived = NotificationArchive.objects.get(pk=self.old['archived'].pk)
+        self.assertEqual(archived.status, 'archived')
+        self.assertIsNotNone(archived.archived_at)
+
+    def test_history_serves_archive_and_list_stays_hot(self):
+        """Test that the list never shows archived rows and history only shows them, deleted ones on request"""
+        from rest_framework.test import APIClient
+        from .archive import archive_notifications
+        
+        archive_notifications()
+        client = APIClient()
+        client.force_authenticate(self.user)
+        listed = client.get('/api/notifications/?include_deleted=1').data['results']
+        self.assertEqual({item['id'] for item in listed}, {self.old['unread'].pk, self.recent.pk})
+        
+        response = client.get('/api/notifications/history/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            {item['id'] for item in response.data['results']},
+            {self.old[status].pk for status in ('read', 'archived')}
+        )
+        response = client.get('/api/notifications/history/?include_deleted=1')
+        self.assertEqual(response.data['count'], 3)
+        response = client.get('/api/notifications/history/?include_deleted=1&status=deleted')
+        self.assertEqual([item['id'] for item in response.data['results']], [self.old['deleted'].pk])
+
+
+class FanoutJobTest(TestCase):
+    """Test cases for the background fan-out queue (jobs.py)"""
+
+    def setUp(self):
+        """Set up recipients and a staff user"""
+        self.users = [
+            User.objects.create_user(username=f'recipient{index}', password='testpass123')
+            for index in range(5)
+        ]
+        self.staff = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+
+    def test_chunks_processed_until_job_completes(self):
+        """Test that workers send chunk by chunk and the last chunk completes the job"""
+        from .jobs import enqueue_fanout, process_next_chunk
+        
+        job = enqueue_fanout('Exam schedule', 'Published', User.objects.filter(username__startswith='recipient'),
+                             chunk_size=2)
+        self.assertEqual((job.status, job.total_recipients, job.total_chunks), ('queued', 5, 3))
+        self.assertFalse(Notification.objects.exists())
+        
+        process_next_chunk()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed_recipients, job.created_count), ('running', 2, 2))
+        
+        while process_next_chunk() is not None:
+            pass
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.finished_chunks, job.created_count), ('completed', 3, 5))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(Notification.objects.filter(title='Exam schedule').count(), 5)
+
+    def test_failing_chunk_retried_then_failed(self):
+        """Test that a chunk that keeps raising is retried with backoff, then marked failed"""
+        from unittest import mock
+        from django.utils import timezone
+        from .jobs import MAX_CHUNK_ATTEMPTS, enqueue_fanout, process_next_chunk
+        from .models import FanoutChunk
+        
+        job = enqueue_fanout('Notice', 'Text', User.objects.filter(pk=self.users[0].pk))
+        with mock.patch('apps.notifications.jobs.NotificationService.create_announcement', side_effect=RuntimeError('down')), \
+                self.assertLogs('apps.notifications.jobs', level='ERROR'):
+            delays = []
+            for _ in range(MAX_CHUNK_ATTEMPTS - 1):
+                chunk = process_next_chunk()
+                delays.append(chunk.next_attempt_at - timezone.now())
+                # Backed off: not claimed again before next_attempt_at
+                self.assertIsNone(process_next_chunk())
+                FanoutChunk.objects.filter(pk=chunk.pk).update(next_attempt_at=timezone.now())
+            process_next_chunk()
+        self.assertGreater(delays[1], delays[0])
+        self.assertIsNone(process_next_chunk())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.failed_chunks), ('failed', 1))
+        self.assertEqual(job.chunks.get().error_message, 'down')
+
+
+class FanoutWorkerTest(TransactionTestCase):
+    """Test cases for run_notification_worker; worker threads use their own connections"""
+
+    def setUp(self):
+        """Set up recipients and a staff user"""
+        self.users = [
+            User.objects.create_user(username=f'recipient{index}', password='testpass123')
+            for index in range(5)
+        ]
+        self.staff = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+
+    @override_settings(NOTIFICATION_FANOUT_CHUNK_SIZE=2)
+    def test_worker_command_and_progress_api(self):
+        """Test queueing through the admin API, draining with the worker and reading progress"""
+        from io import StringIO
+        from django.core.management import call_command
+        from .models import FanoutJob
+        
+        self.client.force_login(self.staff)
+        response = self.client.post(
+            '/api/admin/jobs/',
+            {'title': 'Holiday', 'message': 'Closed', 'user_ids': [user.pk for user in self.users]},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['job']['id']
+        
+        out = StringIO()
+        call_command('run_notification_worker', '--once', '--workers', '3', stdout=out)
+        self.assertIn('3 chunk(s) processed', out.getvalue())
+        
+        job = self.client.get(f'/api/admin/jobs/{job_id}/').json()['job']
+        self.assertEqual((job['status'], job['created'], job['progress']), ('completed', 5, 100.0))
+        self.assertEqual(len(self.client.get('/api/admin/jobs/').json()['jobs']), 1)
+        
+        response = self.client.post('/api/admin/jobs/', {'title': 'Missing message'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        for payload in (
+            ['Holiday'],
+            {'title': 'Holiday', 'message': 'Closed', 'user_ids': 'all'},
+            {'title': 'Holiday', 'message': 'Closed', 'user_ids': [1, '2']},
+            {'title': 'Holiday', 'message': 'Closed', 'notification_type': ['system_announcement']},
+        ):
+            response = self.client.post('/api/admin/jobs/', payload, content_type='application/json')
+            self.assertEqual(response.status_code, 400, payload)
+        self.assertEqual(FanoutJob.objects.count(), 1)
+
+
+@override_settings(
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    NOTIFICATION_PUSH_COALESCE_SECONDS=0.2,
+)
+class NotificationConsumerTest(TransactionTestCase):
+    """Test cases for the notification WebSocket push (live.py)"""
+
+    def setUp(self):
+        """Set up two users"""
+        self.user = User.objects.create_user(username='reader', password='testpass123')
+        self.other = User.objects.create_user(username='other', password='testpass123')
+
+    def test_created_notifications_coalesced_into_one_frame(self):
+        """Test that single notifications and an announcement arrive as one frame after commit"""
+        from asgiref.sync import async_to_sync
+        from channels.db import database_sync_to_async
+        from channels.testing import WebsocketCommunicator
+        from django.db import transaction
+        from .consumers import NotificationConsumer
+        from .services import NotificationService
+
+        async def scenario():
+            communicator = WebsocketCommunicator(NotificationConsumer.as_asgi(), '/ws/notifications/')
+            communicator.scope['user'] = self.user
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+
+            def write():
+                NotificationService.create_notification(self.user, 'account_activity', 'Login', 'New login')
+                with transaction.atomic():
+                    NotificationService.create_notification(self.user, 'account_activity', 'Gone', 'Rolled back')
+                    transaction.set_rollback(True)
+                NotificationService.create_announcement(
+                    'Holiday', 'Campus closed', User.objects.all(), chunk_size=1
+                )
+            await database_sync_to_async(write)()
+
+            frame = await communicator.receive_json_from(timeout=5)
+            self.assertEqual(frame['type'], 'notifications_created')
+            self.assertEqual([item['title'] for item in frame['notifications']], ['Login', 'Holiday'])
+            holiday = await database_sync_to_async(
+                Notification.objects.get
+            )(recipient=self.user, title='Holiday')
+            self.assertEqual(frame['notifications'][1]['id'], holiday.id)
+            self.assertEqual(frame['unread_count'], 2)
+            self.assertTrue(await communicator.receive_nothing(timeout=0.3))
+
+            await database_sync_to_async(holiday.mark_as_read)()
+            self.assertEqual(await communicator.receive_json_from(timeout=5), {'type': 'unread_count', 'count': 1})
+
+            await communicator.send_json_to({'type': 'mark_all_as_read'})
+            self.assertEqual(
+                await communicator.receive_json_from(timeout=5),
+                {'type': 'bulk_result', 'action': 'mark_all_as_read', 'updated': 1}
+            )
+            self.assertEqual(await communicator.receive_json_from(timeout=5), {
+                'type': 'notifications_updated', 'status': 'read', 'notification_ids': None,
+                'updated': 1, 'unread_count': 0,
+            })
+            await communicator.send_json_to({'type': 'bulk_archive', 'notification_ids': 'x'})
+            self.assertEqual((await communicator.receive_json_from(timeout=5))['type'], 'error')
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_announcement_reaches_only_its_recipients(self):
+        """Test that an announcement chunk is pushed to the recipients' groups only"""
+        from asgiref.sync import async_to_sync
+        from channels.db import database_sync_to_async
+        from channels.testing import WebsocketCommunicator
+        from .consumers import NotificationConsumer
+        from .services import NotificationService
+
+        async def scenario():
+            sockets = {}
+            for user in (self.user, self.other):
+                communicator = WebsocketCommunicator(NotificationConsumer.as_asgi(), '/ws/notifications/')
+                communicator.scope['user'] = user
+                connected, _ = await communicator.connect()
+                self.assertTrue(connected)
+                sockets[user.pk] = communicator
+
+            await database_sync_to_async(NotificationService.create_announcement)(
+                'Deadline', 'Submit your form', User.objects.filter(pk=self.user.pk)
+            )
+            frame = await sockets[self.user.pk].receive_json_from(timeout=5)
+            self.assertEqual([item['title'] for item in frame['notifications']], ['Deadline'])
+            self.assertEqual(frame['notifications'][0]['recipient'], self.user.pk)
+            self.assertTrue(await sockets[self.other.pk].receive_nothing(timeout=0.5))
+            for communicator in sockets.values():
+                await communicator.disconnect()
+
+        async_to_sync(scenario)()
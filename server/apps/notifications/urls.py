@@ -13,4 +13,6 @@ urlpatterns = [
     path('admin/dashboard/', admin_views.notification_dashboard, name='notification-dashboard'),
     path('admin/delivery-logs/', admin_views.delivery_logs, name='delivery-logs'),
     path('admin/retry-delivery/', admin_views.retry_failed_delivery, name='retry-delivery'),
+    path('admin/jobs/', admin_views.fanout_jobs, name='fanout-jobs'),
+    path('admin/jobs/<int:job_id>/', admin_views.fanout_job_detail, name='fanout-job-detail'),
 ]
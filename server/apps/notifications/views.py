@@ -4,26 +4,51 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
 from django.utils import timezone
-from .models import Notification, NotificationPreference, NotificationPreferenceType, DeliveryLog
+from utils.fast_serializers import FastListMixin
+from utils.pagination import KeysetPagination
+from .counters import get_unread_count
+from .models import (
+    Notification, NotificationArchive, NotificationPreference, NotificationPreferenceType, DeliveryLog
+)
 from .serializers import (
-    NotificationSerializer, NotificationPreferenceSerializer,
-    NotificationPreferenceTypeSerializer, DeliveryLogSerializer
+    NotificationSerializer, NotificationArchiveSerializer, NotificationPreferenceSerializer,
+    NotificationPreferenceTypeSerializer, DeliveryLogSerializer,
+    notification_fast_serializer
 )
-
-
-class NotificationViewSet(viewsets.ModelViewSet):
-    """ViewSet for managing notifications"""
+from .services import NotificationService, valid_ids
+
+
+class NotificationViewSet(FastListMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for managing notifications
+    
+    List pagination: ?page=N (default) or keyset mode with ?pagination=cursor
+    (ordered by -created_at, -id; see utils.pagination.KeysetPagination)
+    
+    list is serialized from values() rows (see utils.fast_serializers)
+    
+    Every action reads the notification table only; notifications moved out
+    by the retention policy (see archive.py) are served by history
+    """
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'message']
     ordering_fields = ['created_at', 'status']
     ordering = ['-created_at']
+    fast_list_serializer = notification_fast_serializer
 
     def get_queryset(self):
         """Return notifications for the current user"""
         user = self.request.user
-        queryset = Notification.objects.filter(recipient=user)
+        return self.filter_by_params(Notification.objects.filter(recipient=user))
+
+    def filter_by_params(self, queryset):
+        """Apply the include_deleted, status, type and date range query parameters"""
+        # Exclude deleted notifications unless asked for
+        if not self.request.query_params.get('include_deleted'):
+            queryset = queryset.exclude(status='deleted')
 
         # Filter by status if provided
         status_param = self.request.query_params.get('status')
@@ -43,10 +68,6 @@ class NotificationViewSet(viewsets.ModelViewSet):
         if end_date:
             queryset = queryset.filter(created_at__lte=end_date)
 
-        # Exclude deleted notifications from main view
-        if not self.request.query_params.get('include_deleted'):
-            queryset = queryset.exclude(status='deleted')
-
         return queryset
 
     def get_object(self):
@@ -88,33 +109,63 @@ class NotificationViewSet(viewsets.ModelViewSet):
         notification.delete_notification()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        """
+        List the current user's archived notifications (moved out by the
+        retention policy), newest first; takes the list's filters, so
+        deleted ones are left out unless include_deleted is passed
+        """
+        queryset = self.filter_by_params(
+            NotificationArchive.objects.filter(recipient=request.user).order_by('-created_at', '-id')
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = NotificationArchiveSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = NotificationArchiveSerializer(queryset, many=True)
+        return Response(serializer.data)
+
     @action(detail=False, methods=['get'], permission_classes=[])
     def unread_count(self, request):
-        """Get count of unread notifications"""
+        """Get count of unread notifications (maintained counter, see counters.py)"""
         # If user is not authenticated, return 0
         if not request.user.is_authenticated:
             return Response({'unread_count': 0})
         
-        user = request.user
-        count = Notification.objects.filter(
-            recipient=user,
-            status='unread'
-        ).count()
-        return Response({'unread_count': count})
+        return Response({'unread_count': get_unread_count(request.user.pk)})
 
     @action(detail=False, methods=['patch'])
     def mark_all_as_read(self, request):
-        """Mark all notifications as read"""
-        user = request.user
-        notifications = Notification.objects.filter(
-            recipient=user,
-            status='unread'
-        )
-        count = notifications.count()
-        for notification in notifications:
-            notification.mark_as_read()
+        """Mark all notifications as read with one set-based UPDATE"""
+        count = NotificationService.bulk_update_status(request.user, 'read')
         return Response({'marked_as_read': count})
 
+    @action(detail=False, methods=['patch'])
+    def bulk_mark_as_read(self, request):
+        """Mark the notifications in notification_ids as read"""
+        return self.bulk_update(request, 'read', 'marked_as_read')
+
+    @action(detail=False, methods=['patch'])
+    def bulk_archive(self, request):
+        """Archive the notifications in notification_ids"""
+        return self.bulk_update(request, 'archived', 'archived')
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """Soft delete the notifications in notification_ids"""
+        return self.bulk_update(request, 'deleted', 'deleted')
+
+    def bulk_update(self, request, new_status, result_key):
+        notification_ids = request.data.get('notification_ids')
+        if not valid_ids(notification_ids):
+            return Response(
+                {'error': 'notification_ids must be a list of notification ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        count = NotificationService.bulk_update_status(request.user, new_status, notification_ids)
+        return Response({result_key: count})
+
 
 class NotificationPreferenceViewSet(viewsets.ViewSet):
     """ViewSet for managing notification preferences"""
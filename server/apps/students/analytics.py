@@ -0,0 +1,192 @@
+"""
+Student Distribution Analytics
+GPA histograms and attendance bands per department and semester
+
+Backs GET /api/students/distribution/. Each distribution is one grouped
+query over a typed column, bucketed in the database:
+- without a semester: the stored Student aggregates, latestCgpa and
+  averageAttendance (present/total over all subjects, as
+  calculate_average_attendance; 0.0 without attendance)
+- for a semester: SemesterResult.gpa and SemesterAttendance.percentage of
+  that semester's record rows (a semester with no classes counts as 0.0,
+  again as calculate_average_attendance)
+Every bucket is split by student status, so ?status= is applied to the
+cached result without another query.
+
+Results are cached per (department, semester) in a stale-while-revalidate
+cache (utils/swr_cache.py) and invalidated when a student of the
+department is saved or deleted (see signals.py).
+"""
+from django.db import transaction
+from django.db.models import Case, Count, FloatField, IntegerField, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Floor, Greatest, Least
+
+from utils.swr_cache import SWRCache
+from .models import SemesterAttendance, SemesterResult, Student
+
+
+SEMESTERS = range(1, 9)
+
+# GPA bins [min, max) of width 0.5 on the 4.00 scale; the last bin includes 4.00
+GPA_BIN_WIDTH = 0.5
+GPA_BINS = 8
+
+# Attendance bands [min, max) in percent; the last band includes 100
+ATTENDANCE_BANDS = [(0, 50), (50, 60), (60, 75), (75, 90), (90, 100)]
+
+distribution_cache = SWRCache('student-distributions', ttl=600, stale_ttl=3600)
+
+
+def _cache_key(department_id, semester):
+    return f'{department_id or "all"}:{semester or "all"}'
+
+
+def _gpa_bucket(field):
+    # Clamped at both ends: out-of-range values must not index past the bins
+    return Greatest(
+        Least(
+            Cast(Floor(Cast(field, FloatField()) / GPA_BIN_WIDTH), IntegerField()),
+            Value(GPA_BINS - 1),
+        ),
+        Value(0),
+    )
+
+
+def _attendance_band(field):
+    return Case(
+        *[When(**{f'{field}__lt': high}, then=Value(index)) for index, (_, high) in enumerate(ATTENDANCE_BANDS[:-1])],
+        default=Value(len(ATTENDANCE_BANDS) - 1),
+        output_field=IntegerField(),
+    )
+
+
+def _grouped(queryset, status_path, value, bucket):
+    """
+    Count and sum `value` per (status, bucket) in one query
+
+    Returns:
+        {(status, bucket index): (count, sum)}
+    """
+    rows = (
+        queryset.annotate(distribution_value=value)
+        .annotate(bucket=bucket)
+        .order_by()
+        .values(status_path, 'bucket')
+        .annotate(count=Count('pk'), total=Sum('distribution_value'))
+        .values_list(status_path, 'bucket', 'count', 'total')
+    )
+    return {(status, bucket): (count, float(total or 0)) for status, bucket, count, total in rows}
+
+
+def _distribution(grouped, edges):
+    """Shape grouped counts into bins with per-status counts and sums"""
+    bins = [{'min': low, 'max': high, 'byStatus': {}} for low, high in edges]
+    sums = {}
+    for (status, bucket), (count, total) in grouped.items():
+        bins[bucket]['byStatus'][status] = count
+        status_count, status_total = sums.get(status, (0, 0.0))
+        sums[status] = (status_count + count, status_total + total)
+    return {'bins': bins, 'sums': sums}
+
+
+def compute_distributions(department_id=None, semester=None):
+    """
+    Compute the GPA and attendance distributions of a department (or all)
+    and semester (or the students' overall aggregates)
+    """
+    gpa_edges = [(index * GPA_BIN_WIDTH, (index + 1) * GPA_BIN_WIDTH) for index in range(GPA_BINS)]
+    department = {'department_id': department_id} if department_id else {}
+
+    if semester is None:
+        students = Student.objects.filter(**department)
+        gpa = _grouped(
+            students.filter(latestCgpa__isnull=False), 'status',
+            Cast('latestCgpa', FloatField()), _gpa_bucket('latestCgpa'),
+        )
+        attendance = _grouped(
+            students, 'status',
+            Cast('averageAttendance', FloatField()), _attendance_band('averageAttendance'),
+        )
+    else:
+        gpa = _grouped(
+            SemesterResult.objects.filter(semester=semester, gpa__isnull=False, **department),
+            'student__status', Cast('gpa', FloatField()), _gpa_bucket('gpa'),
+        )
+        attendance = _grouped(
+            SemesterAttendance.objects.filter(semester=semester, **department)
+            .annotate(attendance=Coalesce('percentage', Value(0.0))),
+            'student__status', Cast('attendance', FloatField()), _attendance_band('attendance'),
+        )
+
+    return {
+        'gpa': _distribution(gpa, gpa_edges),
+        'attendance': _distribution(attendance, ATTENDANCE_BANDS),
+    }
+
+
+def _summarize(distribution, statuses):
+    """Apply a status filter and compute counts and mean for the response"""
+    def selected(status):
+        return statuses is None or status in statuses
+
+    count = 0
+    total = 0.0
+    for status, (status_count, status_total) in distribution['sums'].items():
+        if selected(status):
+            count += status_count
+            total += status_total
+    bins = []
+    for item in distribution['bins']:
+        by_status = {status: value for status, value in item['byStatus'].items() if selected(status)}
+        bins.append({
+            'min': item['min'],
+            'max': item['max'],
+            'count': sum(by_status.values()),
+            'byStatus': by_status,
+        })
+    return {
+        'count': count,
+        'mean': round(total / count, 2) if count else None,
+        'bins': bins,
+    }
+
+
+def get_distributions(department_id=None, semester=None, statuses=None):
+    """
+    Return the cached distributions, filtered to the given statuses
+
+    Args:
+        department_id: department UUID (str), or None for all departments
+        semester: 1-8, or None for the students' overall aggregates
+        statuses: set of Student statuses to include, or None for all
+    """
+    cached = distribution_cache.get_or_compute(
+        _cache_key(department_id, semester),
+        lambda: compute_distributions(department_id, semester),
+    )
+    return {
+        'department': department_id,
+        'semester': semester,
+        'statuses': sorted(statuses) if statuses is not None else None,
+        'gpa': _summarize(cached['gpa'], statuses),
+        'attendance': _summarize(cached['attendance'], statuses),
+    }
+
+
+def invalidate_distributions(department_ids):
+    """
+    Mark the cached distributions of the departments (and of all
+    departments) stale, now and again after commit
+    """
+    keys = [
+        _cache_key(department_id, semester)
+        for department_id in {*(str(pk) for pk in department_ids if pk), None}
+        for semester in (None, *SEMESTERS)
+    ]
+
+    def invalidate():
+        for key in keys:
+            distribution_cache.invalidate(key)
+
+    invalidate()
+    transaction.on_commit(invalidate)
@@ -0,0 +1,14 @@
+"""
+Students App Configuration
+"""
+from django.apps import AppConfig
+
+
+class StudentsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.students'
+    verbose_name = 'Students'
+
+    def ready(self):
+        """Register signals when app is ready"""
+        import apps.students.signals
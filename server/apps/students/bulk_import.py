@@ -0,0 +1,238 @@
+"""
+Bulk student import
+
+Backs POST /api/students/bulk_import/. The upload (CSV or NDJSON) is parsed
+one row at a time and handled in batches:
+- Each row runs through StudentImportSerializer, i.e. the same validators.py
+  checks as POST /api/students/, with departments resolved from a map
+  loaded once instead of one query per row
+- Roll/registration number uniqueness is checked with one query per batch
+  (and against earlier rows of the same file)
+- Valid rows are inserted with bulk_create; since that bypasses
+  Student.save, the academic aggregates and record tables are filled
+  explicitly, the dashboard counters are incremented, backdated enrollment
+  days are marked for the rollups and the cached dashboard statistics and
+  distributions are invalidated
+The whole import runs in one transaction. Invalid rows are skipped and
+reported with their row number.
+"""
+import csv
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from apps.dashboard.counters import count_created
+from apps.dashboard.rollups import mark_rows_dirty
+from apps.dashboard.stats import invalidate_dashboard_stats
+from apps.departments.models import Department
+from .analytics import invalidate_distributions
+from .models import Student
+from .records import sync_academic_records
+from .serializers import StudentImportSerializer
+
+
+IMPORT_BATCH_SIZE = 500
+
+# Columns holding JSON in CSV uploads
+JSON_COLUMNS = ('presentAddress', 'permanentAddress', 'semesterResults', 'semesterAttendance')
+
+UNIQUE_COLUMNS = ('currentRollNumber', 'currentRegistrationNumber')
+
+
+class ImportFileError(Exception):
+    """The upload cannot be read at all (as opposed to a single bad row)"""
+
+
+def detect_format(upload, requested=None):
+    """
+    Return 'csv' or 'ndjson' from the requested format, file name or content type
+    """
+    if requested:
+        requested = requested.lower()
+        if requested in ('csv', 'ndjson', 'jsonl'):
+            return 'csv' if requested == 'csv' else 'ndjson'
+        raise ImportFileError(f'Unsupported format: {requested}')
+
+    name = (upload.name or '').lower()
+    content_type = (getattr(upload, 'content_type', '') or '').lower()
+    if name.endswith('.csv') or 'csv' in content_type:
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'ndjson'
+    raise ImportFileError('Upload a .csv or .ndjson file (or pass fileFormat)')
+
+
+def _decoded_lines(upload):
+    """Yield the upload's lines as text without reading it into memory"""
+    for number, line in enumerate(upload, start=1):
+        try:
+            text = line.decode('utf-8-sig' if number == 1 else 'utf-8')
+        except UnicodeDecodeError:
+            raise ImportFileError(f'Line {number} is not valid UTF-8')
+        yield text
+
+
+def iter_csv_rows(upload):
+    """
+    Yield (row number, data, error) for each CSV record
+    Row numbers are spreadsheet line numbers (the header is row 1)
+    """
+    reader = csv.DictReader(_decoded_lines(upload))
+    try:
+        fieldnames = reader.fieldnames
+    except csv.Error as e:
+        raise ImportFileError(f'Row 1 is not valid CSV: {e}')
+    if not fieldnames:
+        raise ImportFileError('The CSV file has no header row')
+
+    row_number = 1
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as e:
+            raise ImportFileError(f'Row {row_number + 1} is not valid CSV: {e}')
+        row_number += 1
+        data = {}
+        error = None
+        for column, value in record.items():
+            if column is None:
+                error = {'non_field_errors': ['Row has more cells than the header']}
+                continue
+            value = (value or '').strip()
+            if value == '':
+                continue  # empty cell: use the field default (or fail if required)
+            if column in JSON_COLUMNS:
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    error = {column: ['Invalid JSON']}
+                    continue
+            data[column] = value
+        yield row_number, data, error
+
+
+def iter_ndjson_rows(upload):
+    """Yield (line number, data, error) for each non-blank NDJSON line"""
+    for line_number, line in enumerate(_decoded_lines(upload), start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield line_number, {}, {'non_field_errors': ['Invalid JSON']}
+            continue
+        if not isinstance(data, dict):
+            yield line_number, {}, {'non_field_errors': ['Each line must be a JSON object']}
+            continue
+        yield line_number, data, None
+
+
+class StudentImporter:
+    """
+    Validate and insert parsed rows in batches
+
+    Usage:
+        importer = StudentImporter(dry_run=False)
+        importer.run(iter_csv_rows(upload))
+        importer.report()
+    """
+
+    def __init__(self, dry_run=False, batch_size=IMPORT_BATCH_SIZE):
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.total = 0
+        self.created = 0
+        self.errors = []
+        self.seen = {column: set() for column in UNIQUE_COLUMNS}
+        # Keyed by lower-case id and upper-case code (see DepartmentLookupField)
+        departments = {}
+        for department in Department.objects.all():
+            departments[str(department.pk)] = department
+            departments[department.code.upper()] = department
+        self.serializer = StudentImportSerializer(context={'departments': departments})
+
+    def run(self, rows):
+        """Import all rows inside a single transaction"""
+        with transaction.atomic():
+            batch = []
+            for row_number, data, error in rows:
+                self.total += 1
+                if error:
+                    self.errors.append({'row': row_number, 'errors': error})
+                    continue
+                batch.append((row_number, data))
+                if len(batch) >= self.batch_size:
+                    self.import_batch(batch)
+                    batch = []
+            if batch:
+                self.import_batch(batch)
+
+    def import_batch(self, batch):
+        """Validate one batch and insert its valid rows"""
+        valid = []
+        for row_number, data in batch:
+            try:
+                validated = self.serializer.run_validation(data)
+            except ValidationError as exc:
+                self.errors.append({'row': row_number, 'errors': exc.detail})
+                continue
+            except (DjangoValidationError, TypeError, ValueError) as exc:
+                self.errors.append({'row': row_number, 'errors': {'non_field_errors': [str(exc)]}})
+                continue
+            valid.append((row_number, validated))
+
+        students = []
+        taken = self.existing_numbers(valid)
+        for row_number, validated in valid:
+            duplicates = {
+                column: ['A student with this value already exists']
+                for column in UNIQUE_COLUMNS
+                if validated[column] in taken[column] or validated[column] in self.seen[column]
+            }
+            if duplicates:
+                self.errors.append({'row': row_number, 'errors': duplicates})
+                continue
+            for column in UNIQUE_COLUMNS:
+                self.seen[column].add(validated[column])
+            student = Student(**validated)
+            student.refresh_academic_aggregates()
+            students.append(student)
+
+        if students and not self.dry_run:
+            # bulk_create skips Student.save, so the record tables are synced here
+            Student.objects.bulk_create(students)
+            sync_academic_records(students)
+            count_created(students)
+            mark_rows_dirty(students)
+            invalidate_dashboard_stats()
+            invalidate_distributions({student.department_id for student in students})
+        self.created += len(students)
+
+    def existing_numbers(self, valid):
+        """Return the batch's roll/registration numbers already in the database"""
+        taken = {column: set() for column in UNIQUE_COLUMNS}
+        if not valid:
+            return taken
+        condition = Q()
+        for column in UNIQUE_COLUMNS:
+            condition |= Q(**{f'{column}__in': [validated[column] for _, validated in valid]})
+        for values in Student.objects.filter(condition).values_list(*UNIQUE_COLUMNS):
+            for column, value in zip(UNIQUE_COLUMNS, values):
+                taken[column].add(value)
+        return taken
+
+    def report(self):
+        """Return the import summary with per-row errors"""
+        return {
+            'total': self.total,
+            'created': 0 if self.dry_run else self.created,
+            'valid': self.created,
+            'failed': len(self.errors),
+            'dryRun': self.dry_run,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+        }
@@ -0,0 +1,142 @@
+"""
+Student export
+
+Backs GET /api/students/export/. Only the requested columns are selected
+(values_list), rows are read through a server-side cursor in chunks
+(QuerySet.iterator) and written to a StreamingHttpResponse, so memory use
+does not grow with the number of students exported.
+
+Under ASGI, Django reads a synchronous response iterator to the end before
+sending anything, so streaming_content() hands it an async iterator that
+fetches one chunk per sync_to_async call instead.
+"""
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+from .models import Student
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Columns exported when ?fields= is not given (the list endpoint's columns)
+DEFAULT_EXPORT_FIELDS = [
+    'id', 'fullNameEnglish', 'currentRollNumber', 'currentRegistrationNumber',
+    'semester', 'department', 'status',
+]
+
+# Extra columns taken from the department
+RELATED_EXPORT_FIELDS = {
+    'departmentName': 'department__name',
+    'departmentCode': 'department__code',
+}
+
+
+def exportable_fields():
+    """Return every column name accepted by ?fields="""
+    names = [field.name for field in Student._meta.concrete_fields]
+    return names + list(RELATED_EXPORT_FIELDS)
+
+
+def parse_export_fields(value):
+    """
+    Parse a comma-separated ?fields= value
+
+    Returns:
+        list of column names
+
+    Raises:
+        ValueError: if a column is unknown
+    """
+    if not value:
+        return list(DEFAULT_EXPORT_FIELDS)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    allowed = set(exportable_fields())
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields or list(DEFAULT_EXPORT_FIELDS)
+
+
+def _plain(value):
+    """Convert a database value to a JSON/CSV friendly value"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+class _Echo:
+    """File-like object whose write() returns the written text (for csv.writer)"""
+
+    def write(self, value):
+        return value
+
+
+def iter_export_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one tuple of plain values per student, read in chunks"""
+    lookups = [RELATED_EXPORT_FIELDS.get(name, name) for name in fields]
+    rows = queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield [_plain(value) for value in row]
+
+
+def stream_csv(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield CSV text (header first), one chunk of rows per piece"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    buffer = []
+    for row in iter_export_rows(queryset, fields, chunk_size):
+        cells = [
+            json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+            for value in row
+        ]
+        buffer.append(writer.writerow(cells))
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_ndjson(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield NDJSON text, one JSON object per student"""
+    buffer = []
+    for row in iter_export_rows(queryset, fields, chunk_size):
+        buffer.append(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n')
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+async def _aiter_chunks(chunks):
+    """Async iterator over a chunk generator, one sync_to_async call per chunk"""
+    # Thread sensitive: every chunk is read on the thread owning the cursor
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await next_chunk(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        # Closes the server-side cursor when the client goes away early
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def streaming_content(request, chunks):
+    """
+    Return a chunk generator in the form the request's handler streams:
+    an async iterator under ASGI, the generator itself under WSGI
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        return _aiter_chunks(chunks)
+    return chunks
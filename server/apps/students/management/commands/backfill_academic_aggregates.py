@@ -0,0 +1,63 @@
+"""
+Management command to backfill the stored academic aggregates of students
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from apps.students.models import Student
+
+
+AGGREGATE_FIELDS = ['averageAttendance', 'latestCgpa', 'completedSemesters']
+
+
+class Command(BaseCommand):
+    help = 'Recompute averageAttendance, latestCgpa and completedSemesters from the student JSON'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of students loaded and updated per batch (default: 1000)'
+        )
+    
+    def handle(self, *args, **options):
+        """Walk the table in primary-key order, one transaction per chunk"""
+        chunk_size = max(1, options['chunk_size'])
+        queryset = Student.objects.only(
+            'id', 'semesterResults', 'semesterAttendance', 'updatedAt', *AGGREGATE_FIELDS
+        ).order_by('pk')
+        
+        processed = 0
+        updated = 0
+        last_pk = None
+        while True:
+            chunk = queryset
+            if last_pk is not None:
+                chunk = chunk.filter(pk__gt=last_pk)
+            students = list(chunk[:chunk_size])
+            if not students:
+                break
+            last_pk = students[-1].pk
+            
+            changed = []
+            now = timezone.now()
+            for student in students:
+                before = [getattr(student, name) for name in AGGREGATE_FIELDS]
+                student.refresh_academic_aggregates()
+                if [getattr(student, name) for name in AGGREGATE_FIELDS] != before:
+                    # Bump updatedAt so cached responses (ETag) are revalidated
+                    student.updatedAt = now
+                    changed.append(student)
+            
+            # bulk_update skips save(), so the record tables are not touched
+            with transaction.atomic():
+                Student.objects.bulk_update(changed, AGGREGATE_FIELDS + ['updatedAt'])
+            
+            processed += len(students)
+            updated += len(changed)
+            self.stdout.write(f'Processed {processed} students ({updated} updated)')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Done: {processed} students processed, {updated} updated')
+        )
@@ -0,0 +1,80 @@
+"""
+Management command to benchmark the fast list serializers against DRF
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from apps.applications.models import Application
+from apps.applications.serializers import ApplicationSerializer, application_fast_serializer
+from apps.documents.models import Document
+from apps.documents.serializers import DocumentSerializer, document_fast_serializer
+from apps.notifications.models import Notification
+from apps.notifications.serializers import NotificationSerializer, notification_fast_serializer
+from apps.students.models import Student
+from apps.students.serializers import StudentListSerializer, student_list_fast_serializer
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF and values()-based list serialization on existing rows (query + serialize + render)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100,
+            help='Rows per page (default: 100)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Timed runs per serializer (default: 20)'
+        )
+
+    def handle(self, *args, **options):
+        """Time both paths for each list endpoint and check the output matches"""
+        rows = options['rows']
+        repeat = max(1, options['repeat'])
+        targets = [
+            ('students', Student.objects.select_related('department').order_by('-createdAt'),
+             StudentListSerializer, student_list_fast_serializer),
+            ('applications', Application.objects.order_by('-submittedAt'),
+             ApplicationSerializer, application_fast_serializer),
+            ('documents', Document.objects.order_by('-uploadDate'),
+             DocumentSerializer, document_fast_serializer),
+            ('notifications', Notification.objects.order_by('-created_at'),
+             NotificationSerializer, notification_fast_serializer),
+        ]
+        renderer = JSONRenderer()
+
+        for name, queryset, serializer_class, fast_serializer in targets:
+            def drf_page():
+                return renderer.render(serializer_class(queryset[:rows], many=True).data)
+
+            def fast_page():
+                return renderer.render(fast_serializer.represent(fast_serializer.values(queryset)[:rows]))
+
+            count = len(queryset[:rows])
+            if not count:
+                self.stdout.write(f'{name}: no rows, skipped')
+                continue
+            if drf_page() != fast_page():
+                self.stdout.write(self.style.ERROR(f'{name}: output differs'))
+                continue
+
+            drf_ms = self.time(drf_page, repeat)
+            fast_ms = self.time(fast_page, repeat)
+            self.stdout.write(self.style.SUCCESS(
+                f'{name} ({count} rows): DRF {drf_ms:.2f} ms, fast {fast_ms:.2f} ms, '
+                f'{drf_ms / fast_ms:.1f}x faster, identical output'
+            ))
+
+    @staticmethod
+    def time(function, repeat):
+        """Return the mean wall time of function() in milliseconds"""
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        return (time.perf_counter() - start) * 1000 / repeat
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:09
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='student',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('fullNameEnglish'), name='gin_trgm_ops'), name='students_name_en_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('fullNameBangla'), name='gin_trgm_ops'), name='students_name_bn_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('currentRollNumber'), name='text_pattern_ops'), name='students_roll_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('currentRegistrationNumber'), name='text_pattern_ops'), name='students_reg_prefix_idx'),
+        ),
+    ]
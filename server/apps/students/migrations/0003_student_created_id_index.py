@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_student_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['-createdAt', '-id'], name='students_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,160 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:22
+
+from decimal import Decimal, InvalidOperation
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+BACKFILL_CHUNK_SIZE = 2000
+
+
+# Frozen copies of the apps.students.records helpers as of this migration,
+# so later changes to them do not change what a fresh migrate backfills
+
+def _to_decimal(value):
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+    # Columns are DECIMAL(4, 2)
+    if not number.is_finite() or abs(number) >= 100:
+        return None
+    return number.quantize(Decimal('0.01'))
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _semester_of(entry):
+    try:
+        return int(entry.get('semester'))
+    except (TypeError, ValueError):
+        return None
+
+
+def result_row_values(entries):
+    rows = []
+    for position, entry in enumerate(entries or []):
+        if not isinstance(entry, dict):
+            continue
+        rows.append({
+            'position': position,
+            'semester': _semester_of(entry),
+            'gpa': _to_decimal(entry.get('gpa')),
+            'cgpa': _to_decimal(entry.get('cgpa')),
+            'isReferred': bool(entry.get('referredSubjects') or []),
+            'entry': entry,
+        })
+    return rows
+
+
+def attendance_row_values(entries):
+    rows = []
+    for position, entry in enumerate(entries or []):
+        if not isinstance(entry, dict):
+            continue
+        present = 0
+        total = 0
+        for subject in entry.get('subjects') or []:
+            if isinstance(subject, dict):
+                present += _to_int(subject.get('present', 0))
+                total += _to_int(subject.get('total', 0))
+        rows.append({
+            'position': position,
+            'semester': _semester_of(entry),
+            'present': present,
+            'total': total,
+            'percentage': round((present / total) * 100, 2) if total else None,
+            'entry': entry,
+        })
+    return rows
+
+
+def backfill_semester_records(apps, schema_editor):
+    """Create result/attendance rows from the existing JSON, in chunks"""
+    Student = apps.get_model('students', 'Student')
+    SemesterResult = apps.get_model('students', 'SemesterResult')
+    SemesterAttendance = apps.get_model('students', 'SemesterAttendance')
+
+    students = Student.objects.only(
+        'id', 'department_id', 'semesterResults', 'semesterAttendance'
+    ).order_by('pk')
+    results, attendance = [], []
+    for student in students.iterator(chunk_size=BACKFILL_CHUNK_SIZE):
+        results.extend(
+            SemesterResult(student_id=student.pk, department_id=student.department_id, **values)
+            for values in result_row_values(student.semesterResults)
+        )
+        attendance.extend(
+            SemesterAttendance(student_id=student.pk, department_id=student.department_id, **values)
+            for values in attendance_row_values(student.semesterAttendance)
+        )
+        if len(results) >= BACKFILL_CHUNK_SIZE:
+            SemesterResult.objects.bulk_create(results)
+            results = []
+        if len(attendance) >= BACKFILL_CHUNK_SIZE:
+            SemesterAttendance.objects.bulk_create(attendance)
+            attendance = []
+    SemesterResult.objects.bulk_create(results)
+    SemesterAttendance.objects.bulk_create(attendance)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0001_initial'),
+        ('students', '0003_student_created_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SemesterResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField()),
+                ('semester', models.IntegerField(null=True)),
+                ('gpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('cgpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('isReferred', models.BooleanField(default=False)),
+                ('entry', models.JSONField()),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='departments.department')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='result_records', to='students.student')),
+            ],
+            options={
+                'verbose_name': 'Semester Result',
+                'verbose_name_plural': 'Semester Results',
+                'db_table': 'student_semester_results',
+                'ordering': ['student', 'position'],
+                'indexes': [models.Index(fields=['student', 'semester'], name='student_sem_student_4db7b2_idx'), models.Index(fields=['department', 'semester'], name='student_sem_departm_3601d4_idx'), models.Index(fields=['semester', 'gpa'], name='student_sem_semeste_90e38a_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SemesterAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField()),
+                ('semester', models.IntegerField(null=True)),
+                ('present', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('percentage', models.FloatField(blank=True, null=True)),
+                ('entry', models.JSONField()),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='departments.department')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_records', to='students.student')),
+            ],
+            options={
+                'verbose_name': 'Semester Attendance',
+                'verbose_name_plural': 'Semester Attendance',
+                'db_table': 'student_semester_attendance',
+                'ordering': ['student', 'position'],
+                'indexes': [models.Index(fields=['student', 'semester'], name='student_sem_student_9c46c9_idx'), models.Index(fields=['department', 'semester'], name='student_sem_departm_dcfdc4_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_semester_records, migrations.RunPython.noop),
+    ]
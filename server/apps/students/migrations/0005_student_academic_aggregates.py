@@ -0,0 +1,118 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:24
+
+from decimal import Decimal, InvalidOperation
+
+from django.db import migrations, models
+
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+# Frozen copies of apps.students.records.academic_aggregates and its helpers
+# as of this migration, so later changes to them do not change the backfill
+
+def _to_decimal(value):
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+    if not number.is_finite() or abs(number) >= 100:
+        return None
+    return number.quantize(Decimal('0.01'))
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _semester_of(entry):
+    try:
+        return int(entry.get('semester'))
+    except (TypeError, ValueError):
+        return None
+
+
+def academic_aggregates(results, attendance):
+    graded = []
+    completed = set()
+    for position, entry in enumerate(results or []):
+        if not isinstance(entry, dict):
+            continue
+        semester = _semester_of(entry)
+        cgpa = _to_decimal(entry.get('cgpa'))
+        if semester is not None and cgpa is not None:
+            graded.append((semester, position, cgpa))
+        if semester is not None and not (entry.get('referredSubjects') or []):
+            completed.add(semester)
+
+    present = 0
+    total = 0
+    for entry in attendance or []:
+        if not isinstance(entry, dict):
+            continue
+        for subject in entry.get('subjects') or []:
+            if isinstance(subject, dict):
+                present += _to_int(subject.get('present', 0))
+                total += _to_int(subject.get('total', 0))
+
+    return {
+        'averageAttendance': round((present / total) * 100, 2) if total else 0.0,
+        'latestCgpa': max(graded)[2] if graded else None,
+        'completedSemesters': len(completed),
+    }
+
+
+def backfill_aggregates(apps, schema_editor):
+    """Compute the new columns of the existing students, in chunks"""
+    Student = apps.get_model('students', 'Student')
+    fields = ['averageAttendance', 'latestCgpa', 'completedSemesters']
+
+    students = Student.objects.only('id', 'semesterResults', 'semesterAttendance').order_by('pk')
+    changed = []
+    for student in students.iterator(chunk_size=BACKFILL_CHUNK_SIZE):
+        for name, value in academic_aggregates(student.semesterResults, student.semesterAttendance).items():
+            setattr(student, name, value)
+        changed.append(student)
+        if len(changed) >= BACKFILL_CHUNK_SIZE:
+            Student.objects.bulk_update(changed, fields)
+            changed = []
+    Student.objects.bulk_update(changed, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_semester_record_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='averageAttendance',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='completedSemesters',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='latestCgpa',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=4, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['averageAttendance'], name='students_avg_attendance_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['latestCgpa'], name='students_latest_cgpa_idx'),
+        ),
+        migrations.RunPython(backfill_aggregates, migrations.RunPython.noop),
+    ]
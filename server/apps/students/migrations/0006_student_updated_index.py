@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0005_student_academic_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['updatedAt'], name='students_updated_idx'),
+        ),
+    ]
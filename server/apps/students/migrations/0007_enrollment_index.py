@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0006_student_updated_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['enrollmentDate'], name='students_enrollment_idx'),
+        ),
+    ]
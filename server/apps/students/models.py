@@ -1,7 +1,10 @@
 """
 Student Models
 """
-from django.db import models
+import copy
+from django.db import models, transaction
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 
@@ -81,6 +84,11 @@ class Student(models.Model):
     semesterResults = models.JSONField(default=list, blank=True)
     semesterAttendance = models.JSONField(default=list, blank=True)
     
+    # Academic aggregates, recomputed by save() when the JSON changes (see records.py)
+    averageAttendance = models.FloatField(default=0.0, editable=False)
+    latestCgpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True, editable=False)
+    completedSemesters = models.PositiveSmallIntegerField(default=0, editable=False)
+    
     # Discontinued Student Fields
     discontinuedReason = models.TextField(blank=True)
     lastSemester = models.IntegerField(null=True, blank=True)
@@ -102,11 +110,116 @@ class Student(models.Model):
             models.Index(fields=['currentRegistrationNumber']),
             models.Index(fields=['status']),
             models.Index(fields=['department', 'semester']),
+            # Default list ordering and keyset pagination
+            models.Index(fields=['-createdAt', '-id'], name='students_created_id_idx'),
+            # Collection validators (MAX(updatedAt), see utils.conditional)
+            models.Index(fields=['updatedAt'], name='students_updated_idx'),
+            models.Index(fields=['enrollmentDate'], name='students_enrollment_idx'),
+            # Filtering/ordering by academic aggregates
+            models.Index(fields=['averageAttendance'], name='students_avg_attendance_idx'),
+            models.Index(fields=['latestCgpa'], name='students_latest_cgpa_idx'),
+            # Search indexes (see apps/students/search.py)
+            GinIndex(
+                OpClass(Upper('fullNameEnglish'), name='gin_trgm_ops'),
+                name='students_name_en_trgm_idx'
+            ),
+            GinIndex(
+                OpClass(Upper('fullNameBangla'), name='gin_trgm_ops'),
+                name='students_name_bn_trgm_idx'
+            ),
+            models.Index(
+                OpClass(Upper('currentRollNumber'), name='text_pattern_ops'),
+                name='students_roll_prefix_idx'
+            ),
+            models.Index(
+                OpClass(Upper('currentRegistrationNumber'), name='text_pattern_ops'),
+                name='students_reg_prefix_idx'
+            ),
         ]
     
     def __str__(self):
         return f"{self.fullNameEnglish} ({self.currentRollNumber})"
     
+    # Fields mirrored into SemesterResult / SemesterAttendance (see records.py)
+    TRACKED_FIELDS = ('semesterResults', 'semesterAttendance', 'department_id')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded values of tracked fields to detect changes on save"""
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_fields()
+        return instance
+    
+    def _remember_tracked_fields(self):
+        # Deferred fields are not in __dict__ and are skipped (no extra query)
+        self._loaded_values = {
+            name: copy.deepcopy(self.__dict__[name])
+            for name in self.TRACKED_FIELDS
+            if name in self.__dict__
+        }
+    
+    def changed_tracked_fields(self, update_fields=None):
+        """
+        Return the tracked fields whose value differs from the loaded value
+        New students report every non-empty tracked field
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        changed = set()
+        for name in self.TRACKED_FIELDS:
+            if name not in self.__dict__:
+                continue
+            if update_fields is not None and name not in update_fields and name.replace('_id', '') not in update_fields:
+                continue
+            if self._state.adding or name not in loaded:
+                if self.__dict__[name]:
+                    changed.add(name)
+            elif self.__dict__[name] != loaded[name]:
+                changed.add(name)
+        return changed
+    
+    def refresh_academic_aggregates(self, results=True, attendance=True):
+        """
+        Recompute the stored aggregates from the JSON (does not save)
+        
+        Returns:
+            list of the aggregate field names that were set
+        """
+        from .records import academic_aggregates
+        
+        values = academic_aggregates(
+            results=self.semesterResults if results else None,
+            attendance=self.semesterAttendance if attendance else None,
+        )
+        for name, value in values.items():
+            setattr(self, name, value)
+        return list(values)
+    
+    def save(self, *args, **kwargs):
+        """
+        Save the student and keep the academic record tables and aggregates
+        in sync. Both are only recomputed when the JSON (or department) changed
+        """
+        from .records import sync_academic_records
+        
+        changed = self.changed_tracked_fields(kwargs.get('update_fields'))
+        results = 'semesterResults' in changed
+        attendance = 'semesterAttendance' in changed
+        if results or attendance:
+            aggregate_fields = self.refresh_academic_aggregates(results=results, attendance=attendance)
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | set(aggregate_fields)
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if results or attendance:
+                sync_academic_records([self], results=results, attendance=attendance)
+            if 'department_id' in changed:
+                for model in (SemesterResult, SemesterAttendance):
+                    model.objects.filter(student_id=self.pk).exclude(
+                        department_id=self.department_id
+                    ).update(department_id=self.department_id)
+        self._remember_tracked_fields()
+    
     def has_completed_eighth_semester(self):
         """Check if student has completed all 8 semesters"""
         if not self.semesterResults:
@@ -123,3 +236,62 @@ class Student(models.Model):
                 return False
         
         return True
+
+
+class SemesterResult(models.Model):
+    """
+    One semesterResults JSON entry of a student, with typed columns
+    Maintained by Student.save (see records.py); do not edit directly
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='result_records')
+    # Denormalized from student.department for per-department queries
+    department = models.ForeignKey('departments.Department', on_delete=models.PROTECT, related_name='+')
+    position = models.PositiveSmallIntegerField()  # index in the JSON list
+    semester = models.IntegerField(null=True)  # null if the entry's semester is not a number
+    gpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    cgpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    isReferred = models.BooleanField(default=False)
+    entry = models.JSONField()  # original JSON entry, returned as-is by the API
+    
+    class Meta:
+        db_table = 'student_semester_results'
+        ordering = ['student', 'position']
+        verbose_name = 'Semester Result'
+        verbose_name_plural = 'Semester Results'
+        indexes = [
+            models.Index(fields=['student', 'semester']),
+            models.Index(fields=['department', 'semester']),
+            models.Index(fields=['semester', 'gpa']),
+        ]
+    
+    def __str__(self):
+        return f"{self.student_id} - Semester {self.semester}"
+
+
+class SemesterAttendance(models.Model):
+    """
+    One semesterAttendance JSON entry of a student, with typed columns
+    Maintained by Student.save (see records.py); do not edit directly
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='attendance_records')
+    # Denormalized from student.department for per-department queries
+    department = models.ForeignKey('departments.Department', on_delete=models.PROTECT, related_name='+')
+    position = models.PositiveSmallIntegerField()  # index in the JSON list
+    semester = models.IntegerField(null=True)  # null if the entry's semester is not a number
+    present = models.IntegerField(default=0)  # summed over subjects
+    total = models.IntegerField(default=0)  # summed over subjects
+    percentage = models.FloatField(null=True, blank=True)  # null when total is 0
+    entry = models.JSONField()  # original JSON entry, returned as-is by the API
+    
+    class Meta:
+        db_table = 'student_semester_attendance'
+        ordering = ['student', 'position']
+        verbose_name = 'Semester Attendance'
+        verbose_name_plural = 'Semester Attendance'
+        indexes = [
+            models.Index(fields=['student', 'semester']),
+            models.Index(fields=['department', 'semester']),
+        ]
+    
+    def __str__(self):
+        return f"{self.student_id} - Semester {self.semester}"
@@ -0,0 +1,166 @@
+"""
+Academic record tables
+
+Student.semesterResults and Student.semesterAttendance remain the JSON the
+API accepts and returns. Every change to them is mirrored into the
+SemesterResult and SemesterAttendance tables, one row per JSON entry, with
+typed, indexed columns for per-semester and per-department queries.
+"""
+from decimal import Decimal, InvalidOperation
+
+
+def _to_decimal(value):
+    """Convert a JSON number (or numeric string) to Decimal, None if invalid"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+    # Columns are DECIMAL(4, 2)
+    if not number.is_finite() or abs(number) >= 100:
+        return None
+    return number.quantize(Decimal('0.01'))
+
+
+def _to_int(value):
+    """Convert a JSON number to int, 0 if invalid"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _semester_of(entry):
+    """Return the entry's semester as int, None if missing or invalid"""
+    try:
+        return int(entry.get('semester'))
+    except (TypeError, ValueError):
+        return None
+
+
+def result_row_values(entries):
+    """
+    Build SemesterResult column values from semesterResults JSON
+
+    Args:
+        entries: semesterResults list
+
+    Returns:
+        list of dicts (without student/department)
+    """
+    rows = []
+    for position, entry in enumerate(entries or []):
+        if not isinstance(entry, dict):
+            continue
+        referred = entry.get('referredSubjects') or []
+        rows.append({
+            'position': position,
+            'semester': _semester_of(entry),
+            'gpa': _to_decimal(entry.get('gpa')),
+            'cgpa': _to_decimal(entry.get('cgpa')),
+            'isReferred': bool(referred),
+            'entry': entry,
+        })
+    return rows
+
+
+def attendance_row_values(entries):
+    """
+    Build SemesterAttendance column values from semesterAttendance JSON
+    present/total are summed over subjects, the same way
+    calculate_average_attendance counts them
+
+    Args:
+        entries: semesterAttendance list
+
+    Returns:
+        list of dicts (without student/department)
+    """
+    rows = []
+    for position, entry in enumerate(entries or []):
+        if not isinstance(entry, dict):
+            continue
+        present = 0
+        total = 0
+        for subject in entry.get('subjects') or []:
+            if isinstance(subject, dict):
+                present += _to_int(subject.get('present', 0))
+                total += _to_int(subject.get('total', 0))
+        percentage = round((present / total) * 100, 2) if total else None
+        rows.append({
+            'position': position,
+            'semester': _semester_of(entry),
+            'present': present,
+            'total': total,
+            'percentage': percentage,
+            'entry': entry,
+        })
+    return rows
+
+
+def sync_academic_records(students, results=True, attendance=True):
+    """
+    Replace the result/attendance rows of the given students with rows built
+    from their current JSON, using one DELETE and one bulk INSERT per table
+
+    Args:
+        students: iterable of saved Student instances
+        results: sync SemesterResult rows
+        attendance: sync SemesterAttendance rows
+    """
+    from .models import SemesterResult, SemesterAttendance
+
+    students = list(students)
+    if not students:
+        return
+    student_ids = [student.pk for student in students]
+
+    if results:
+        SemesterResult.objects.filter(student_id__in=student_ids).delete()
+        SemesterResult.objects.bulk_create([
+            SemesterResult(student_id=student.pk, department_id=student.department_id, **values)
+            for student in students
+            for values in result_row_values(student.semesterResults)
+        ])
+
+    if attendance:
+        SemesterAttendance.objects.filter(student_id__in=student_ids).delete()
+        SemesterAttendance.objects.bulk_create([
+            SemesterAttendance(student_id=student.pk, department_id=student.department_id, **values)
+            for student in students
+            for values in attendance_row_values(student.semesterAttendance)
+        ])
+
+
+def academic_aggregates(results=None, attendance=None):
+    """
+    Compute the stored Student aggregates from the JSON
+
+    Pass the semesterResults and/or semesterAttendance list; only the
+    aggregates of the lists given are returned.
+    - averageAttendance: present/total over all subjects (as
+      calculate_average_attendance), 0.0 without attendance
+    - latestCgpa: CGPA of the highest semester that has one, None if none
+    - completedSemesters: distinct semesters with a result and no
+      referred subjects
+
+    Returns:
+        dict of Student field name -> value
+    """
+    values = {}
+    if results is not None:
+        rows = result_row_values(results)
+        graded = [row for row in rows if row['semester'] is not None and row['cgpa'] is not None]
+        latest = max(graded, key=lambda row: (row['semester'], row['position']), default=None)
+        values['latestCgpa'] = latest['cgpa'] if latest else None
+        values['completedSemesters'] = len({
+            row['semester'] for row in rows
+            if row['semester'] is not None and not row['isReferred']
+        })
+    if attendance is not None:
+        rows = attendance_row_values(attendance)
+        present = sum(row['present'] for row in rows)
+        total = sum(row['total'] for row in rows)
+        values['averageAttendance'] = round((present / total) * 100, 2) if total else 0.0
+    return values
@@ -0,0 +1,60 @@
+"""
+Student search helpers
+
+Backs GET /api/students/search/ with indexed lookups:
+- Names (English and Bangla) are matched with ILIKE '%q%', served by the
+  pg_trgm GIN indexes on UPPER(name)
+- Roll and registration numbers are matched by prefix, served by the
+  text_pattern_ops indexes on UPPER(number)
+Matches are ranked so exact and prefix number hits come first, followed by
+names ordered by trigram word similarity.
+"""
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+
+
+# Rank boosts applied on top of name similarity (which lies in 0..1)
+EXACT_NUMBER_BOOST = 3.0
+PREFIX_NUMBER_BOOST = 2.0
+
+
+def search_students(queryset, query):
+    """
+    Filter and rank a Student queryset for a free-text query
+
+    Args:
+        queryset: Student queryset to search within
+        query: Search text (already stripped, non-empty)
+
+    Returns:
+        QuerySet annotated with `rank`, ordered by relevance
+    """
+    matches = queryset.filter(
+        Q(fullNameEnglish__icontains=query) |
+        Q(fullNameBangla__icontains=query) |
+        Q(currentRollNumber__istartswith=query) |
+        Q(currentRegistrationNumber__istartswith=query)
+    )
+
+    number_boost = Case(
+        When(
+            Q(currentRollNumber__iexact=query) | Q(currentRegistrationNumber__iexact=query),
+            then=Value(EXACT_NUMBER_BOOST)
+        ),
+        When(
+            Q(currentRollNumber__istartswith=query) | Q(currentRegistrationNumber__istartswith=query),
+            then=Value(PREFIX_NUMBER_BOOST)
+        ),
+        default=Value(0.0),
+        output_field=FloatField()
+    )
+    name_similarity = Greatest(
+        TrigramWordSimilarity(query, 'fullNameEnglish'),
+        TrigramWordSimilarity(query, 'fullNameBangla'),
+        output_field=FloatField()
+    )
+
+    return matches.annotate(
+        rank=number_boost + name_similarity
+    ).order_by('-rank', 'fullNameEnglish', 'id')
@@ -2,6 +2,8 @@
 Student Serializers
 """
 from rest_framework import serializers
+from utils.fast_serializers import FastSerializer
+from utils.fieldsets import SparseFieldsetMixin
 from .models import Student
 from .validators import (
     validate_mobile_number,
@@ -11,7 +13,7 @@ from .validators import (
     validate_semester_results_structure,
     validate_semester_attendance_structure
 )
-from apps.departments.serializers import DepartmentSerializer
+from apps.departments.serializers import DepartmentSerializer, department_student_count
 
 
 class StudentListSerializer(serializers.ModelSerializer):
@@ -34,9 +36,17 @@ class StudentListSerializer(serializers.ModelSerializer):
         ]
 
 
-class StudentDetailSerializer(serializers.ModelSerializer):
+# values()-based equivalent of StudentListSerializer for the list endpoint
+student_list_fast_serializer = FastSerializer(
+    StudentListSerializer,
+    computed={'department.studentCount': (['department__id'], department_student_count)}
+)
+
+
+class StudentDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Complete serializer with all fields and nested data
+    Supports ?fields= / ?expand= (see utils.fieldsets)
     """
     department = DepartmentSerializer(read_only=True)
     
@@ -242,3 +252,36 @@ class StudentUpdateSerializer(serializers.ModelSerializer):
         if value:
             return validate_semester_attendance_structure(value)
         return value
+
+
+class DepartmentLookupField(serializers.Field):
+    """
+    Department referenced by id or code, resolved from the
+    context['departments'] map instead of a query per value
+    """
+    
+    def to_internal_value(self, data):
+        departments = self.context['departments']
+        key = str(data).strip()
+        department = departments.get(key.lower()) or departments.get(key.upper())
+        if department is None:
+            raise serializers.ValidationError(f'Unknown department "{data}"')
+        return department
+    
+    def to_representation(self, value):
+        return str(value.pk)
+
+
+class StudentImportSerializer(StudentCreateSerializer):
+    """
+    Row serializer for bulk import (see bulk_import.py)
+    Same validation as StudentCreateSerializer, except that uniqueness of the
+    roll/registration numbers is checked per batch by the importer
+    """
+    department = DepartmentLookupField()
+    
+    class Meta(StudentCreateSerializer.Meta):
+        extra_kwargs = {
+            'currentRollNumber': {'validators': []},
+            'currentRegistrationNumber': {'validators': []},
+        }
@@ -0,0 +1,22 @@
+"""
+Signals invalidating the cached student distributions
+"""
+
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from .analytics import invalidate_distributions
+from .models import Student
+
+
+@receiver(post_save, sender=Student)
+@receiver(pre_delete, sender=Student)
+def student_changed(sender, instance, **kwargs):
+    """
+    Signal handler dropping the cached distributions of the student's
+    department, and of its previous department when it moved
+    Deletion is handled before the row is gone, so a deferred department
+    can still be loaded
+    """
+    loaded = getattr(instance, '_loaded_values', {})
+    invalidate_distributions({instance.department_id, loaded.get('department_id')})
@@ -393,7 +393,7 @@ class SearchResultConsistencyPropertyTest(APITestCase):
         
         # All results should contain the search term (case-insensitive)
         search_lower = search_term.lower()
-        for student in response.data:
+        for student in response.data['results']:
             contains_in_name = search_lower in student['fullNameEnglish'].lower()
             contains_in_roll = search_lower in student['currentRollNumber'].lower()
             contains_in_reg = search_lower in student.get('currentRegistrationNumber', '').lower()
@@ -982,3 +982,948 @@ class RequiredFieldValidationPropertyTest(APITestCase):
         for field in fields_to_remove:
             self.assertIn(field, response.data,
                          f"Expected error for missing field '{field}' in response")
+
+
+def create_test_student(department, suffix, **overrides):
+    """
+    Create a valid student for API tests
+    suffix keeps roll and registration numbers unique
+    """
+    address = {
+        'division': 'Dhaka', 'district': 'Dhaka', 'subDistrict': 'Mirpur',
+        'policeStation': 'Mirpur', 'postOffice': 'Mirpur', 'municipality': 'Dhaka',
+        'village': 'Mirpur', 'ward': '1'
+    }
+    data = {
+        'fullNameBangla': 'বাংলা নাম',
+        'fullNameEnglish': f'Student {suffix}',
+        'fatherName': 'Father Name',
+        'fatherNID': '1234567890123456',
+        'motherName': 'Mother Name',
+        'motherNID': '1234567890123456',
+        'dateOfBirth': '2000-01-01',
+        'birthCertificateNo': f'BC{suffix}',
+        'gender': 'Male',
+        'mobileStudent': '01712345678',
+        'guardianMobile': '01712345678',
+        'emergencyContact': 'Emergency',
+        'presentAddress': address,
+        'permanentAddress': address,
+        'highestExam': 'SSC',
+        'board': 'Dhaka',
+        'group': 'Science',
+        'rollNumber': f'R{suffix}',
+        'registrationNumber': f'REG{suffix}',
+        'passingYear': 2020,
+        'gpa': 3.5,
+        'currentRollNumber': f'CR{suffix}',
+        'currentRegistrationNumber': f'CREG{suffix}',
+        'semester': 1,
+        'department': department,
+        'session': '2020-2021',
+        'shift': 'Morning',
+        'currentGroup': 'A',
+        'enrollmentDate': '2020-01-01',
+    }
+    data.update(overrides)
+    return Student.objects.create(**data)
+
+
+class StudentSearchTest(APITestCase):
+    """
+    Tests for ranked, paginated student search
+    GET /api/students/search/?q={query}
+    """
+    
+    def setUp(self):
+        """Create a department and a few searchable students"""
+        self.department = Department.objects.create(
+            name='Computer Science',
+            code='CSE'
+        )
+        self.exact = create_test_student(
+            self.department, '1001', fullNameEnglish='Karim Hossain', currentRollNumber='540001'
+        )
+        self.prefix = create_test_student(
+            self.department, '1002', fullNameEnglish='Rahim Ahmed', currentRollNumber='5400012'
+        )
+        self.bangla = create_test_student(
+            self.department, '1003', fullNameEnglish='Salma Khatun', fullNameBangla='সালমা খাতুন'
+        )
+    
+    def test_search_requires_query(self):
+        """Test that an empty query is rejected"""
+        response = self.client.get('/api/students/search/?q=%20')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_search_is_paginated(self):
+        """Test that search returns a paginated envelope"""
+        response = self.client.get('/api/students/search/?q=Student')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('count', response.data)
+        self.assertIn('results', response.data)
+    
+    def test_roll_number_matches_by_prefix(self):
+        """Test that roll numbers match by prefix only"""
+        response = self.client.get('/api/students/search/?q=40001')
+        self.assertEqual(response.data['count'], 0)
+        
+        response = self.client.get('/api/students/search/?q=5400')
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(set(ids), {str(self.exact.id), str(self.prefix.id)})
+    
+    def test_exact_roll_number_ranks_first(self):
+        """Test that an exact roll number match outranks a prefix match"""
+        response = self.client.get('/api/students/search/?q=540001')
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [str(self.exact.id), str(self.prefix.id)])
+    
+    def test_name_search_is_case_insensitive(self):
+        """Test that English names match case-insensitively anywhere in the name"""
+        response = self.client.get('/api/students/search/?q=hossa')
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [str(self.exact.id)])
+    
+    def test_bangla_name_search(self):
+        """Test that Bangla names are searchable"""
+        response = self.client.get('/api/students/search/?q=খাতুন')
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [str(self.bangla.id)])
+
+
+class StudentKeysetPaginationTest(APITestCase):
+    """
+    Tests for opt-in keyset pagination on GET /api/students/
+    """
+    
+    def setUp(self):
+        """Create students, several sharing the same createdAt"""
+        from django.utils import timezone
+        self.department = Department.objects.create(
+            name='Computer Science',
+            code='CSE'
+        )
+        for i in range(7):
+            create_test_student(self.department, f'20{i}')
+        # Force ties on createdAt so the id tiebreaker is exercised
+        Student.objects.filter(currentRollNumber__in=['CR202', 'CR203', 'CR204']).update(
+            createdAt=timezone.now()
+        )
+        self.expected = [
+            str(pk) for pk in Student.objects.order_by('-createdAt', '-id').values_list('id', flat=True)
+        ]
+    
+    def collect(self, url):
+        """Follow next links and return (ids, pages)"""
+        ids, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            pages.append(response.data)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        return ids, pages
+    
+    def test_default_mode_is_page_number(self):
+        """Test that plain list requests keep the page-number envelope"""
+        response = self.client.get('/api/students/')
+        self.assertEqual(response.data['count'], 7)
+    
+    def test_cursor_walk_returns_every_row_once(self):
+        """Test that following next links visits all rows in order without gaps"""
+        from unittest import mock
+        with mock.patch('utils.pagination.KeysetPagination.page_size', 3):
+            ids, pages = self.collect('/api/students/?pagination=cursor')
+        self.assertEqual(ids, self.expected)
+        self.assertEqual([len(page['results']) for page in pages], [3, 3, 1])
+        self.assertIsNone(pages[0]['previous'])
+    
+    def test_previous_link_returns_prior_page(self):
+        """Test that the previous link on page two returns page one"""
+        from unittest import mock
+        with mock.patch('utils.pagination.KeysetPagination.page_size', 3):
+            first = self.client.get('/api/students/?pagination=cursor').data
+            second = self.client.get(first['next']).data
+            back = self.client.get(second['previous']).data
+        self.assertEqual(
+            [item['id'] for item in back['results']],
+            [item['id'] for item in first['results']]
+        )
+    
+    def test_approximate_total(self):
+        """Test that ?total=approx adds a planner estimate"""
+        response = self.client.get('/api/students/?pagination=cursor&total=approx')
+        self.assertIsInstance(response.data['approximate_count'], int)
+    
+    def test_cursor_walk_follows_ordering_param(self):
+        """Test that cursor mode orders by the client's ?ordering= with the id tiebreaker"""
+        from unittest import mock
+        Student.objects.filter(currentRollNumber__in=['CR201', 'CR205']).update(semester=5)
+        expected = [str(pk) for pk in Student.objects.order_by('-semester', '-id').values_list('id', flat=True)]
+        with mock.patch('utils.pagination.KeysetPagination.page_size', 3):
+            ids, pages = self.collect('/api/students/?pagination=cursor&ordering=-semester')
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(pages), 3)
+    
+    def test_cursor_rejects_nullable_ordering(self):
+        """Test that ordering by a nullable column is refused in cursor mode"""
+        response = self.client.get('/api/students/?pagination=cursor&ordering=latestCgpa')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/students/?ordering=latestCgpa')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor returns 404"""
+        response = self.client.get('/api/students/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class StudentListQueryCountTest(APITestCase):
+    """
+    Regression tests: student listings must not issue per-row queries
+    for the nested department or its studentCount
+    """
+    
+    def setUp(self):
+        """Create two departments with students spread across them"""
+        from apps.alumni.models import Alumni
+        self.cse = Department.objects.create(name='Computer Science', code='CSE')
+        self.eee = Department.objects.create(name='Electrical', code='EEE')
+        for i in range(12):
+            student = create_test_student(self.cse if i % 2 else self.eee, f'30{i:02d}')
+            if i < 6:
+                Alumni.objects.create(student=student, graduationYear=2024)
+    
+    def test_student_list_query_count(self):
+        """GET /api/students/: ETag aggregate and counters, page COUNT, page SELECT (joined department), one grouped count"""
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/students/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = {item['department']['code']: item['department']['studentCount']
+                  for item in response.data['results']}
+        self.assertEqual(counts, {'CSE': 6, 'EEE': 6})
+    
+    def test_department_students_query_count(self):
+        """GET /api/departments/{id}/students/: department, students, one grouped count"""
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/departments/{self.cse.id}/students/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual(response.data['department']['studentCount'], 6)
+    
+    def test_alumni_list_query_count(self):
+        """GET /api/alumni/: ETag aggregate and counters, page COUNT, page SELECT (joined student and department), one grouped count"""
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/alumni/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 6)
+
+
+class StudentAcademicRecordsTest(APITestCase):
+    """
+    Tests for the SemesterResult / SemesterAttendance tables mirrored from
+    the student JSON, and the endpoints served from them
+    """
+    
+    def setUp(self):
+        """Create a student with results and attendance"""
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.other_department = Department.objects.create(name='Electrical', code='EEE')
+        self.results = [
+            {'semester': 1, 'gpa': 3.25, 'cgpa': 3.25},
+            {'semester': 2, 'referredSubjects': ['Mathematics']},
+        ]
+        self.attendance = [
+            {'semester': 1, 'subjects': [
+                {'name': 'Physics', 'present': 18, 'total': 20},
+                {'name': 'Chemistry', 'present': 9, 'total': 20},
+            ], 'averageAttendance': 67.5},
+            {'semester': 2, 'subjects': [{'name': 'Mathematics', 'present': 10, 'total': 10}]},
+        ]
+        self.student = create_test_student(
+            self.department, '4001',
+            semesterResults=self.results,
+            semesterAttendance=self.attendance
+        )
+    
+    def test_rows_created_from_json(self):
+        """Test that each JSON entry becomes a typed row"""
+        from decimal import Decimal
+        from .models import SemesterResult, SemesterAttendance
+        results = list(SemesterResult.objects.filter(student=self.student).order_by('position'))
+        self.assertEqual([r.semester for r in results], [1, 2])
+        self.assertEqual(results[0].gpa, Decimal('3.25'))
+        self.assertFalse(results[0].isReferred)
+        self.assertIsNone(results[1].gpa)
+        self.assertTrue(results[1].isReferred)
+        
+        attendance = SemesterAttendance.objects.get(student=self.student, semester=1)
+        self.assertEqual((attendance.present, attendance.total, attendance.percentage), (27, 40, 67.5))
+        self.assertEqual(attendance.department, self.department)
+    
+    def test_endpoints_keep_response_shape(self):
+        """Test that the record endpoints return the original JSON entries"""
+        from .validators import calculate_average_attendance
+        response = self.client.get(f'/api/students/{self.student.id}/semester_results/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['semesterResults'], self.results)
+        self.assertEqual(response.data['studentName'], self.student.fullNameEnglish)
+        
+        response = self.client.get(f'/api/students/{self.student.id}/semester_attendance/')
+        self.assertEqual(response.data['semesterAttendance'], self.attendance)
+        self.assertEqual(
+            response.data['averageAttendance'],
+            calculate_average_attendance(self.attendance)
+        )
+    
+    def test_endpoints_404_on_malformed_id(self):
+        """Test that a malformed or unknown id is answered 404 by the record endpoints"""
+        import uuid
+        for endpoint in ('semester_results', 'semester_attendance'):
+            for pk in ('not-a-uuid', uuid.uuid4()):
+                response = self.client.get(f'/api/students/{pk}/{endpoint}/')
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_json_update_replaces_rows(self):
+        """Test that changing the JSON through the API rewrites the rows"""
+        from .models import SemesterResult
+        new_results = [{'semester': 3, 'gpa': 2.1, 'cgpa': 2.9}]
+        response = self.client.patch(
+            f'/api/students/{self.student.id}/',
+            {'semesterResults': new_results},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(SemesterResult.objects.filter(student=self.student).values_list('semester', flat=True)),
+            [3]
+        )
+    
+    def test_unrelated_save_keeps_rows(self):
+        """Test that saves which do not touch the JSON leave the rows alone"""
+        from .models import SemesterResult
+        before = list(SemesterResult.objects.filter(student=self.student).values_list('pk', flat=True))
+        student = Student.objects.get(pk=self.student.pk)
+        student.fullNameEnglish = 'Renamed Student'
+        student.save()
+        after = list(SemesterResult.objects.filter(student=self.student).values_list('pk', flat=True))
+        self.assertEqual(before, after)
+    
+    def test_department_change_moves_rows(self):
+        """Test that the denormalized department follows the student"""
+        from .models import SemesterResult, SemesterAttendance
+        student = Student.objects.get(pk=self.student.pk)
+        student.department = self.other_department
+        student.save()
+        self.assertFalse(SemesterResult.objects.filter(department=self.department).exists())
+        self.assertFalse(SemesterAttendance.objects.filter(department=self.department).exists())
+
+
+class StudentAcademicAggregatesTest(APITestCase):
+    """
+    Tests for the stored averageAttendance / latestCgpa / completedSemesters
+    columns and the filters and orderings built on them
+    """
+    
+    def setUp(self):
+        """Create students with different academic records"""
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.strong = create_test_student(
+            self.department, '5001',
+            semesterResults=[
+                {'semester': 1, 'gpa': 3.5, 'cgpa': 3.5},
+                {'semester': 2, 'gpa': 3.9, 'cgpa': 3.7},
+            ],
+            semesterAttendance=[
+                {'semester': 1, 'subjects': [{'name': 'Physics', 'present': 19, 'total': 20}]},
+            ]
+        )
+        self.weak = create_test_student(
+            self.department, '5002',
+            semesterResults=[
+                {'semester': 1, 'gpa': 2.5, 'cgpa': 2.5},
+                {'semester': 2, 'referredSubjects': ['Mathematics']},
+            ],
+            semesterAttendance=[
+                {'semester': 1, 'subjects': [{'name': 'Physics', 'present': 10, 'total': 20}]},
+            ]
+        )
+        self.empty = create_test_student(self.department, '5003')
+    
+    def test_aggregates_computed_on_create(self):
+        """Test that aggregates are stored when the student is created"""
+        from decimal import Decimal
+        strong = Student.objects.get(pk=self.strong.pk)
+        self.assertEqual(strong.averageAttendance, 95.0)
+        self.assertEqual(strong.latestCgpa, Decimal('3.70'))
+        self.assertEqual(strong.completedSemesters, 2)
+        
+        weak = Student.objects.get(pk=self.weak.pk)
+        self.assertEqual(weak.latestCgpa, Decimal('2.50'))
+        self.assertEqual(weak.completedSemesters, 1)
+        
+        empty = Student.objects.get(pk=self.empty.pk)
+        self.assertEqual((empty.averageAttendance, empty.latestCgpa, empty.completedSemesters), (0.0, None, 0))
+    
+    def test_aggregates_follow_json_updates(self):
+        """Test that changing the JSON through the API recomputes the aggregates"""
+        response = self.client.patch(
+            f'/api/students/{self.empty.id}/',
+            {'semesterAttendance': [
+                {'semester': 1, 'subjects': [{'name': 'Physics', 'present': 3, 'total': 4}]},
+            ]},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['averageAttendance'], 75.0)
+        
+        response = self.client.get(f'/api/students/{self.empty.id}/semester_attendance/')
+        self.assertEqual(response.data['averageAttendance'], 75.0)
+    
+    def test_update_fields_includes_aggregates(self):
+        """Test that save(update_fields=[...]) also writes the aggregates"""
+        student = Student.objects.get(pk=self.empty.pk)
+        student.semesterResults = [{'semester': 1, 'gpa': 3.0, 'cgpa': 3.0}]
+        student.save(update_fields=['semesterResults'])
+        self.assertEqual(Student.objects.get(pk=self.empty.pk).completedSemesters, 1)
+    
+    def test_filter_and_order_by_aggregates(self):
+        """Test the aggregate filters and orderings on the list endpoint"""
+        response = self.client.get('/api/students/', {'averageAttendance__lt': 75})
+        self.assertEqual(
+            {row['id'] for row in response.data['results']},
+            {str(self.weak.id), str(self.empty.id)}
+        )
+        
+        response = self.client.get('/api/students/', {'latestCgpa__gte': '3.5'})
+        self.assertEqual([row['id'] for row in response.data['results']], [str(self.strong.id)])
+        
+        response = self.client.get('/api/students/', {'latestCgpa__isnull': 'false', 'ordering': 'latestCgpa'})
+        self.assertEqual(
+            [row['id'] for row in response.data['results']],
+            [str(self.weak.id), str(self.strong.id)]
+        )
+    
+    def test_backfill_command(self):
+        """Test that the backfill command restores stale aggregates"""
+        from io import StringIO
+        from django.core.management import call_command
+        Student.objects.update(averageAttendance=0.0, latestCgpa=None, completedSemesters=0)
+        
+        call_command('backfill_academic_aggregates', chunk_size=1, stdout=StringIO())
+        
+        strong = Student.objects.get(pk=self.strong.pk)
+        self.assertEqual((strong.averageAttendance, strong.completedSemesters), (95.0, 2))
+        self.assertEqual(Student.objects.get(pk=self.empty.pk).averageAttendance, 0.0)
+
+
+class StudentBulkImportTest(APITestCase):
+    """
+    Tests for POST /api/students/bulk_import/
+    """
+    
+    def setUp(self):
+        """Build a valid import row"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        self.upload = SimpleUploadedFile
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.address = {
+            'division': 'Dhaka', 'district': 'Dhaka', 'subDistrict': 'Mirpur',
+            'policeStation': 'Mirpur', 'postOffice': 'Mirpur', 'municipality': 'Dhaka',
+            'village': 'Mirpur', 'ward': '1'
+        }
+    
+    def row(self, suffix, **overrides):
+        data = {
+            'fullNameBangla': 'বাংলা নাম',
+            'fullNameEnglish': f'Imported {suffix}',
+            'fatherName': 'Father Name',
+            'fatherNID': '1234567890123456',
+            'motherName': 'Mother Name',
+            'motherNID': '1234567890123456',
+            'dateOfBirth': '2000-01-01',
+            'birthCertificateNo': f'BC{suffix}',
+            'gender': 'Male',
+            'mobileStudent': '01712345678',
+            'guardianMobile': '01712345678',
+            'emergencyContact': 'Emergency',
+            'presentAddress': self.address,
+            'permanentAddress': self.address,
+            'highestExam': 'SSC',
+            'board': 'Dhaka',
+            'group': 'Science',
+            'rollNumber': f'R{suffix}',
+            'registrationNumber': f'REG{suffix}',
+            'passingYear': 2020,
+            'gpa': 3.5,
+            'currentRollNumber': f'IR{suffix}',
+            'currentRegistrationNumber': f'IREG{suffix}',
+            'semester': 2,
+            'department': 'CSE',
+            'session': '2020-2021',
+            'shift': 'Morning',
+            'currentGroup': 'A',
+            'enrollmentDate': '2020-01-01',
+        }
+        data.update(overrides)
+        return data
+    
+    def post(self, name, content, **extra):
+        upload = self.upload(name, content.encode('utf-8'))
+        return self.client.post('/api/students/bulk_import/', {'file': upload, **extra}, format='multipart')
+    
+    def to_csv(self, rows):
+        import csv
+        import io
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({
+                key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                for key, value in row.items()
+            })
+        return output.getvalue()
+    
+    def test_csv_import_reports_invalid_rows(self):
+        """Test that valid CSV rows are inserted and invalid ones reported"""
+        import datetime
+        from apps.dashboard.models import RollupCursor
+        RollupCursor.objects.create(metric='enrollments', processedThrough=datetime.date(2023, 12, 31))
+        rows = [
+            self.row('1', semesterResults=[{'semester': 1, 'gpa': 3.2, 'cgpa': 3.2}]),
+            self.row('2', mobileStudent='123'),
+            self.row('3', department='XYZ'),
+        ]
+        response = self.post('students.csv', self.to_csv(rows))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['total'], response.data['created'], response.data['failed']), (3, 1, 2))
+        self.assertEqual([error['row'] for error in response.data['errors']], [3, 4])
+        self.assertIn('mobileStudent', response.data['errors'][0]['errors'])
+        self.assertIn('department', response.data['errors'][1]['errors'])
+        
+        student = Student.objects.get(currentRollNumber='IR1')
+        self.assertEqual(student.department, self.department)
+        self.assertEqual(student.completedSemesters, 1)
+        self.assertEqual(student.result_records.count(), 1)
+        
+        # bulk_create skips the signals; the dashboard counters are still moved
+        from apps.dashboard.models import StatCounter
+        self.assertEqual(StatCounter.objects.get(scope='students', dimension='semester', value='2').count, 1)
+        # and the backdated enrollment day is rolled up again by the next run
+        self.assertEqual(RollupCursor.objects.get().processedThrough, datetime.date(2019, 12, 31))
+    
+    def test_ndjson_import_rejects_duplicates(self):
+        """Test duplicate numbers within the file and against the database"""
+        create_test_student(self.department, '9', currentRollNumber='IR9')
+        lines = [
+            json.dumps(self.row('1', department=str(self.department.id))),
+            json.dumps(self.row('1', currentRegistrationNumber='IREG-other')),
+            json.dumps(self.row('9')),
+            'not json',
+        ]
+        response = self.post('students.ndjson', '\n'.join(lines) + '\n')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 3, 4])
+        self.assertIn('currentRollNumber', response.data['errors'][0]['errors'])
+        self.assertEqual(Student.objects.filter(currentRollNumber__startswith='IR').count(), 2)
+    
+    def test_dry_run_inserts_nothing(self):
+        """Test that dryRun validates without inserting"""
+        response = self.post('students.csv', self.to_csv([self.row('1')]), dryRun='true')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['valid'], response.data['created']), (1, 0))
+        self.assertFalse(Student.objects.filter(currentRollNumber='IR1').exists())
+    
+    def test_unparseable_csv_rejected(self):
+        """Test that a CSV the csv module cannot read returns 400 with the row"""
+        content = self.to_csv([self.row('1'), self.row('2', fullNameEnglish='x' * 200000)])
+        response = self.post('students.csv', content)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Invalid import file')
+        self.assertIn('Row 3', response.data['details'])
+        self.assertFalse(Student.objects.filter(currentRollNumber='IR1').exists())
+    
+    def test_unsupported_file(self):
+        """Test that unknown formats are rejected"""
+        response = self.post('students.xlsx', 'data')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Invalid import file')
+
+
+class StudentExportTest(APITestCase):
+    """
+    Tests for GET /api/students/export/
+    """
+    
+    def setUp(self):
+        """Create students in two departments"""
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.other_department = Department.objects.create(name='Electrical', code='EEE')
+        self.first = create_test_student(self.department, '6001')
+        self.second = create_test_student(self.department, '6002', semester=3)
+        self.other = create_test_student(self.other_department, '6003')
+    
+    def content(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+    
+    def test_csv_export_uses_filters_and_fields(self):
+        """Test that the CSV holds only the filtered students and requested columns"""
+        import csv
+        import io
+        response = self.client.get('/api/students/export/', {
+            'department': str(self.department.id),
+            'fields': 'currentRollNumber,departmentCode,semester',
+            'ordering': 'semester',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('students.csv', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(self.content(response))))
+        self.assertEqual(rows, [
+            ['currentRollNumber', 'departmentCode', 'semester'],
+            ['CR6001', 'CSE', '1'],
+            ['CR6002', 'CSE', '3'],
+        ])
+    
+    def test_ndjson_export(self):
+        """Test that NDJSON lines are objects with the default columns"""
+        response = self.client.get('/api/students/export/', {'fileFormat': 'ndjson', 'semester': 3})
+        lines = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['id'], str(self.second.id))
+        self.assertEqual(lines[0]['department'], str(self.department.id))
+        self.assertEqual(lines[0]['status'], 'active')
+    
+    def test_export_streams_under_asgi(self):
+        """Test that the ASGI handler gets an async iterator instead of collecting the rows first"""
+        import warnings
+        from asgiref.sync import async_to_sync
+        from django.core.handlers.asgi import ASGIHandler
+        from django.core.signals import request_finished, request_started
+        from django.db import close_old_connections
+        
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': '/api/students/export/',
+            'query_string': b'fileFormat=ndjson', 'headers': [], 'server': ('testserver', 80),
+        }
+        messages = []
+        
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        
+        async def send(message):
+            messages.append(message)
+        
+        # As the test client: keep the test transaction's connection open
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                async_to_sync(ASGIHandler())(scope, receive, send)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+        
+        self.assertEqual(messages[0]['status'], 200)
+        self.assertFalse([warning for warning in caught if 'synchronous iterators' in str(warning.message)])
+        body = b''.join(message.get('body', b'') for message in messages[1:]).decode('utf-8')
+        ids = {json.loads(line)['id'] for line in body.splitlines()}
+        self.assertEqual(ids, {str(self.first.id), str(self.second.id), str(self.other.id)})
+    
+    def test_unknown_field_rejected(self):
+        """Test that unknown columns return 400"""
+        response = self.client.get('/api/students/export/', {'fields': 'fullNameEnglish,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', response.data['details'])
+
+
+class SparseFieldsetTest(APITestCase):
+    """
+    Tests for ?fields= / ?expand= on student and alumni detail responses
+    """
+    
+    def setUp(self):
+        """Create a student with academic records and an alumni record"""
+        from apps.alumni.models import Alumni
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.student = create_test_student(
+            self.department, '7001',
+            semesterResults=[{'semester': 1, 'gpa': 3.0, 'cgpa': 3.0}]
+        )
+        self.graduate = create_test_student(self.department, '7002', status='graduated')
+        Alumni.objects.create(
+            student=self.graduate,
+            alumniType='recent',
+            graduationYear=2024,
+            currentSupportCategory='no_support_needed'
+        )
+    
+    def test_default_response_unchanged(self):
+        """Test that without parameters every field is returned"""
+        response = self.client.get(f'/api/students/{self.student.id}/')
+        self.assertIn('semesterResults', response.data)
+        self.assertEqual(response.data['department']['code'], 'CSE')
+    
+    def test_student_fields_select_columns(self):
+        """Test that ?fields= trims the response and the SQL"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f'/api/students/{self.student.id}/',
+                {'fields': 'fullNameEnglish,status'}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(dict(response.data), {'fullNameEnglish': 'Student 7001', 'status': 'active'})
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('semesterResults', sql)
+        self.assertNotIn('presentAddress', sql)
+    
+    def test_nested_fields_and_expand(self):
+        """Test dotted nested fields and collapsing with ?expand="""
+        response = self.client.get(
+            f'/api/students/{self.student.id}/',
+            {'fields': 'id,department.code'}
+        )
+        self.assertEqual(response.data['department'], {'code': 'CSE'})
+        
+        response = self.client.get(
+            f'/api/students/{self.student.id}/',
+            {'fields': 'id,department', 'expand': ''}
+        )
+        self.assertEqual(response.data['department'], self.department.id)
+    
+    def test_alumni_list_fieldset(self):
+        """Test that alumni rows can carry only part of the student"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/alumni/', {
+                'fields': 'alumniType,student.fullNameEnglish,student.status'
+            })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0], {
+            'alumniType': 'recent',
+            'student': {'fullNameEnglish': 'Student 7002', 'status': 'graduated'},
+        })
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('semesterAttendance', sql)
+        
+        response = self.client.get(f'/api/alumni/{self.graduate.id}/', {'expand': ''})
+        self.assertEqual(response.data['student'], self.graduate.id)
+    
+    def test_unknown_field_rejected(self):
+        """Test that unknown fields return 400"""
+        response = self.client.get(f'/api/students/{self.student.id}/', {'fields': 'password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StudentConditionalGetTest(APITestCase):
+    """
+    Tests for ETag / Last-Modified on student and alumni endpoints
+    """
+    
+    def setUp(self):
+        """Create a student"""
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.student = create_test_student(self.department, '8001')
+        self.url = f'/api/students/{self.student.id}/'
+    
+    def test_detail_not_modified(self):
+        """Test that a matching If-None-Match gets 304 from the row and counter lookups"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        # studentCount has no timestamp: validated by ETag only
+        self.assertNotIn('Last-Modified', response)
+        
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+    
+    def test_detail_changes_after_update(self):
+        """Test that saving the student changes the ETag"""
+        etag = self.client.get(self.url)['ETag']
+        self.client.patch(self.url, {'fullNameEnglish': 'Renamed'}, format='json')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['fullNameEnglish'], 'Renamed')
+    
+    def test_etag_follows_department_student_count(self):
+        """Test that a new student in the department revalidates the nested studentCount"""
+        etag = self.client.get(self.url)['ETag']
+        list_etag = self.client.get('/api/students/', {'currentRollNumber': self.student.currentRollNumber})['ETag']
+        create_test_student(self.department, '8003')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['department']['studentCount'], 2)
+        response = self.client.get(
+            '/api/students/', {'currentRollNumber': self.student.currentRollNumber}, HTTP_IF_NONE_MATCH=list_etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_cursor_list_skips_collection_validator(self):
+        """Test that keyset pages run no COUNT/MAX over the filtered collection"""
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/students/', {'pagination': 'cursor'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', response)
+    
+    def test_etag_depends_on_fieldset(self):
+        """Test that different ?fields= produce different ETags"""
+        full = self.client.get(self.url)['ETag']
+        sparse = self.client.get(self.url, {'fields': 'fullNameEnglish'})['ETag']
+        self.assertNotEqual(full, sparse)
+    
+    def test_list_validator_tracks_count(self):
+        """Test the collection ETag under filters, including deletions"""
+        params = {'department': str(self.department.id)}
+        etag = self.client.get('/api/students/', params)['ETag']
+        response = self.client.get('/api/students/', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        other = create_test_student(self.department, '8002')
+        response = self.client.get('/api/students/', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        etag = response['ETag']
+        other.delete()
+        response = self.client.get('/api/students/', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_not_modified_checks_object_permissions(self):
+        """Test that a matching ETag does not bypass the object permission checks"""
+        from unittest import mock
+        from rest_framework.permissions import BasePermission
+        from .views import StudentViewSet
+        
+        class DenyObjects(BasePermission):
+            def has_object_permission(self, request, view, obj):
+                return False
+        
+        etag = self.client.get(self.url)['ETag']
+        with mock.patch.object(StudentViewSet, 'permission_classes', [DenyObjects]):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_missing_student_still_404(self):
+        """Test that unknown ids are answered by retrieve as before"""
+        import uuid
+        response = self.client.get(f'/api/students/{uuid.uuid4()}/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class StudentListFastSerializerTest(APITestCase):
+    """
+    Tests for the values()-based list serialization (utils.fast_serializers)
+    """
+    
+    def setUp(self):
+        """Create students in two departments"""
+        self.cse = Department.objects.create(name='Computer Science', code='CSE')
+        self.eee = Department.objects.create(name='Electrical', code='EEE')
+        create_test_student(self.cse, '9001', profilePhoto='students/a.jpg')
+        create_test_student(self.cse, '9002', status='discontinued')
+        create_test_student(self.eee, '9003', fullNameEnglish='Ünïcode নাম')
+    
+    def test_matches_list_serializer(self):
+        """Test that the fast path renders byte-identical JSON"""
+        from rest_framework.renderers import JSONRenderer
+        from .serializers import StudentListSerializer, student_list_fast_serializer
+        queryset = Student.objects.select_related('department').order_by('-createdAt')
+        
+        expected = JSONRenderer().render(StudentListSerializer(queryset, many=True).data)
+        actual = JSONRenderer().render(
+            student_list_fast_serializer.represent(student_list_fast_serializer.values(queryset))
+        )
+        self.assertEqual(actual, expected)
+
+
+class StudentDistributionTest(APITestCase):
+    """
+    Tests for GET /api/students/distribution/ (see analytics.py)
+    """
+    
+    def setUp(self):
+        """Create students with records in two departments"""
+        from .analytics import distribution_cache
+        distribution_cache.clear()
+        self.cse = Department.objects.create(name='Computer Science', code='CSE')
+        self.eee = Department.objects.create(name='Electrical', code='EEE')
+        self.strong = create_test_student(
+            self.cse, '9101',
+            semesterResults=[{'semester': 1, 'gpa': 3.8, 'cgpa': 3.8}],
+            semesterAttendance=[{'semester': 1, 'subjects': [{'name': 'Physics', 'present': 19, 'total': 20}]}],
+        )
+        self.weak = create_test_student(
+            self.cse, '9102', status='discontinued',
+            semesterResults=[{'semester': 1, 'gpa': 2.2, 'cgpa': 2.2}],
+            semesterAttendance=[{'semester': 1, 'subjects': [{'name': 'Physics', 'present': 11, 'total': 20}]}],
+        )
+        self.other = create_test_student(
+            self.eee, '9103',
+            semesterResults=[{'semester': 1, 'gpa': 4.0, 'cgpa': 4.0}],
+        )
+    
+    def get(self, **params):
+        response = self.client.get('/api/students/distribution/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    def counts(self, distribution):
+        return [item['count'] for item in distribution['bins']]
+    
+    def test_department_distribution(self):
+        """Test the GPA bins and attendance bands of the stored aggregates"""
+        data = self.get(department=str(self.cse.id))
+        self.assertEqual(data['gpa']['count'], 2)
+        self.assertEqual(data['gpa']['mean'], 3.0)
+        self.assertEqual(self.counts(data['gpa']), [0, 0, 0, 0, 1, 0, 0, 1])
+        self.assertEqual(data['gpa']['bins'][4]['byStatus'], {'discontinued': 1})
+        # 95% and 55%
+        self.assertEqual(self.counts(data['attendance']), [0, 1, 0, 0, 1])
+        
+        everyone = self.get()
+        self.assertEqual(everyone['gpa']['count'], 3)
+        self.assertEqual(self.counts(everyone['gpa'])[7], 2)
+        # A student without attendance counts as 0%
+        self.assertEqual(self.counts(everyone['attendance']), [1, 1, 0, 0, 1])
+    
+    def test_semester_and_status_filters(self):
+        """Test that semester reads the record tables and status filters the result"""
+        data = self.get(semester=1, status='active')
+        self.assertEqual(data['gpa']['count'], 2)
+        self.assertEqual(data['gpa']['mean'], 3.9)
+        self.assertEqual(data['attendance']['count'], 1)
+        self.assertEqual(self.get(semester=2)['gpa']['count'], 0)
+    
+    def test_cache_invalidated_when_student_changes(self):
+        """Test that saving a student refreshes the cached distributions"""
+        self.assertEqual(self.get(department=str(self.eee.id))['gpa']['count'], 1)
+        self.weak.department = self.eee
+        self.weak.save()
+        self.assertEqual(self.get(department=str(self.eee.id))['gpa']['count'], 2)
+        self.assertEqual(self.get(department=str(self.cse.id))['gpa']['count'], 1)
+        
+        self.other.delete()
+        self.assertEqual(self.get(department=str(self.eee.id))['gpa']['count'], 1)
+    
+    def test_out_of_range_gpa_clamped(self):
+        """Test that negative GPAs land in the first bin rather than one counted from the end"""
+        from .models import SemesterResult
+        
+        Student.objects.filter(pk=self.other.pk).update(latestCgpa=-0.5)
+        SemesterResult.objects.filter(student=self.other).update(gpa=-0.5)
+        
+        for params in ({'department': str(self.eee.id)}, {'department': str(self.eee.id), 'semester': 1}):
+            counts = self.counts(self.get(**params)['gpa'])
+            self.assertEqual(counts, [1, 0, 0, 0, 0, 0, 0, 0])
+    
+    def test_invalid_parameters(self):
+        """Test that invalid parameters return 400"""
+        for params in ({'semester': 9}, {'semester': 'x'}, {'department': 'x'}, {'status': 'unknown'}):
+            response = self.client.get('/api/students/distribution/', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -5,17 +5,22 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from apps.dashboard.counters import counter_stamp
+from utils.conditional import ConditionalGetMixin
+from utils.fast_serializers import FastListMixin
+from utils.fieldsets import SparseFieldsetViewMixin
+from utils.pagination import KeysetPagination
 from .models import Student
 from .serializers import (
     StudentListSerializer,
     StudentDetailSerializer,
     StudentCreateSerializer,
-    StudentUpdateSerializer
+    StudentUpdateSerializer,
+    student_list_fast_serializer
 )
 
 
-class StudentViewSet(viewsets.ModelViewSet):
+class StudentViewSet(ConditionalGetMixin, FastListMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Student CRUD operations
     
@@ -31,13 +36,67 @@ class StudentViewSet(viewsets.ModelViewSet):
     - upload_photo: POST /api/students/{id}/upload-photo/
     - transition_to_alumni: POST /api/students/{id}/transition-to-alumni/
     - disconnect_studies: POST /api/students/{id}/disconnect-studies/
+    - bulk_import: POST /api/students/bulk_import/
+    - export: GET /api/students/export/
+    - distribution: GET /api/students/distribution/
+    
+    List pagination: ?page=N (default) or keyset mode with ?pagination=cursor
+    (ordered by -createdAt, -id; see utils.pagination.KeysetPagination)
+    
+    Detail responses accept ?fields= / ?expand= (see utils.fieldsets);
+    retrieve then only loads the columns it returns
+    
+    list and retrieve send ETag / Last-Modified and answer conditional
+    requests with 304 (see utils.conditional)
+    
+    list is serialized from values() rows (see utils.fast_serializers)
     """
-    queryset = Student.objects.all()
+    queryset = Student.objects.select_related('department')
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['department', 'semester', 'status']
+    filterset_fields = {
+        'department': ['exact'],
+        'semester': ['exact'],
+        'status': ['exact'],
+        # Stored aggregates, e.g. ?averageAttendance__lt=75&latestCgpa__gte=3.5
+        'averageAttendance': ['gte', 'lte', 'lt', 'gt'],
+        'latestCgpa': ['gte', 'lte', 'lt', 'gt', 'isnull'],
+        'completedSemesters': ['exact', 'gte', 'lte'],
+    }
     search_fields = ['fullNameEnglish', 'fullNameBangla', 'currentRollNumber', 'currentRegistrationNumber']
-    ordering_fields = ['createdAt', 'fullNameEnglish', 'semester']
+    ordering_fields = [
+        'createdAt', 'fullNameEnglish', 'semester',
+        'averageAttendance', 'latestCgpa', 'completedSemesters'
+    ]
     ordering = ['-createdAt']
+    conditional_timestamp_fields = ('updatedAt', 'department__updatedAt')
+    # Student columns loaded by the record endpoints (besides id and fullNameEnglish)
+    record_owner_fields = {
+        'semester_results': (),
+        'semester_attendance': ('averageAttendance',),
+    }
+    fast_list_serializer = student_list_fast_serializer
+    
+    def get_queryset(self):
+        """
+        Restrict retrieve to the columns of the requested fieldset
+        """
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            queryset = self.apply_fieldset(queryset, StudentDetailSerializer)
+        elif self.action in self.record_owner_fields:
+            # The record endpoints only return these student columns
+            queryset = queryset.select_related(None).only(
+                'id', 'fullNameEnglish', *self.record_owner_fields[self.action]
+            )
+        return queryset
+    
+    def get_validator_dependencies(self):
+        """
+        The nested department's studentCount is counted from other students:
+        validate it through the maintained per-department counters
+        """
+        return [counter_stamp('students', 'department')]
     
     def get_serializer_class(self):
         """
@@ -68,9 +127,8 @@ class StudentViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
         
-        # Return complete student data
-        student = Student.objects.get(pk=serializer.instance.pk)
-        response_serializer = StudentDetailSerializer(student)
+        # Return complete student data (the saved instance already holds every column)
+        response_serializer = StudentDetailSerializer(serializer.instance, context=self.get_serializer_context())
         
         return Response(
             response_serializer.data,
@@ -95,9 +153,11 @@ class StudentViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
         
-        # Return complete student data
-        student = Student.objects.get(pk=instance.pk)
-        response_serializer = StudentDetailSerializer(student)
+        # Return complete student data (or the requested fieldset)
+        student = self.apply_fieldset(
+            Student.objects.select_related('department'), StudentDetailSerializer
+        ).get(pk=instance.pk)
+        response_serializer = StudentDetailSerializer(student, context=self.get_serializer_context())
         
         return Response(response_serializer.data)
     
@@ -125,9 +185,15 @@ class StudentViewSet(viewsets.ModelViewSet):
     def search(self, request):
         """
         Search students by name, roll number, or registration number
-        GET /api/students/search/?q={query}
+        GET /api/students/search/?q={query}&page={page}
+        
+        Names (English or Bangla) match anywhere in the text; roll and
+        registration numbers match by prefix. Results are ranked by relevance
+        and paginated.
         """
-        query = request.query_params.get('q', '')
+        from .search import search_students
+        
+        query = request.query_params.get('q', '').strip()
         
         if not query:
             return Response(
@@ -135,17 +201,160 @@ class StudentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Search in multiple fields (case-insensitive)
-        students = Student.objects.filter(
-            Q(fullNameEnglish__icontains=query) |
-            Q(fullNameBangla__icontains=query) |
-            Q(currentRollNumber__icontains=query) |
-            Q(currentRegistrationNumber__icontains=query)
-        )
+        students = search_students(self.get_queryset(), query)
+        
+        page = self.paginate_queryset(students)
+        if page is not None:
+            serializer = StudentListSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         
         serializer = StudentListSerializer(students, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream all matching students as CSV or NDJSON
+        GET /api/students/export/
+        
+        Query params:
+        - fileFormat: csv (default) or ndjson
+        - fields: comma-separated columns (default: the list columns),
+          e.g. fields=fullNameEnglish,currentRollNumber,departmentCode
+        - the list filters (department, semester, status, ...), search and ordering
+        
+        Returns: streamed file; rows are read with a server-side cursor
+        """
+        from django.http import StreamingHttpResponse
+        from .export import parse_export_fields, stream_csv, stream_ndjson, streaming_content
+        
+        file_format = request.query_params.get('fileFormat', 'csv').lower()
+        if file_format not in ('csv', 'ndjson'):
+            return Response(
+                {'error': 'Invalid file format', 'details': 'fileFormat must be csv or ndjson'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            fields = parse_export_fields(request.query_params.get('fields'))
+        except ValueError as e:
+            return Response(
+                {'error': 'Invalid fields', 'details': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(Student.objects.all())
+        if file_format == 'csv':
+            response = StreamingHttpResponse(
+                streaming_content(request, stream_csv(queryset, fields)), content_type='text/csv; charset=utf-8'
+            )
+        else:
+            response = StreamingHttpResponse(
+                streaming_content(request, stream_ndjson(queryset, fields)), content_type='application/x-ndjson'
+            )
+        response['Content-Disposition'] = f'attachment; filename="students.{file_format}"'
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def distribution(self, request):
+        """
+        GPA histogram and attendance bands of a department and semester
+        GET /api/students/distribution/
+        
+        Query params:
+        - department: department id (default: all departments)
+        - semester: 1-8 for that semester's GPA and attendance
+          (default: each student's latestCgpa and averageAttendance)
+        - status: comma-separated student statuses (default: all)
+        
+        Returns: count, mean and bins (each split by status) for gpa and
+        attendance; cached per (department, semester), see analytics.py
+        """
+        import uuid
+        from .analytics import SEMESTERS, get_distributions
+        
+        department = request.query_params.get('department') or None
+        if department is not None:
+            try:
+                department = str(uuid.UUID(department))
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid department', 'details': 'department must be a department id'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        semester = request.query_params.get('semester') or None
+        if semester is not None:
+            try:
+                semester = int(semester)
+            except ValueError:
+                semester = None
+            if semester not in SEMESTERS:
+                return Response(
+                    {'error': 'Invalid semester', 'details': 'semester must be a number from 1 to 8'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        statuses = None
+        if request.query_params.get('status'):
+            statuses = {value.strip() for value in request.query_params['status'].split(',') if value.strip()}
+            valid = {choice for choice, _ in Student.STATUS_CHOICES}
+            if not statuses <= valid:
+                return Response(
+                    {'error': 'Invalid status', 'details': f'status must be among: {", ".join(sorted(valid))}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        return Response(get_distributions(department, semester, statuses))
+    
+    @action(detail=False, methods=['post'])
+    def bulk_import(self, request):
+        """
+        Import many students from one upload
+        POST /api/students/bulk_import/
+        
+        Accepts: multipart/form-data with a 'file' field (.csv or .ndjson)
+        - CSV: header row of StudentCreateSerializer field names; address and
+          academic record cells hold JSON; empty cells use the field default
+        - NDJSON: one student object per line
+        - department may be the department id or code
+        Optional: 'fileFormat' (csv/ndjson) to override detection,
+        'dryRun=true' to validate without inserting
+        
+        Returns: counts and a per-row error report; invalid rows are skipped
+        """
+        from .bulk_import import (
+            ImportFileError,
+            StudentImporter,
+            detect_format,
+            iter_csv_rows,
+            iter_ndjson_rows
+        )
+        
+        if 'file' not in request.FILES:
+            return Response(
+                {'error': 'No file provided', 'details': 'Please include a CSV or NDJSON file in the request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        upload = request.FILES['file']
+        dry_run = str(request.data.get('dryRun', '')).lower() in ('1', 'true', 'yes')
+        
+        try:
+            file_format = detect_format(upload, request.data.get('fileFormat'))
+            rows = iter_csv_rows(upload) if file_format == 'csv' else iter_ndjson_rows(upload)
+            importer = StudentImporter(dry_run=dry_run)
+            importer.run(rows)
+        except ImportFileError as e:
+            return Response(
+                {'error': 'Invalid import file', 'details': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        report = importer.report()
+        response_status = status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK
+        return Response(report, status=response_status)
+    
     @action(detail=True, methods=['post'])
     def upload_photo(self, request, pk=None):
         """
@@ -199,7 +408,7 @@ class StudentViewSet(viewsets.ModelViewSet):
             student.save()
             
             # Return updated student
-            serializer = StudentDetailSerializer(student)
+            serializer = StudentDetailSerializer(student, context=self.get_serializer_context())
             return Response(serializer.data)
             
         except Exception as e:
@@ -355,7 +564,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         student.save()
         
         # Return updated student
-        serializer = StudentDetailSerializer(student)
+        serializer = StudentDetailSerializer(student, context=self.get_serializer_context())
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
@@ -365,13 +574,15 @@ class StudentViewSet(viewsets.ModelViewSet):
         GET /api/students/{id}/semester-results/
         
         Returns: List of semester results with GPA/CGPA or referred subjects
+        (served from the SemesterResult table, without loading the student JSON)
         """
         student = self.get_object()
+        results = student.result_records.order_by('position').values_list('entry', flat=True)
         
         return Response({
             'studentId': student.id,
             'studentName': student.fullNameEnglish,
-            'semesterResults': student.semesterResults
+            'semesterResults': list(results)
         })
     
     @action(detail=True, methods=['get'])
@@ -381,18 +592,17 @@ class StudentViewSet(viewsets.ModelViewSet):
         GET /api/students/{id}/semester-attendance/
         
         Returns: List of semester attendance with subject-wise present/total counts
-        and calculated average attendance percentage
+        and the stored average attendance percentage
+        (served from the SemesterAttendance table, without loading the student JSON)
         """
-        from .validators import calculate_average_attendance
-        
         student = self.get_object()
-        
-        # Calculate average attendance
-        average_attendance = calculate_average_attendance(student.semesterAttendance)
+        records = student.attendance_records.order_by('position')
+        attendance = list(records.values_list('entry', flat=True))
         
         return Response({
             'studentId': student.id,
             'studentName': student.fullNameEnglish,
-            'semesterAttendance': student.semesterAttendance,
-            'averageAttendance': average_attendance
+            'semesterAttendance': attendance,
+            'averageAttendance': student.averageAttendance
         })
+    
@@ -19,6 +19,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'slms_core.settings')
 # is populated before importing code that may import ORM models.
 django_asgi_app = get_asgi_application()
 
+from apps.dashboard.routing import websocket_urlpatterns as dashboard_websocket_urlpatterns
 from apps.notifications.routing import websocket_urlpatterns
 
 application = ProtocolTypeRouter({
@@ -28,7 +29,7 @@ application = ProtocolTypeRouter({
     # WebSocket chat handler with authentication
     "websocket": AuthMiddlewareStack(
         URLRouter(
-            websocket_urlpatterns
+            websocket_urlpatterns + dashboard_websocket_urlpatterns
         )
     ),
 })
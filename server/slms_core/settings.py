@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party apps
     'rest_framework',
@@ -197,3 +198,42 @@ CSRF_TRUSTED_ORIGINS = config(
 # Exempt API endpoints from CSRF for development
 CSRF_COOKIE_HTTPONLY = False
 CSRF_COOKIE_SAMESITE = 'Lax'
+
+# Shared cache (the Redis server of the channel layer), seen by every worker
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('CACHE_REDIS_URL', default='redis://127.0.0.1:6379/1'),
+    },
+}
+
+# Stale-while-revalidate cache for dashboard and statistics endpoints (utils/swr_cache.py)
+# DjangoCacheBackend keeps entries in a CACHES alias (OPTIONS {'alias': ...}, default
+# 'default'), so invalidations reach every worker; 'utils.swr_cache.LocalMemoryBackend'
+# keeps them per process and only suits a single process
+STATS_CACHE = {
+    'BACKEND': config('STATS_CACHE_BACKEND', default='utils.swr_cache.DjangoCacheBackend'),
+    'OPTIONS': {},
+}
+
+# Seconds the dashboard WebSocket collects counter deltas before sending one frame
+DASHBOARD_LIVE_COALESCE_SECONDS = config('DASHBOARD_LIVE_COALESCE_SECONDS', default=1.0, cast=float)
+
+# Seconds a notification WebSocket collects created notifications before sending one frame
+NOTIFICATION_PUSH_COALESCE_SECONDS = config('NOTIFICATION_PUSH_COALESCE_SECONDS', default=0.5, cast=float)
+
+# Recipients per bulk insert when an announcement is fanned out (NotificationService.create_announcement)
+NOTIFICATION_FANOUT_CHUNK_SIZE = config('NOTIFICATION_FANOUT_CHUNK_SIZE', default=1000, cast=int)
+
+# In-process LRU cache of notification preferences (apps/notifications/preferences.py):
+# users kept per process, and seconds before an entry is reloaded
+NOTIFICATION_PREFERENCE_CACHE_SIZE = config('NOTIFICATION_PREFERENCE_CACHE_SIZE', default=10000, cast=int)
+NOTIFICATION_PREFERENCE_CACHE_TTL = config('NOTIFICATION_PREFERENCE_CACHE_TTL', default=300, cast=int)
+
+# Days after creation that read, archived and deleted notifications stay in the
+# notification table before archive_notifications moves them to notification_archive
+NOTIFICATION_RETENTION_DAYS = {
+    'read': config('NOTIFICATION_RETENTION_READ_DAYS', default=180, cast=int),
+    'archived': config('NOTIFICATION_RETENTION_ARCHIVED_DAYS', default=90, cast=int),
+    'deleted': config('NOTIFICATION_RETENTION_DELETED_DAYS', default=30, cast=int),
+}
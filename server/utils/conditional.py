@@ -0,0 +1,150 @@
+"""
+Conditional GET Utility
+ETag / Last-Modified validators for list and retrieve endpoints
+
+Validators come from timestamp columns (e.g. updatedAt), read with a
+single indexed query that loads no other column:
+- retrieve: the row's timestamps, looked up by primary key
+- list: MAX of each timestamp and COUNT(*) under the active filters
+  (ETag only: deleting a row does not move MAX, so Last-Modified would
+  not notice it); skipped in keyset pagination mode, which exists to
+  avoid scanning the whole filtered collection
+The ETag also covers the query string and the negotiated format, since
+they change the representation (?fields=, ?page=, ...). When the client's
+If-None-Match / If-Modified-Since still matches, a 304 is returned
+without loading or serializing any row. A retrieve whose permission
+classes check objects still loads the object (get_object()) before a 304,
+so the object permissions apply to conditional requests too.
+
+Values derived from other rows (e.g. a nested department's studentCount)
+are covered by get_validator_dependencies(), which views override with
+cheap stand-ins (e.g. maintained counters); such responses are validated
+by ETag only.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.permissions import BasePermission
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin adding ETag / Last-Modified to list and retrieve
+
+    Set `conditional_timestamp_fields` to the timestamp columns (ORM paths,
+    related ones allowed) whose change means the response changed.
+    """
+    conditional_timestamp_fields = ('updatedAt',)
+
+    def list(self, request, *args, **kwargs):
+        paginator = self.paginator
+        if getattr(paginator, 'is_keyset_request', None) and paginator.is_keyset_request(request, self):
+            return super().list(request, *args, **kwargs)
+        validators = self.get_collection_validators()
+        return self.conditional_response(request, validators, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = self.get_object_validators()
+        return self.conditional_response(
+            request, validators, super().retrieve, *args,
+            authorize=self.check_not_modified_permissions, **kwargs
+        )
+
+    def conditional_response(self, request, validators, handler, *args, authorize=None, **kwargs):
+        """
+        Answer 304 when the validators match, otherwise run the handler and tag its response
+        `authorize` runs before a 304 is returned and raises to deny it
+        """
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        etag, last_modified = validators
+        timestamp = last_modified.timestamp() if last_modified else None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if not_modified is not None:
+            if authorize is not None:
+                authorize()
+            not_modified['ETag'] = etag
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def check_not_modified_permissions(self):
+        """
+        Run the object permission checks retrieve would run, loading the
+        object only if a permission class implements has_object_permission
+        """
+        for permission in self.get_permissions():
+            if type(permission).has_object_permission is not BasePermission.has_object_permission:
+                self.get_object()
+                return
+
+    def get_object_validators(self):
+        """
+        Return (etag, last_modified) for the requested object from a
+        primary-key lookup of its timestamps; None if it cannot be found
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            row = self.get_queryset().filter(**lookup).order_by().values_list(
+                *self.conditional_timestamp_fields
+            ).first()
+        except (ValidationError, ValueError, TypeError):
+            return None  # malformed id: let retrieve answer it
+        if row is None:
+            return None
+        return self.make_validators(row, [self.kwargs[lookup_url_kwarg]])
+
+    def get_collection_validators(self):
+        """
+        Return (etag, last_modified) for the filtered collection from one
+        aggregate query (MAX of each timestamp, COUNT)
+        """
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        aggregates = {
+            f'max_{index}': Max(field)
+            for index, field in enumerate(self.conditional_timestamp_fields)
+        }
+        try:
+            values = queryset.aggregate(count=Count('pk'), **aggregates)
+        except (ValidationError, ValueError, TypeError):
+            return None
+        row = [values[f'max_{index}'] for index in range(len(self.conditional_timestamp_fields))]
+        etag, _ = self.make_validators(row, [values['count']])
+        return etag, None
+
+    def get_validator_dependencies(self):
+        """
+        Return values the representation depends on besides the rows' own
+        timestamps (override, e.g. with counters behind a nested count)
+        """
+        return []
+
+    def make_validators(self, timestamps, extra):
+        """Build the ETag and Last-Modified value from timestamps plus extra parts"""
+        request = self.request
+        renderer = getattr(request, 'accepted_renderer', None)
+        dependencies = self.get_validator_dependencies()
+        parts = [
+            request.path,
+            request.META.get('QUERY_STRING', ''),
+            getattr(renderer, 'format', ''),
+            *[str(part) for part in extra],
+            *[str(part) for part in dependencies],
+            *[value.isoformat() if value else '' for value in timestamps],
+        ]
+        digest = hashlib.md5('|'.join(parts).encode('utf-8'), usedforsecurity=False).hexdigest()
+        present = [value for value in timestamps if value]
+        if dependencies or not present:
+            # The dependencies have no timestamp Last-Modified could follow
+            return f'W/"{digest}"', None
+        return f'W/"{digest}"', max(present)
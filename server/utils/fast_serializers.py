@@ -0,0 +1,177 @@
+"""
+Fast Serializer Utility
+Compiled, read-only serialization of list endpoints from values() rows
+
+A FastSerializer is built from an existing DRF serializer class. On first
+use it walks the serializer's fields once and records, per field, the
+values() column to read and the conversion to apply, so serializing a row
+is a single pass over a precomputed plan instead of instantiating model
+objects and serializer fields. The output is the same JSON as the DRF
+serializer:
+- values go through the DRF field's own to_representation, skipped only
+  for fields where it returns the value unchanged (CharField, JSONField,
+  related primary keys, ...)
+- None is emitted as None without conversion, as DRF does
+- keys come out in the serializer's field order
+- nested serializers are read through joins in the same query
+
+SerializerMethodFields (and other fields that do not map to a column) must
+be given as `computed` functions of the row; anything else unsupported
+raises ImproperlyConfigured when the plan is compiled.
+"""
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from utils.pagination import applied_ordering
+
+
+# Fields whose to_representation returns database values unchanged
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.BooleanField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.ReadOnlyField,
+)
+
+
+def _identity_field(field):
+    if type(field) in IDENTITY_FIELDS:
+        return getattr(field, 'pk_field', None) is None
+    if type(field) is serializers.JSONField:
+        return not field.binary
+    return False
+
+
+def _resolve_column(model, attrs, path):
+    """Map serializer source attributes to a values() column, or raise"""
+    for index, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(f'Fast serializer: {path} does not map to a model field')
+        if index < len(attrs) - 1:
+            if not field.many_to_one and not field.one_to_one:
+                raise ImproperlyConfigured(f'Fast serializer: {path} crosses a to-many relation')
+            if field.null:
+                # DRF skips the key when an intermediate object is None
+                raise ImproperlyConfigured(f'Fast serializer: {path} crosses a nullable relation')
+            model = field.related_model
+    return '__'.join(attrs)
+
+
+class FastSerializer:
+    """
+    Read-only serializer compiled from a DRF serializer class
+
+    Usage:
+        fast = FastSerializer(StudentListSerializer, computed={...})
+        rows = fast.values(queryset)
+        data = fast.represent(rows, context)
+
+    Args:
+        serializer_class: DRF serializer to mirror
+        computed: {dotted field path: (columns, function(row, context))}
+            for fields that are not plain columns
+    """
+
+    def __init__(self, serializer_class, computed=None):
+        self.serializer_class = serializer_class
+        self.computed = computed or {}
+        self._compiled = None
+
+    def compile(self):
+        """Build (columns, plan) once; plans are cached on the instance"""
+        if self._compiled is None:
+            serializer = self.serializer_class(context={})
+            columns = []
+            plan = self._compile(serializer, serializer.Meta.model, '', '', columns)
+            self._compiled = (list(dict.fromkeys(columns)), plan)
+        return self._compiled
+
+    def _compile(self, serializer, model, path_prefix, column_prefix, columns):
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            path = f'{path_prefix}{name}'
+            if path in self.computed:
+                needed, function = self.computed[path]
+                columns.extend(needed)
+                plan.append((name, None, function, None))
+                continue
+            if isinstance(field, serializers.ListSerializer) or isinstance(field, serializers.ManyRelatedField):
+                raise ImproperlyConfigured(f'Fast serializer: {path} is a to-many field')
+            if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+                raise ImproperlyConfigured(f'Fast serializer: {path} needs a computed function')
+
+            column = column_prefix + _resolve_column(model, field.source_attrs, path)
+            if isinstance(field, serializers.BaseSerializer):
+                related_model = field.Meta.model
+                pk_column = f'{column}__{related_model._meta.pk.name}'
+                columns.append(pk_column)
+                nested = self._compile(field, related_model, f'{path}.', f'{column}__', columns)
+                plan.append((name, pk_column, None, nested))
+                continue
+
+            columns.append(column)
+            convert = None if _identity_field(field) else field.to_representation
+            plan.append((name, column, convert, None))
+        return plan
+
+    @property
+    def columns(self):
+        return self.compile()[0]
+
+    def values(self, queryset, extra=()):
+        """Return queryset.values() with every column the plan reads (plus extra)"""
+        return queryset.values(*dict.fromkeys([*self.columns, *extra]))
+
+    def represent(self, rows, context=None):
+        """Serialize values() rows to a list of dicts"""
+        context = {} if context is None else context
+        plan = self.compile()[1]
+        return [self._represent_row(plan, row, context) for row in rows]
+
+    def _represent_row(self, plan, row, context):
+        data = {}
+        for name, column, convert, nested in plan:
+            if nested is not None:
+                data[name] = None if row[column] is None else self._represent_row(nested, row, context)
+            elif column is None:
+                data[name] = convert(row, context)
+            else:
+                value = row[column]
+                data[name] = value if value is None or convert is None else convert(value)
+        return data
+
+
+class FastListMixin:
+    """
+    ViewSet mixin serving `list` through a FastSerializer
+
+    Set `fast_list_serializer` to a FastSerializer for the view's list
+    serializer. Filtering, ordering and pagination are unchanged; the page
+    is read with values() instead of model instances.
+    """
+    fast_list_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        if self.fast_list_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.fast_list_serializer.values(queryset, extra=self.get_fast_list_extra_columns())
+        context = self.get_serializer_context()
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.fast_list_serializer.represent(page, context))
+        return Response(self.fast_list_serializer.represent(rows, context))
+
+    def get_fast_list_extra_columns(self):
+        """Columns pagination reads from rows (keyset position: applied ordering + pk)"""
+        ordering = applied_ordering(self.request, self.get_queryset(), self)
+        return ['pk', *[field.lstrip('-') for field in ordering]]
@@ -0,0 +1,192 @@
+"""
+Sparse Fieldsets Utility
+Lets clients pick the fields of a response with ?fields= and ?expand=
+
+- fields: comma-separated field names to return. Nested fields use dotted
+  paths (student.fullNameEnglish); a bare nested name returns it whole.
+- expand: when given, only the listed nested objects are embedded and the
+  others are returned as their primary key (?expand= alone embeds none).
+  Without ?expand= every nested object is embedded, as before.
+
+Views load only the columns the remaining fields read, using only() and
+select_related(), so JSON columns that are not returned are never fetched.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+FIELDS_QUERY_PARAM = 'fields'
+EXPAND_QUERY_PARAM = 'expand'
+
+
+def parse_fieldset(value):
+    """
+    Parse a comma-separated query parameter
+
+    Returns:
+        set of names, or None if the parameter is absent
+    """
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that drops fields not requested in context['fields']
+    and collapses nested objects not listed in context['expand']
+
+    Must come before ModelSerializer in the bases. Nested serializers that
+    also use the mixin are filtered by their dotted path.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        expand = self.context.get('expand')
+        path = self.fieldset_path()
+        prefix = f'{path}.' if path else ''
+
+        if requested and not self.requested_whole(requested, path):
+            names = {name[len(prefix):].split('.')[0] for name in requested if name.startswith(prefix)}
+            fields = type(fields)((name, field) for name, field in fields.items() if name in names)
+
+        if expand is not None:
+            for name, field in fields.items():
+                if isinstance(field, serializers.ModelSerializer) and f'{prefix}{name}' not in expand:
+                    kwargs = {'source': field.source} if field.source else {}
+                    fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, **kwargs)
+        return fields
+
+    @staticmethod
+    def requested_whole(requested, path):
+        """Return True if this path or one of its ancestors was requested by name"""
+        parts = path.split('.') if path else []
+        return any('.'.join(parts[:index]) in requested for index in range(1, len(parts) + 1))
+
+    def fieldset_path(self):
+        """Return the dotted path of this serializer from the root ('' for the root)"""
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return '.'.join(reversed(names))
+
+
+def _model_path(model, attrs):
+    """
+    Resolve serializer source attributes to an ORM path
+
+    Returns:
+        tuple: (column path, list of relation paths to select_related),
+        or None if an attribute is not a model field
+    """
+    relations = []
+    for index, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        path = '__'.join(attrs[:index + 1])
+        if index < len(attrs) - 1:
+            if not field.is_relation or field.many_to_many or field.one_to_many:
+                return None
+            relations.append(path)
+            model = field.related_model
+    return '__'.join(attrs), relations
+
+
+def fieldset_columns(serializer, model, prefix=''):
+    """
+    Return the columns and relations a (filtered) serializer reads
+
+    Returns:
+        tuple: (set of only() paths, set of select_related() paths), or None
+        if a field reads something that is not a model column (the caller
+        should then load every column)
+    """
+    columns, relations = set(), set()
+    for field in serializer.fields.values():
+        if field.source == '*':
+            continue  # SerializerMethodField and similar read the object itself
+        resolved = _model_path(model, field.source_attrs)
+        if resolved is None:
+            return None
+        path, traversed = resolved
+        relations.update(prefix + relation for relation in traversed)
+        for relation in traversed:
+            columns.add(prefix + relation)
+        columns.add(prefix + path)
+
+        if isinstance(field, serializers.ModelSerializer):
+            related_model = field.Meta.model
+            relations.add(prefix + path)
+            nested = fieldset_columns(field, related_model, f'{prefix}{path}__')
+            if nested is None:
+                return None
+            columns.update(nested[0])
+            relations.update(nested[1])
+    return columns, relations
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin that passes ?fields= / ?expand= to serializers and
+    restricts querysets to the columns they need (see apply_fieldset)
+    """
+
+    def get_fieldset(self):
+        """Return (fields, expand) parsed from the query string"""
+        params = self.request.query_params
+        return (
+            parse_fieldset(params.get(FIELDS_QUERY_PARAM)) or None,
+            parse_fieldset(params.get(EXPAND_QUERY_PARAM)),
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if getattr(self, 'request', None) is not None:
+            context['fields'], context['expand'] = self.get_fieldset()
+        return context
+
+    def apply_fieldset(self, queryset, serializer_class):
+        """
+        Restrict a queryset to the columns serializer_class reads for the
+        requested fieldset; unchanged when neither parameter is given
+
+        Raises:
+            ValidationError: if a requested field does not exist
+        """
+        fields, expand = self.get_fieldset()
+        if fields is None and expand is None:
+            return queryset
+
+        self.check_fieldset(serializer_class, (fields or set()) | (expand or set()))
+        serializer = serializer_class(context=self.get_serializer_context())
+        needed = fieldset_columns(serializer, queryset.model)
+        if needed is None:
+            return queryset
+        columns, relations = needed
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*(columns or {queryset.model._meta.pk.name}))
+
+    def check_fieldset(self, serializer_class, paths):
+        """Raise ValidationError for paths that name no serializer field"""
+        root = serializer_class(context={'request': self.request})
+        unknown = []
+        for path in sorted(paths):
+            node = root
+            for name in path.split('.'):
+                node = getattr(node, 'child', node)
+                fields = getattr(node, 'fields', None)
+                if fields is None or name not in fields:
+                    unknown.append(path)
+                    break
+                node = fields[name]
+        if unknown:
+            raise ValidationError({FIELDS_QUERY_PARAM: [f"Unknown fields: {', '.join(unknown)}"]})
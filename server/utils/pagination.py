@@ -0,0 +1,206 @@
+"""
+Pagination Utility
+Page-number pagination with an opt-in keyset (cursor) mode for large tables
+"""
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def approximate_count(queryset):
+    """
+    Estimate the number of rows a queryset returns from the planner
+
+    Reads the row estimate from EXPLAIN instead of running COUNT(*), so the
+    cost does not grow with table size. Accuracy depends on table statistics.
+
+    Args:
+        queryset: QuerySet to estimate
+
+    Returns:
+        int: Estimated row count
+    """
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def applied_ordering(request, queryset, view):
+    """
+    Return the ordering the view's OrderingFilter applies to the request
+    (its validated ?ordering=, else the view's default `ordering`)
+    """
+    for backend in getattr(view, 'filter_backends', None) or ():
+        if issubclass(backend, OrderingFilter):
+            return list(backend().get_ordering(request, queryset, view) or [])
+    return list(getattr(view, 'ordering', None) or [])
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset mode
+
+    Default behaviour is unchanged (?page=N with COUNT(*) and OFFSET).
+    Keyset mode is enabled with ?pagination=cursor, or by following a
+    next/previous link that carries ?cursor=. It orders by the ordering the
+    OrderingFilter applied (?ordering=, else the view's `ordering`) plus the
+    primary key as a tiebreaker and seeks past the last row seen, so deep
+    pages cost the same as the first page and no COUNT(*) is run. Ordering
+    by a nullable column is rejected with 400, since the seek cannot pass
+    NULLs. Add ?total=approx for a planner-estimated total.
+
+    Keyset mode only applies to the `list` action; other paginated actions
+    (e.g. ranked search) keep page-number pagination.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    total_query_param = 'total'
+
+    def is_keyset_request(self, request, view):
+        """Return True if the request opted into keyset pagination"""
+        if getattr(view, 'action', None) != 'list':
+            return False
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor' or
+            self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.is_keyset_request(request, view)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.ordering = self.get_keyset_ordering(request, queryset, view)
+        self.page_size_value = self.get_page_size(request)
+
+        position, reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if reverse:
+            ordering = [self._flip(field) for field in ordering]
+
+        self.approximate_total = None
+        if request.query_params.get(self.total_query_param) == 'approx':
+            self.approximate_total = approximate_count(queryset)
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.get_seek_filter(ordering, position))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound('Invalid cursor')
+
+        # Fetch one extra row to know whether another page follows
+        rows = list(queryset[:self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = position is not None if not reverse else has_more
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        payload = OrderedDict([
+            ('next', self.get_keyset_link(self.page[-1], reverse=False) if self.has_next and self.page else None),
+            ('previous', self.get_keyset_link(self.page[0], reverse=True) if self.has_previous and self.page else None),
+            ('results', data),
+        ])
+        if self.approximate_total is not None:
+            payload['approximate_count'] = self.approximate_total
+        return Response(payload)
+
+    def get_keyset_ordering(self, request, queryset, view):
+        """
+        Return the keyset ordering: the applied ordering's fields plus the
+        primary key in the direction of the last one
+        """
+        ordering = []
+        for field in applied_ordering(request, queryset, view) or ['-pk']:
+            name = field.lstrip('-')
+            if name in ('pk', queryset.model._meta.pk.name):
+                # The primary key is unique: later fields cannot matter
+                return ordering + ['-pk' if field.startswith('-') else 'pk']
+            try:
+                model_field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                model_field = None
+            if model_field is None or not model_field.concrete or model_field.null:
+                raise ParseError(f'Cursor pagination cannot order by {name}')
+            ordering.append(field)
+        return ordering + ['-pk' if ordering[-1].startswith('-') else 'pk']
+
+    def get_seek_filter(self, ordering, position):
+        """
+        Build the WHERE clause selecting rows strictly after `position`
+
+        For ordering (a DESC, pk DESC) and position (va, vpk) this is
+        a <= va AND (a < va OR (a = va AND pk < vpk)). The redundant
+        leading bound lets the planner use it as an index range condition.
+        """
+        fields = [field.lstrip('-') for field in ordering]
+        operators = ['lt' if field.startswith('-') else 'gt' for field in ordering]
+
+        seek = Q()
+        for index, (name, operator) in enumerate(zip(fields, operators)):
+            clause = Q(**{f'{name}__{operator}': position[index]})
+            for previous in range(index):
+                clause &= Q(**{fields[previous]: position[previous]})
+            seek |= clause
+
+        bound = 'lte' if operators[0] == 'lt' else 'gte'
+        return Q(**{f'{fields[0]}__{bound}': position[0]}) & seek
+
+    def get_keyset_link(self, row, reverse):
+        """Return the absolute URL of the page after (or before) `row`"""
+        # Rows are model instances, or dicts for values() querysets
+        if isinstance(row, dict):
+            position = [row[field.lstrip('-')] for field in self.ordering]
+        else:
+            position = [getattr(row, field.lstrip('-')) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position, reverse))
+
+    def encode_cursor(self, position, reverse):
+        """Encode a position as an opaque URL-safe token"""
+        # str() keeps full microsecond precision for datetimes, which the
+        # seek filter needs to avoid skipping or repeating rows
+        raw = json.dumps({'p': position, 'r': int(reverse)}, default=str)
+        return b64encode(raw.encode('utf-8'), altchars=b'-_').decode('ascii')
+
+    def decode_cursor(self, request):
+        """
+        Decode the cursor query parameter
+
+        Returns:
+            tuple: (position list or None, reverse flag)
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            data = json.loads(b64decode(token.encode('ascii'), altchars=b'-_').decode('utf-8'))
+            position = data['p']
+            reverse = bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound('Invalid cursor')
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound('Invalid cursor')
+        return position, reverse
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
@@ -0,0 +1,333 @@
+"""
+Stale-While-Revalidate Cache Utility
+TTL cache for expensive statistics with single-flight recompute
+
+An SWRCache entry is fresh for `ttl` seconds and may then be served stale
+for another `stale_ttl` seconds:
+- fresh: returned as is
+- stale: the first caller to take the key's recompute lock recomputes and
+  stores the value; everyone else keeps getting the stale value meanwhile
+- missing (or past stale_ttl): one caller recomputes under the lock, the
+  others wait for its value (up to `wait_timeout`, then compute themselves)
+If a recompute raises while a stale value exists, the stale value is served.
+
+invalidate() bumps the key's generation instead of deleting the entry, so
+changed data triggers exactly one recompute while concurrent readers are
+served the previous value, and a recompute that started before the
+invalidation cannot store its result as fresh.
+
+Entries live in a backend, configured by the STATS_CACHE setting:
+- DjangoCacheBackend: a CACHES alias (the default: 'default', Redis),
+  shared by all workers, so an invalidation reaches every process
+- LocalMemoryBackend: per process; invalidations only reach the process
+  that made them (single-process deployments and tests)
+Any class implementing CacheBackend can be plugged in.
+
+Each cache counts hits, stale hits, misses, waits, recomputes, recompute
+errors and recompute time per process; see cache_metrics().
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Storage used by SWRCache; timeouts are in seconds
+    add() must be atomic: it is the recompute lock
+    """
+
+    def get_many(self, keys):
+        raise NotImplementedError
+
+    def set(self, key, value, timeout):
+        raise NotImplementedError
+
+    def add(self, key, value, timeout):
+        """Store value only if key is absent; return whether it was stored"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def incr(self, key):
+        """Increment an integer, starting from 0 when absent"""
+        raise NotImplementedError
+
+    def clear(self, prefix):
+        """Remove every key starting with prefix (best effort)"""
+        raise NotImplementedError
+
+
+class LocalMemoryBackend(CacheBackend):
+    """Per-process dict with expiry times, guarded by a lock"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, now):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires = item
+        if expires is not None and expires <= now:
+            del self._data[key]
+            return None
+        return item
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            found = {key: self._get(key, now) for key in keys}
+        return {key: item[0] for key, item in found.items() if item is not None}
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._data[key] = (value, None if timeout is None else time.monotonic() + timeout)
+
+    def add(self, key, value, timeout):
+        with self._lock:
+            if self._get(key, time.monotonic()) is not None:
+                return False
+            self._data[key] = (value, time.monotonic() + timeout)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            item = self._get(key, time.monotonic())
+            value = (item[0] if item else 0) + 1
+            self._data[key] = (value, None)
+            return value
+
+    def clear(self, prefix):
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+
+class DjangoCacheBackend(CacheBackend):
+    """
+    Entries in a Django cache alias; with a shared cache (Redis, Memcached)
+    every worker sees the same entries and locks
+    """
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def set(self, key, value, timeout):
+        self.cache.set(key, value, timeout)
+
+    def add(self, key, value, timeout):
+        return self.cache.add(key, value, timeout)
+
+    def delete(self, key):
+        self.cache.delete(key)
+
+    def incr(self, key):
+        self.cache.add(key, 0, None)
+        try:
+            return self.cache.incr(key)
+        except ValueError:  # evicted between add and incr
+            self.cache.set(key, 1, None)
+            return 1
+
+    def clear(self, prefix):
+        # Django caches cannot list keys: the known ones are searched through
+        # their storage, in any other the entries expire through their TTL
+        cache = self.cache
+        if hasattr(cache, 'delete_pattern'):  # django-redis
+            cache.delete_pattern(f'{prefix}*')
+        elif isinstance(cache, RedisCache):
+            client = cache._cache.get_client(write=True)
+            keys = list(client.scan_iter(match=f'{cache.make_key(prefix)}*'))
+            if keys:
+                client.delete(*keys)
+        elif isinstance(cache, LocMemCache):
+            stored_prefix = cache.make_key(prefix)
+            with cache._lock:
+                for key in [key for key in cache._cache if key.startswith(stored_prefix)]:
+                    cache._delete(key)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the backend configured by settings.STATS_CACHE (created once)"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = getattr(settings, 'STATS_CACHE', {})
+                backend_class = import_string(config.get('BACKEND', 'utils.swr_cache.DjangoCacheBackend'))
+                _backend = backend_class(**config.get('OPTIONS', {}))
+    return _backend
+
+
+_registry = {}
+
+
+class SWRCache:
+    """
+    Named stale-while-revalidate cache
+
+    Usage:
+        stats_cache = SWRCache('alumni-stats', ttl=60, stale_ttl=600)
+        data = stats_cache.get_or_compute('all', compute_alumni_stats)
+        stats_cache.invalidate('all')   # after the underlying data changed
+
+    Args:
+        name: namespace of the keys, also the metrics label
+        ttl: seconds a value is fresh
+        stale_ttl: further seconds a value may be served while recomputing
+        lock_timeout: seconds after which an abandoned recompute lock expires
+        wait_timeout: seconds a caller waits for another caller's first value
+        backend: CacheBackend (default: the STATS_CACHE backend)
+    """
+
+    def __init__(self, name, ttl=60, stale_ttl=300, lock_timeout=30, wait_timeout=5, backend=None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self._backend = backend
+        self._metrics = {
+            'hits': 0, 'staleHits': 0, 'misses': 0, 'waits': 0,
+            'recomputes': 0, 'recomputeErrors': 0,
+            'recomputeSecondsTotal': 0.0, 'recomputeSecondsMax': 0.0,
+        }
+        self._metrics_lock = threading.Lock()
+        _registry[name] = self
+
+    @property
+    def backend(self):
+        return self._backend or get_backend()
+
+    def _keys(self, key):
+        base = f'swr:{self.name}:{key}'
+        return base, f'{base}:generation', f'{base}:lock'
+
+    def _count(self, metric, amount=1):
+        with self._metrics_lock:
+            self._metrics[metric] += amount
+
+    def _read(self, key):
+        """Return (entry or None, current generation); entry is (value, fresh_until, generation)"""
+        entry_key, generation_key, _ = self._keys(key)
+        found = self.backend.get_many([entry_key, generation_key])
+        return found.get(entry_key), found.get(generation_key, 0)
+
+    @staticmethod
+    def _is_fresh(entry, generation):
+        return entry[2] == generation and time.time() < entry[1]
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, recomputing it with compute() when needed"""
+        entry, generation = self._read(key)
+        if entry is not None and self._is_fresh(entry, generation):
+            self._count('hits')
+            return entry[0]
+
+        if entry is not None:
+            if not self._acquire(key):
+                self._count('staleHits')
+                return entry[0]
+            self._count('misses')
+            try:
+                return self._recompute(key, compute)
+            except Exception:
+                logger.exception('Recompute of %s:%s failed, serving stale value', self.name, key)
+                return entry[0]
+            finally:
+                self._release(key)
+
+        self._count('misses')
+        if self._acquire(key):
+            try:
+                return self._recompute(key, compute)
+            finally:
+                self._release(key)
+        return self._wait(key, compute)
+
+    def _acquire(self, key):
+        return self.backend.add(self._keys(key)[2], True, self.lock_timeout)
+
+    def _release(self, key):
+        self.backend.delete(self._keys(key)[2])
+
+    def _wait(self, key, compute):
+        """Wait for the lock holder's value, then fall back to computing it here"""
+        self._count('waits')
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry, generation = self._read(key)
+            if entry is not None:
+                return entry[0]
+        return self._recompute(key, compute)
+
+    def _recompute(self, key, compute):
+        entry_key, generation_key, _ = self._keys(key)
+        # Generation read before computing: an invalidation during compute()
+        # leaves the stored entry stale
+        generation = self.backend.get_many([generation_key]).get(generation_key, 0)
+        start = time.monotonic()
+        try:
+            value = compute()
+        except Exception:
+            self._count('recomputeErrors')
+            raise
+        elapsed = time.monotonic() - start
+        with self._metrics_lock:
+            self._metrics['recomputes'] += 1
+            self._metrics['recomputeSecondsTotal'] += elapsed
+            self._metrics['recomputeSecondsMax'] = max(self._metrics['recomputeSecondsMax'], elapsed)
+        self.backend.set(entry_key, (value, time.time() + self.ttl, generation), self.ttl + self.stale_ttl)
+        return value
+
+    def invalidate(self, key):
+        """Mark the key's value stale; the next read recomputes it"""
+        self.backend.incr(self._keys(key)[1])
+
+    def clear(self):
+        """Drop every entry of this cache (used by tests and after deploys)"""
+        self.backend.clear(f'swr:{self.name}:')
+
+    def metrics(self):
+        """Return this process's counters for the cache"""
+        with self._metrics_lock:
+            data = dict(self._metrics)
+        requests = data['hits'] + data['staleHits'] + data['misses']
+        data['hitRatio'] = round((data['hits'] + data['staleHits']) / requests, 4) if requests else None
+        data['recomputeSecondsAvg'] = (
+            round(data['recomputeSecondsTotal'] / data['recomputes'], 6) if data['recomputes'] else None
+        )
+        return data
+
+
+def cache_metrics():
+    """Return {cache name: metrics} for every SWRCache in this process"""
+    return {name: cache.metrics() for name, cache in sorted(_registry.items())}